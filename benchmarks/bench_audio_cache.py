@@ -0,0 +1,98 @@
+# baldheadbot/benchmarks/bench_audio_cache.py
+"""
+첫 오디오 프레임까지 걸리는 시간(TTFA)을 오디오 캐시 적중/실패로 비교하는 벤치마크입니다. (ffmpeg 필요)
+
+- 실패: 음악 Cog와 같은 옵션(ffmpeg_opts)으로 원격 스트림을 FFmpegPCMAudio로 재생
+  원격 서버는 로컬 HTTP 서버로 흉내 내며, 요청마다 지정한 지연(기본 0.2초)을 둡니다.
+- 적중: AudioCache가 변환해 둔 Opus 파일을 FFmpegOpusAudio(codec='copy')로 재생
+
+소스를 만든 시점부터 read()가 첫 프레임을 돌려줄 때까지의 시간을 잽니다.
+사용법: python benchmarks/bench_audio_cache.py [요청 지연(초)] [반복 횟수]
+"""
+import asyncio
+import functools
+import http.server
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+
+from cogs.music import ffmpeg_opts
+from core.audio_cache import AudioCache
+
+
+class SlowHandler(http.server.SimpleHTTPRequestHandler):
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory: str, delay: float) -> http.server.ThreadingHTTPServer:
+    SlowHandler.delay = delay
+    handler = functools.partial(SlowHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_to_first_audio(make_source) -> float:
+    started = time.perf_counter()
+    source = make_source()
+    try:
+        while not source.read():
+            pass
+        return time.perf_counter() - started
+    finally:
+        source.cleanup()
+
+
+def measure(label: str, make_source, repeat: int):
+    samples = [time_to_first_audio(make_source) for _ in range(repeat)]
+    print(f"{label:<28}: 중앙값 {statistics.median(samples) * 1000:8.1f} ms | 최소 {min(samples) * 1000:8.1f} ms | 최대 {max(samples) * 1000:8.1f} ms")
+
+
+async def fill_cache(cache: AudioCache, page_url: str, stream_url: str) -> str:
+    cache.record_play(page_url, stream_url)
+    while cache.stats()["변환 중"]:
+        await asyncio.sleep(0.05)
+    return cache.lookup(page_url)
+
+
+def main():
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as workdir:
+        # 3분 길이의 테스트 곡 (MP3 128kbps)
+        subprocess.run(
+            ['ffmpeg', '-nostdin', '-loglevel', 'error', '-f', 'lavfi', '-i', 'sine=frequency=440:duration=180',
+             '-ac', '2', '-b:a', '128k', os.path.join(workdir, 'track.mp3')],
+            check=True,
+        )
+        server = serve(workdir, delay)
+        stream_url = f"http://127.0.0.1:{server.server_address[1]}/track.mp3"
+
+        cache = AudioCache(os.path.join(workdir, 'audio_cache'), min_plays=1)
+        cached_path = asyncio.run(fill_cache(cache, "https://soundcloud.com/artist/track", stream_url))
+        if not cached_path:
+            sys.exit("오디오 캐시 변환에 실패했습니다.")
+
+        print(f"요청 지연 {delay}s, {repeat}회 반복")
+        measure("실패 (원격 스트림, PCM)", lambda: discord.FFmpegPCMAudio(stream_url, **ffmpeg_opts), repeat)
+        measure("적중 (로컬 Opus, 그대로 전송)", lambda: discord.FFmpegOpusAudio(cached_path, codec='copy'), repeat)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# baldheadbot/benchmarks/bench_mixer.py
+"""
+음성 믹서(core.mixer.VoiceMixer)가 20ms 프레임 하나를 만드는 데 드는 시간을 재는 벤치마크입니다.
+
+- 음악만 (PCM, 볼륨 그대로): 섞지 않고 그대로 보내는 경우
+- 음악 + TTS (덕킹 중): 두 채널을 NumPy로 더하고 음악 볼륨을 줄이는 경우
+- 음악 + TTS (덕킹 시작): 프레임 안에서 볼륨을 서서히 바꾸는 경우
+- 비교용: 같은 계산을 audioop(mul/add)으로 한 경우 (audioop이 있는 Python에서만)
+
+음성 연결 없이 MixerSource.read()를 반복 호출하며, 소스는 미리 만들어 둔 무작위 PCM 프레임을 돌려줍니다.
+결과의 "서버 수"는 한 CPU 코어가 20ms마다 프레임을 만들어 줄 수 있는 서버 수의 이론값입니다.
+사용법: python benchmarks/bench_mixer.py [프레임 수]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+import numpy as np
+
+from core.mixer import FRAME_SIZE, MixerSource, VoiceMixer
+
+FRAME = np.random.default_rng(0).integers(-8000, 8000, FRAME_SIZE // 2, dtype=np.int16).tobytes()
+
+
+class FrameSource(discord.AudioSource):
+    """같은 PCM 프레임을 계속 돌려주는 소스입니다."""
+    def read(self) -> bytes:
+        return FRAME
+
+
+class NoVoice:
+    id = 0
+    voice_client = None
+
+
+def make_mixer(channels: int, ramp: bool) -> MixerSource:
+    mixer = VoiceMixer(None, NoVoice(), duck_volume=0.3)
+    # 음성 연결이 없으므로 재생은 시작되지 않고 채널만 등록됩니다.
+    mixer.play("music", FrameSource())
+    for i in range(1, channels):
+        mixer.play(f"tts{i}", FrameSource(), ducks_others=True)
+    if ramp:
+        # 덕킹이 끝나지 않도록 한 단계씩만 줄게 합니다.
+        mixer.DUCK_STEP = 1e-9
+    elif channels > 1:
+        mixer._channels["music"].gain = mixer.duck_volume
+    source = MixerSource(mixer)
+    mixer._source = source
+    return source
+
+
+def measure(label: str, read, frames: int):
+    for _ in range(100):
+        read()
+    started = time.perf_counter()
+    for _ in range(frames):
+        read()
+    per_frame = (time.perf_counter() - started) / frames
+    print(f"{label:<28}: 프레임당 {per_frame * 1e6:7.1f} µs | 20ms의 {per_frame / 0.02 * 100:5.2f}% | 서버 수 {int(0.02 / per_frame):>6}")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{frames}프레임 반복")
+    measure("음악만 (PCM)", make_mixer(1, ramp=False).read, frames)
+    measure("음악 + TTS (덕킹 중)", make_mixer(2, ramp=False).read, frames)
+    measure("음악 + TTS (덕킹 시작)", make_mixer(2, ramp=True).read, frames)
+    measure("채널 4개 (덕킹 중)", make_mixer(4, ramp=False).read, frames)
+
+    try:
+        import audioop
+    except ImportError:
+        print("audioop 없음: 비교 생략")
+        return
+
+    def audioop_mix():
+        return audioop.add(audioop.mul(FRAME, 2, 0.3), FRAME, 2)
+    measure("비교: audioop (덕킹 중)", audioop_mix, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# baldheadbot/benchmarks/bench_playback_cpu.py
+"""
+재생 방식별로 곡 하나를 보내는 데 드는 CPU 시간을 비교하는 벤치마크입니다. (ffmpeg, libopus 필요)
+
+- PCM: FFmpegPCMAudio -> PCMVolumeTransformer -> discord.py Opus 인코더 (기존 방식, 'pcm')
+- Opus (ffmpeg 볼륨): FFmpegOpusAudio + `-filter:a volume=` (볼륨이 100%가 아닐 때의 'opus')
+- Opus (그대로 전송): Opus 원본을 FFmpegOpusAudio.from_probe로 다시 인코딩하지 않고 전송 (볼륨 100%일 때의 'opus')
+
+실제 재생처럼 20ms마다 기다리지 않고 곡 전체를 최대한 빨리 읽으며, 봇 프로세스(Python)와
+ffmpeg 자식 프로세스의 CPU 시간을 따로 잽니다. 결과는 오디오 1분당 CPU 시간입니다.
+사용법: python benchmarks/bench_playback_cpu.py [곡 길이(초)] [볼륨(0~1)]
+"""
+import asyncio
+import ctypes.util
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+from discord.opus import Encoder
+
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def drain(source: discord.AudioSource) -> int:
+    """소스를 끝까지 읽으며, PCM 소스는 재생할 때처럼 프레임마다 Opus로 인코딩합니다. 읽은 프레임 수를 반환합니다."""
+    encoder = None if source.is_opus() else Encoder()
+    frames = 0
+    while data := source.read():
+        if encoder is not None:
+            encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+        frames += 1
+    return frames
+
+
+def measure(label: str, make_source):
+    python_before, children_before = time.process_time(), children_cpu()
+    source = make_source()
+    try:
+        frames = drain(source)
+    finally:
+        # 정리할 때 ffmpeg 프로세스를 기다리므로, 이후에 자식 프로세스 CPU 시간이 합산됩니다.
+        source.cleanup()
+    python_cpu = time.process_time() - python_before
+    ffmpeg_cpu = children_cpu() - children_before
+    minutes = frames * 0.02 / 60 or 1
+    print(f"{label:<20}: Python {python_cpu / minutes * 1000:7.1f} ms | ffmpeg {ffmpeg_cpu / minutes * 1000:7.1f} ms | 합계 {(python_cpu + ffmpeg_cpu) / minutes * 1000:7.1f} ms (오디오 1분당)")
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    volume = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    if not discord.opus.is_loaded():
+        discord.opus.load_opus(ctypes.util.find_library('opus'))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        mp3_path = os.path.join(workdir, 'track.mp3')
+        opus_path = os.path.join(workdir, 'track.opus')
+        tone = ['ffmpeg', '-nostdin', '-loglevel', 'error', '-f', 'lavfi', '-i', f'sine=frequency=440:duration={seconds}', '-ac', '2']
+        subprocess.run([*tone, '-b:a', '128k', mp3_path], check=True)
+        subprocess.run([*tone, '-ar', '48000', '-c:a', 'libopus', '-b:a', '128k', opus_path], check=True)
+
+        print(f"곡 길이 {seconds}s, 볼륨 {volume}")
+        measure("PCM", lambda: discord.PCMVolumeTransformer(discord.FFmpegPCMAudio(mp3_path, options='-vn'), volume=volume))
+        measure("Opus (ffmpeg 볼륨)", lambda: discord.FFmpegOpusAudio(mp3_path, options=f'-vn -filter:a volume={volume:.3f}'))
+        measure("Opus (그대로 전송)", lambda: asyncio.run(discord.FFmpegOpusAudio.from_probe(opus_path, options='-vn')))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# baldheadbot/benchmarks/bench_prefetch.py
+"""
+곡 사이 공백(이전 곡 종료 ~ 다음 곡 재생 시작)을 스트림 URL 미리 받기 유무로 비교하는 벤치마크입니다.
+
+GuildPlayer와 StreamPrefetcher를 그대로 사용하고, 음성 연결과 yt-dlp 추출만 흉내 냅니다.
+- 추출: 지정한 지연(기본 1.5초) 후 만료 시각이 들어간 가짜 스트림 URL 반환
+- 재생: 지정한 길이(기본 3초)가 지나면 after 콜백을 다른 스레드에서 호출 (FFmpeg 재생 스레드와 같은 방식)
+
+사용법: python benchmarks/bench_prefetch.py [추출 지연(초)] [곡 길이(초)] [곡 수]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+
+from core.embed import EmbedGenerator
+from core.player import GuildPlayer
+from core.prefetch import StreamPrefetcher
+from core.track import Track
+
+
+class FakeVoiceClient:
+    def __init__(self, track_seconds: float):
+        self.track_seconds = track_seconds
+        self.source = None
+        self._timer = None
+
+    def is_connected(self):
+        return True
+
+    def is_playing(self):
+        return self._timer is not None and self._timer.is_alive()
+
+    def is_paused(self):
+        return False
+
+    def play(self, source, after=None):
+        self.source = source
+        self._timer = threading.Timer(self.track_seconds, after, args=(None,))
+        self._timer.start()
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+
+
+class FakeSource(discord.AudioSource):
+    def read(self):
+        return b""
+
+
+async def run(extract_delay: float, track_seconds: float, tracks: int, prefetch: bool) -> GuildPlayer:
+    loop = asyncio.get_running_loop()
+    bot = SimpleNamespace(loop=loop, user=None)
+    bot.embeds = EmbedGenerator(bot)
+    channel = SimpleNamespace(send=lambda **kwargs: asyncio.sleep(0))
+    guild = SimpleNamespace(
+        id=1, voice_client=FakeVoiceClient(track_seconds),
+        get_channel_or_thread=lambda channel_id: channel, get_member=lambda member_id: None,
+    )
+
+    async def resolve(track):
+        await asyncio.sleep(extract_delay)
+        return f"https://example.invalid/{track.title}?expire={int(time.time()) + 6 * 3600}"
+
+    prefetcher = StreamPrefetcher(resolve, depth=2) if prefetch else None
+
+    async def create_source(player, track):
+        if player.prefetcher:
+            await player.prefetcher.get_stream(track)
+        else:
+            await resolve(track)
+        return FakeSource()
+
+    player = GuildPlayer(bot, guild, create_source, prefetcher=prefetcher)
+    player.start()
+    player.enqueue_many(Track(str(i), f"track{i}", guild.id, 1, 1) for i in range(tracks))
+    while player.gap_count < tracks - 1:
+        await asyncio.sleep(0.05)
+    player.destroy()
+    guild.voice_client.stop()
+    return player
+
+
+def main():
+    extract_delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.5
+    track_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    tracks = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    print(f"추출 지연 {extract_delay}s, 곡 길이 {track_seconds}s, {tracks}곡")
+    for label, prefetch in (("미리 받기 없음", False), ("미리 받기 (다음 2곡)", True)):
+        player = asyncio.run(run(extract_delay, track_seconds, tracks, prefetch))
+        stats = player.stats()
+        print(f"{label:<20}: 평균 공백 {stats['평균 공백(ms)']:8.1f} ms | 최대 공백 {stats['최대 공백(ms)']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# baldheadbot/benchmarks/bench_prefix.py
+"""
+get_prefix의 메시지당 비용을 측정하는 마이크로 벤치마크입니다.
+
+기존 방식(매 메시지마다 os.walk + config.json 파싱)과
+PrefixResolver(메모리 캐시 + 주기적 stat 확인)를 비교합니다.
+
+사용법: python benchmarks/bench_prefix.py [data 폴더의 더미 파일 수]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+from core.config import ConfigFile
+from core.prefix import PrefixResolver
+
+
+def find_config_file(start_path):
+    for root, _, files in os.walk(start_path):
+        for filename in files:
+            if filename.lower() == "config.json":
+                return os.path.join(root, filename)
+    return None
+
+
+def legacy_get_prefix(start_path):
+    """기존 bot.get_prefix의 동작을 그대로 재현합니다."""
+    config_path = find_config_file(start_path)
+    if not config_path:
+        return "!"
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("prefix") or "!"
+
+
+def main():
+    dummy_files = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as root:
+        # 실제 배포 환경처럼 data/ 폴더에 파일이 쌓여 있는 상황을 흉내냅니다.
+        # (os.walk는 알파벳 순서와 무관하게 디렉토리 전체를 훑으므로 config.json은 하위 폴더에 둡니다.)
+        data_dir = os.path.join(root, "data")
+        os.makedirs(os.path.join(data_dir, "cache"))
+        for i in range(dummy_files):
+            with open(os.path.join(data_dir, "cache", f"dummy_{i}.bin"), "wb") as f:
+                f.write(b"0")
+        config_path = os.path.join(data_dir, "settings", "config.json")
+        os.makedirs(os.path.dirname(config_path))
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"prefix": "!"}, f)
+        prefix_path = os.path.join(data_dir, "prefix.json")
+        with open(prefix_path, "w", encoding="utf-8") as f:
+            json.dump({str(1000 + i): "?" for i in range(1000)}, f)
+
+        resolver = PrefixResolver(ConfigFile(config_path), ConfigFile(prefix_path))
+
+        n = 2000
+        legacy = timeit.timeit(lambda: legacy_get_prefix(root), number=n) / n
+        cached = timeit.timeit(lambda: resolver.get(1500), number=n * 100) / (n * 100)
+
+        print(f"data/ 더미 파일 수: {dummy_files}")
+        print(f"기존 get_prefix     : {legacy * 1e6:10.2f} us/message")
+        print(f"PrefixResolver.get : {cached * 1e6:10.2f} us/message")
+        print(f"개선 배율           : {legacy / cached:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
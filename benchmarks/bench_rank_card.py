@@ -0,0 +1,107 @@
+# baldheadbot/benchmarks/bench_rank_card.py
+"""
+레벨 카드 렌더링 속도(cards/sec)를 비교하는 벤치마크입니다.
+
+- 기존 방식: 매번 폰트를 읽고, 배경/진행 바 그라데이션을 픽셀 줄마다 그리고, 마스크를 새로 만듦
+- RankCardRenderer: 템플릿/폰트/마스크를 캐시하고 사용자별 요소만 합성
+
+네트워크 요청은 제외하고 동일한 아바타 바이트로 측정합니다. (PNG 인코딩 포함)
+사용법: python benchmarks/bench_rank_card.py [반복 횟수]
+"""
+import io
+import os
+import sys
+import time
+
+BOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot')
+sys.path.insert(0, BOT_DIR)
+
+from PIL import Image, ImageDraw, ImageFont
+
+from core.rank_card import RankCardRenderer
+
+BOLD_FONT_PATH = os.path.join(BOT_DIR, 'data', 'bold_font.ttf')
+REGULAR_FONT_PATH = os.path.join(BOT_DIR, 'data', 'regular_font.ttf')
+
+
+def required_exp(level):
+    return 8 * (level ** 2) + (50 * level) + 100
+
+
+def legacy_render(avatar_bytes, display_name, level, exp, rank):
+    """기존 LevelingSystem.create_rank_card의 그리기 부분을 그대로 재현합니다."""
+    name_font = ImageFont.truetype(BOLD_FONT_PATH, 120)
+    level_font = ImageFont.truetype(REGULAR_FONT_PATH, 60)
+    exp_font = ImageFont.truetype(BOLD_FONT_PATH, 40)
+    avatar_image = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+
+    card = Image.new("RGBA", (934, 350), (0, 0, 0, 0))
+    start_color = (100, 180, 160); end_color = (80, 150, 90)
+    for y in range(card.height):
+        r = int(start_color[0] + (end_color[0] - start_color[0]) * (y / card.height)); g = int(start_color[1] + (end_color[1] - start_color[1]) * (y / card.height)); b = int(start_color[2] + (end_color[2] - start_color[2]) * (y / card.height))
+        ImageDraw.Draw(card).line([(0, y), (card.width, y)], fill=(r, g, b))
+    mask = Image.new("L", card.size, 0); draw_mask = ImageDraw.Draw(mask)
+    draw_mask.rounded_rectangle((0, 0, card.width, card.height), radius=20, fill=255)
+    card.putalpha(mask)
+
+    avatar_image = avatar_image.resize((210, 210)); avatar_mask = Image.new("L", avatar_image.size, 0)
+    ImageDraw.Draw(avatar_mask).ellipse((0, 0) + avatar_image.size, fill=255)
+    card.paste(avatar_image, (36, 60), avatar_mask)
+
+    draw = ImageDraw.Draw(card)
+    draw.text((290, 0), display_name, font=name_font, fill=(255, 255, 255))
+    draw.text((297, 155), f"Level {level}", font=level_font, fill=(255, 255, 255))
+    draw.text((600, 155), f"Rank #{rank}", font=level_font, fill=(255, 255, 255))
+    draw.text((295, 230), f"{exp} / {required_exp(level)} EXP", font=exp_font, fill=(255, 255, 255))
+
+    bar_x, bar_y, bar_width, bar_height, bar_radius = 290, 280, 600, 30, 15
+    draw.rounded_rectangle((bar_x, bar_y, bar_x + bar_width, bar_y + bar_height), radius=bar_radius, fill=(50, 80, 55), outline=(75, 99, 62), width=3)
+    fill_width = int(bar_width * exp / required_exp(level))
+    if fill_width > 1:
+        fill_image = Image.new("RGBA", (fill_width, bar_height), (0, 0, 0, 0)); fill_draw = ImageDraw.Draw(fill_image)
+        grad_start = (105, 190, 115); grad_end = (180, 220, 130)
+        for x in range(fill_width):
+            r = int(grad_start[0] + (grad_end[0] - grad_start[0]) * (x / fill_width)); g = int(grad_start[1] + (grad_end[1] - grad_start[1]) * (x / fill_width)); b = int(grad_start[2] + (grad_end[2] - grad_start[2]) * (x / fill_width))
+            fill_draw.line([(x, 0), (x, bar_height)], fill=(r, g, b))
+        fill_mask = Image.new("L", fill_image.size, 0); draw_fill_mask = ImageDraw.Draw(fill_mask)
+        draw_fill_mask.rounded_rectangle((0, 0, fill_width, bar_height), radius=bar_radius, fill=255)
+        fill_image.putalpha(fill_mask)
+        card.paste(fill_image, (bar_x, bar_y), fill_image)
+        draw.rounded_rectangle((bar_x, bar_y, bar_x + fill_width, bar_y + bar_height), radius=bar_radius, outline=(50, 80, 55), width=2)
+
+    buffer = io.BytesIO(); card.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def sample_avatar() -> bytes:
+    """Discord 기본 아바타 크기(128x128)의 테스트 이미지를 만듭니다."""
+    image = Image.new("RGB", (128, 128), (200, 120, 60))
+    ImageDraw.Draw(image).ellipse((20, 20, 108, 108), fill=(40, 90, 160))
+    buffer = io.BytesIO(); image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def measure(label, func, iterations):
+    func(0)  # 워밍업
+    started = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}: {iterations / elapsed:8.1f} cards/sec ({elapsed / iterations * 1e3:7.2f} ms/card)")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    avatar_bytes = sample_avatar()
+    renderer = RankCardRenderer(BOLD_FONT_PATH, REGULAR_FONT_PATH)
+    prepared = renderer.prepare_avatar(avatar_bytes)
+
+    legacy = measure("기존 create_rank_card", lambda i: legacy_render(avatar_bytes, "머머리", 12, 300 + i, 3), iterations)
+    new = measure("RankCardRenderer (디코딩 포함)", lambda i: renderer.render(renderer.prepare_avatar(avatar_bytes), "머머리", 12, 300 + i, required_exp(12), 3), iterations)
+    measure("RankCardRenderer (아바타 준비됨)", lambda i: renderer.render(prepared, "머머리", 12, 300 + i, required_exp(12), 3), iterations)
+    print(f"개선 배율 (디코딩 포함): {legacy / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# baldheadbot/benchmarks/bench_rank_index.py
+"""
+/레벨 순위 계산 비용을 비교하는 벤치마크입니다.
+
+- 기존 방식: 서버 전체를 sorted()로 정렬한 뒤 선형 탐색
+- RankIndex: 경험치 갱신 1회 + 순위 조회 1회 (grant_exp 후 /레벨 호출과 같은 흐름)
+
+사용법: python benchmarks/bench_rank_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+from core.rank_index import RankIndex
+
+
+def legacy_rank(guild_data: dict, user_id: int) -> int:
+    """기존 LevelingSystem.level의 순위 계산을 그대로 재현합니다."""
+    sorted_users = sorted(guild_data.items(), key=lambda item: (item[1]['level'], item[1]['exp']), reverse=True)
+    for i, (uid, _) in enumerate(sorted_users):
+        if int(uid) == user_id:
+            return i + 1
+    return -1
+
+
+def bench(members: int, queries: int):
+    rng = random.Random(members)
+    guild_data = {str(uid): {"level": rng.randint(1, 60), "exp": rng.randint(0, 5000)} for uid in range(members)}
+    targets = [rng.randrange(members) for _ in range(queries)]
+
+    started = time.perf_counter()
+    for uid in targets:
+        legacy_rank(guild_data, uid)
+    legacy = (time.perf_counter() - started) / queries
+
+    started = time.perf_counter()
+    index = RankIndex((int(uid), d["level"], d["exp"]) for uid, d in guild_data.items())
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for uid in targets:
+        data = guild_data[str(uid)]
+        data["exp"] += 15
+        index.update(uid, data["level"], data["exp"])
+        index.rank(uid)
+    incremental = (time.perf_counter() - started) / queries
+
+    started = time.perf_counter()
+    for _ in range(queries):
+        index.page(rng.randrange(members), 10)
+    page = (time.perf_counter() - started) / queries
+
+    print(f"{members:>7} 명 | 기존 정렬 {legacy * 1e3:9.3f} ms | 인덱스 갱신+조회 {incremental * 1e6:7.2f} us"
+          f" | 10명 페이지 {page * 1e6:7.2f} us | 최초 생성 {build * 1e3:7.1f} ms | {legacy / incremental:8.0f}x")
+
+
+def main():
+    for members, queries in ((1_000, 200), (10_000, 50), (100_000, 10)):
+        bench(members, queries)
+
+
+if __name__ == "__main__":
+    main()
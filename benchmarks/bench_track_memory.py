@@ -0,0 +1,62 @@
+# baldheadbot/benchmarks/bench_track_memory.py
+"""
+대기열 항목 10,000개의 메모리 사용량을 비교하는 벤치마크입니다. (tracemalloc)
+
+- 기존 방식: 곡마다 dict {'source', 'title', 'channel', 'requester', 'is_live'}
+  (channel/requester는 모든 항목이 공유하는 객체 하나씩을 가리키도록 하여, 항목 자체의 비용만 측정)
+- Track: __slots__ dataclass, 채널/요청자는 ID만 저장
+
+URL/제목 문자열은 두 방식에서 똑같이 만들어지므로 함께 포함해 측정합니다.
+사용법: python benchmarks/bench_track_memory.py [항목 수]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+from core.track import Track
+
+
+class FakeObject:
+    """ctx.channel / ctx.author 자리를 채우는 객체입니다."""
+    def __init__(self, object_id: int):
+        self.id = object_id
+
+
+def build_dicts(count: int, channel, requester) -> list:
+    return [
+        {'source': f"https://soundcloud.com/artist/track-{i}", 'title': f"Track title number {i}", 'channel': channel, 'requester': requester, 'is_live': False}
+        for i in range(count)
+    ]
+
+
+def build_tracks(count: int, channel, requester) -> list:
+    return [
+        Track(f"https://soundcloud.com/artist/track-{i}", f"Track title number {i}", 1234567890123, channel.id, requester.id)
+        for i in range(count)
+    ]
+
+
+def measure(label: str, builder, count: int) -> int:
+    channel, requester = FakeObject(111111111111111111), FakeObject(222222222222222222)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    queue = builder(count, channel, requester)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{label:<12}: {used / 1024:9.1f} KB ({used / len(queue):6.1f} bytes/항목)")
+    return used
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"대기열 항목 {count:,}개")
+    legacy = measure("dict", build_dicts, count)
+    slotted = measure("Track", build_tracks, count)
+    print(f"절감: {(legacy - slotted) / 1024:.1f} KB ({(1 - slotted / legacy) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
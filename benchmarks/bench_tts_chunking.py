@@ -0,0 +1,61 @@
+# baldheadbot/benchmarks/bench_tts_chunking.py
+"""
+긴 메시지를 한 번에 합성할 때와 문장 단위로 나누어 합성할 때, 읽기 시작까지 걸리는 시간을 비교하는 벤치마크입니다.
+
+- 한 번에: 메시지 전체의 합성이 끝나야 재생을 시작
+- 문장 단위: 첫 조각(split_sentences)의 합성이 끝나면 재생을 시작하고, 나머지는 재생하면서 합성
+
+기본은 합성 시간이 글자 수에 비례하는 fake 엔진(고정 0.1초 + 글자당 5ms)으로 재고,
+gtts/espeak 엔진은 사용할 수 있을 때만 잽니다. 실패한 엔진은 건너뜁니다.
+사용법: python benchmarks/bench_tts_chunking.py [반복 횟수]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+from core.speaker import split_sentences
+from core.tts_engine import EspeakEngine, FakeEngine, GTTSEngine
+
+MESSAGE = (
+    "오늘 회의는 세 시에 시작합니다. 회의실은 2층 큰 방이에요. "
+    "발표 자료는 미리 공유 폴더에 올려 주세요! 시간이 부족할 수 있으니 발표는 10분 안에 끝내 주시면 좋겠습니다. "
+    "회의가 끝나면 다 같이 저녁을 먹으러 갈 예정인데, 못 오시는 분은 미리 말씀해 주세요. "
+    "장소는 회사 앞 고깃집이고, 예약은 일곱 시로 해 두었습니다. 질문 있으면 언제든지 물어보세요."
+)
+
+
+async def timed(engine, text: str) -> float:
+    started = time.perf_counter()
+    await engine.synthesize(text, "ko")
+    return time.perf_counter() - started
+
+
+async def measure(engine, repeat: int):
+    chunks = split_sentences(MESSAGE)
+    whole, first = [], []
+    for _ in range(repeat):
+        whole.append(await timed(engine, MESSAGE))
+        first.append(await timed(engine, chunks[0]))
+    print(f"{engine.name:<7}: 한 번에 {statistics.median(whole) * 1000:8.1f} ms | 문장 단위 {statistics.median(first) * 1000:8.1f} ms "
+          f"({len(MESSAGE)}자, {len(chunks)}개 조각)")
+
+
+async def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"읽기 시작까지 걸리는 시간 (중앙값, {repeat}회 반복)")
+    for engine in (FakeEngine(delay=0.1, delay_per_char=0.005), EspeakEngine(), GTTSEngine()):
+        if not engine.available():
+            print(f"{engine.name:<7}: 사용할 수 없음")
+            continue
+        try:
+            await measure(engine, repeat)
+        except Exception as e:
+            print(f"{engine.name:<7}: 실패 ({type(e).__name__}: {e})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
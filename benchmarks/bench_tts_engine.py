@@ -0,0 +1,71 @@
+# baldheadbot/benchmarks/bench_tts_engine.py
+"""
+TTS 엔진별로 첫 오디오 프레임까지 걸리는 시간(TTFA)을 비교하는 벤치마크입니다.
+
+- gtts: Google TTS (네트워크 필요)
+- espeak: eSpeak NG 하위 프로세스 (설치되어 있을 때만)
+- fake: 네트워크/프로세스 없이 무음 WAV를 만드는 테스트용 엔진 (기준선)
+
+TTFA = 합성 시간 + FFmpegPCMAudio가 첫 20ms 프레임을 돌려줄 때까지의 시간입니다.
+ffmpeg가 없으면 합성 시간만 잽니다. 사용할 수 없거나 실패한 엔진은 건너뜁니다.
+사용법: python benchmarks/bench_tts_engine.py [반복 횟수]
+"""
+import asyncio
+import io
+import os
+import shutil
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+
+from core.tts_engine import EspeakEngine, FakeEngine, GTTSEngine
+
+PHRASES = ["안녕하세요", "오늘 저녁 뭐 먹을까요?", "잠깐만 기다려 주세요, 금방 돌아올게요.", "ㅋㅋㅋ 그거 진짜 웃기다"]
+
+
+def first_frame_time(audio: bytes) -> float:
+    started = time.perf_counter()
+    source = discord.FFmpegPCMAudio(io.BytesIO(audio), pipe=True)
+    try:
+        source.read()
+        return time.perf_counter() - started
+    finally:
+        source.cleanup()
+
+
+async def measure(engine, repeat: int, with_ffmpeg: bool):
+    synth_times, ttfa_times = [], []
+    for i in range(repeat):
+        text = PHRASES[i % len(PHRASES)]
+        started = time.perf_counter()
+        audio = await engine.synthesize(text, "ko")
+        synth = time.perf_counter() - started
+        synth_times.append(synth)
+        if with_ffmpeg:
+            ttfa_times.append(synth + await asyncio.get_running_loop().run_in_executor(None, first_frame_time, audio))
+    line = f"{engine.name:<7}: 합성 중앙값 {statistics.median(synth_times) * 1000:8.1f} ms"
+    if ttfa_times:
+        line += f" | TTFA 중앙값 {statistics.median(ttfa_times) * 1000:8.1f} ms | 최대 {max(ttfa_times) * 1000:8.1f} ms"
+    print(line)
+
+
+async def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with_ffmpeg = shutil.which("ffmpeg") is not None
+    print(f"{repeat}회 반복" + ("" if with_ffmpeg else " (ffmpeg 없음: 합성 시간만 측정)"))
+    for engine in (GTTSEngine(), EspeakEngine(), FakeEngine()):
+        if not engine.available():
+            print(f"{engine.name:<7}: 사용할 수 없음")
+            continue
+        try:
+            await measure(engine, repeat, with_ffmpeg)
+        except Exception as e:
+            print(f"{engine.name:<7}: 실패 ({type(e).__name__}: {e})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
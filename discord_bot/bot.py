@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 import os
-import json
 import sys
 from dotenv import load_dotenv
 
@@ -14,15 +13,10 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from core.embed import EmbedGenerator
-
-
-# 현재 작업 디렉토리를 기준으로 .env 파일 경로 설정
-current_dir = os.getcwd()
-dotenv_path = os.path.join(current_dir, '.env')
-
-# .env 파일 로드 및 BOT_TOKEN 설정
-load_dotenv(dotenv_path=dotenv_path)
-BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+from core.config import ConfigFile
+from core.prefix import PrefixResolver, DEFAULT_PREFIX
+from core.idle import IdleVoiceScheduler
+from core.mixer import VoiceMixerManager
 
 
 def find_config_file(start_path):
@@ -33,141 +27,180 @@ def find_config_file(start_path):
                 return os.path.join(root, filename)
     return None
 
-# 설정 파일 로드 함수
-def get_prefix(client, message):
-    """설정 파일에서 접두사를 가져오거나 기본값을 반환합니다."""
-    current_dir = os.getcwd()
-    config_path = find_config_file(current_dir)
-
-    if not config_path:
-        print("Warning: config.json 파일을 찾을 수 없습니다. 기본 접두사 '!'를 사용합니다.")
-        return "!"
-
-    try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            prefix = config.get("prefix")
-            if prefix:
-                return prefix
-            else:
-                print("Warning: config.json 파일에 'prefix' 설정이 없습니다. 기본 접두사 '!'를 사용합니다.")
-                return "!"
-    except (json.JSONDecodeError, FileNotFoundError):
-        print("Warning: config.json 파일을 읽는 중 오류가 발생했습니다. 기본 접두사 '!'를 사용합니다.")
-        return "!"
-    
-
-# 봇에 필요한 Intents 설정
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-
-# --- bot 객체 생성 및 설정 (오류 수정) ---
-# bot 객체를 한 번만 생성하고, 필요한 모든 설정을 여기에 포함합니다.
-bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
-# core.embed 모듈의 EmbedGenerator 클래스를 사용하여 인스턴스 생성
-bot.embeds = EmbedGenerator(bot)
-
-
-@bot.event
-async def on_ready():
-    """봇이 준비되었을 때 실행되는 이벤트입니다."""
-    print(f'봇 이름: {bot.user.name}')
-    print(f'봇 ID: {bot.user.id}')
-    print(f'연결된 서버 수: {len(bot.guilds)}')
-    print('봇이 성공적으로 시작되었습니다!')
-    
-    # Cogs 로드
-    await load_all_cogs()
-
-    # 슬래시 명령어는 모든 Cog가 로드된 후에 동기화하는 것이 더 안정적일 수 있습니다.
-    # 필요시 `!sync` 명령어로 수동 동기화하는 것을 권장합니다.
-    # await bot.tree.sync() 
-
-    # --- 상태 메시지 설정 로직 개선 ---
-    # get_prefix 함수와 동일한 방식으로 config 파일을 찾아 일관성을 유지합니다.
-    config_path = find_config_file(os.getcwd())
-    current_prefix = "!" # 기본값
-    if config_path:
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = json.load(f)
-            current_prefix = config_data.get("prefix", "!")
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass # 오류 발생 시 기본값 사용
-
-    activity = discord.Game(name=f"{current_prefix}help | 열심히 일하는 중")
-    await bot.change_presence(status=discord.Status.online, activity=activity)
-
-async def load_all_cogs():
-    """cogs 폴더에 있는 모든 Cog를 로드합니다."""
-    # cogs 폴더는 bot.py와 같은 디렉토리 레벨에 있는 my_discord_bot/cogs 에 위치
-    cogs_path = "cogs" # import 경로를 직접 지정하는 것이 더 안정적입니다.
-    
-    # os.path.join을 사용하여 cogs 폴더의 실제 파일 시스템 경로를 얻습니다.
-    # 이 경로는 파일 목록을 읽는 데 사용됩니다.
-    try:
-        # sys.path[0]는 스크립트가 실행되는 디렉토리를 가리킵니다.
-        # 이 경로를 기준으로 cogs 폴더의 실제 위치를 찾습니다.
-        cogs_dir_path = os.path.join(sys.path[0], "cogs")
-        for filename in os.listdir(cogs_dir_path):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                extension_name = filename[:-3]
-                extension_path = f"{cogs_path}.{extension_name}"
-                if extension_path not in bot.extensions:
-                    try:
-                        await bot.load_extension(extension_path)
-                        print(f"Cog '{extension_name}' 로드 성공")
-                    except Exception as e:
-                        print(f"Cog '{extension_name}' 로드 실패: {type(e).__name__} - {e}")
-    except FileNotFoundError:
-        print(f"'{cogs_dir_path}' 디렉토리를 찾을 수 없습니다. Cog를 로드할 수 없습니다.")
-
-
-# --- `sync` 명령어 강화: 특정 서버에 즉시 동기화 기능 추가 ---
-@bot.hybrid_command(name="sync", help="슬래시 명령어를 동기화합니다. (봇 소유자만 가능)")
-@commands.is_owner()
-async def sync_command(ctx, guild_id: str = None):
+
+def create_bot() -> commands.Bot:
     """
-    특정 서버 또는 모든 서버에 슬래시 명령어를 동기화합니다.
-    사용법: !sync [서버_ID] (서버 ID 없으면 전역 동기화)
+    설정을 읽어 봇 객체를 만들고, 공용 서비스와 봇 전역 이벤트/명령어를 등록합니다.
+    레벨 카드 렌더링의 spawn 작업자는 이 파일을 __mp_main__으로 다시 불러오므로, 불러오기만 해서는
+    설정 읽기나 봇 생성이 일어나지 않도록 `__main__`에서만 호출합니다.
     """
-    if guild_id:
+    # --- 설정 파일 및 접두사 조회기 설정 ---
+    # config.json은 시작할 때 한 번만 찾고, 이후에는 메모리에 캐시된 내용을 사용합니다.
+    # (예전에는 메시지마다 os.walk로 작업 디렉토리 전체를 탐색했습니다.)
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    config_path = os.path.join(data_dir, 'config.json')
+    if not os.path.exists(config_path):
+        config_path = find_config_file(os.getcwd()) or config_path
+        if not os.path.exists(config_path):
+            print(f"Warning: config.json 파일을 찾을 수 없습니다. 기본 접두사 '{DEFAULT_PREFIX}'를 사용합니다.")
+    guild_prefix_path = os.path.join(data_dir, 'prefix.json')
+
+    config = ConfigFile(config_path, default={"prefix": DEFAULT_PREFIX})
+    prefix_resolver = PrefixResolver(config, ConfigFile(guild_prefix_path))
+
+
+    def get_prefix(client, message):
+        """캐시된 설정에서 해당 서버의 접두사를 가져옵니다. (서버별 설정이 없으면 기본 접두사)"""
+        return prefix_resolver.get(message.guild.id if message.guild else None)
+
+
+    # 봇에 필요한 Intents 설정
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+
+    # --- bot 객체 생성 및 설정 (오류 수정) ---
+    # bot 객체를 한 번만 생성하고, 필요한 모든 설정을 여기에 포함합니다.
+    bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
+    # core.embed 모듈의 EmbedGenerator 클래스를 사용하여 인스턴스 생성
+    bot.embeds = EmbedGenerator(bot)
+    # 다른 Cog에서도 캐시된 설정과 접두사 조회기를 사용할 수 있도록 bot 객체에 연결
+    bot.config = config
+    bot.prefixes = prefix_resolver
+    # 음성 채널에 봇 혼자 남으면 일정 시간 뒤 나가는 타이머 (음악/TTS Cog가 함께 사용)
+    bot.idle_voice = IdleVoiceScheduler(bot, timeout=config.get("voice", {}).get("idle_timeout", 60.0))
+    # 음악과 TTS를 한 음성 연결에서 동시에 재생하는 서버별 믹서 (TTS를 읽는 동안 음악 볼륨을 줄임)
+    bot.voice_mixer = VoiceMixerManager(bot, duck_volume=config.get("voice", {}).get("duck_volume", 0.3))
+    bot.idle_voice.add_cleanup("mixer", bot.voice_mixer.remove)
+
+
+    @bot.event
+    async def on_ready():
+        """봇이 준비되었을 때 실행되는 이벤트입니다."""
+        print(f'봇 이름: {bot.user.name}')
+        print(f'봇 ID: {bot.user.id}')
+        print(f'연결된 서버 수: {len(bot.guilds)}')
+        print('봇이 성공적으로 시작되었습니다!')
+
+        # Cogs 로드
+        await load_all_cogs()
+
+        # 슬래시 명령어는 모든 Cog가 로드된 후에 동기화하는 것이 더 안정적일 수 있습니다.
+        # 필요시 `!sync` 명령어로 수동 동기화하는 것을 권장합니다.
+        # await bot.tree.sync() 
+
+        # --- 상태 메시지 설정 ---
+        current_prefix = prefix_resolver.default
+
+        activity = discord.Game(name=f"{current_prefix}help | 열심히 일하는 중")
+        await bot.change_presence(status=discord.Status.online, activity=activity)
+
+    async def load_all_cogs():
+        """cogs 폴더에 있는 모든 Cog를 로드합니다."""
+        # cogs 폴더는 bot.py와 같은 디렉토리 레벨에 있는 my_discord_bot/cogs 에 위치
+        cogs_path = "cogs" # import 경로를 직접 지정하는 것이 더 안정적입니다.
+
+        # os.path.join을 사용하여 cogs 폴더의 실제 파일 시스템 경로를 얻습니다.
+        # 이 경로는 파일 목록을 읽는 데 사용됩니다.
         try:
-            guild = discord.Object(id=int(guild_id))
-            bot.tree.copy_global_to(guild=guild)
-            synced = await bot.tree.sync(guild=guild)
-            await ctx.send(embed=bot.embeds.success("서버 동기화 성공", f"서버 ID `{guild_id}`에 {len(synced)}개의 명령어를 동기화했습니다. (즉시 반영)"))
-        except ValueError:
-            await ctx.send(embed=bot.embeds.error("오류", "잘못된 서버 ID입니다. 숫자만 입력해주세요."))
-        except Exception as e:
-            await ctx.send(embed=bot.embeds.error("서버 동기화 실패", f"해당 서버에 동기화 중 오류 발생: {e}"))
-    else:
-        await ctx.send(embed=bot.embeds.info("전역 동기화", "모든 서버에 전역으로 동기화를 시작합니다..."))
-        try:
-            synced = await bot.tree.sync()
-            await ctx.send(embed=bot.embeds.success("전역 동기화 성공", f"{len(synced)}개의 명령어가 전역으로 동기화되었습니다. (최대 1시간 소요)"))
-        except Exception as e:
-            await ctx.send(embed=bot.embeds.error("전역 동기화 실패", f"동기화 중 오류 발생: {e}"))
-
-
-@bot.hybrid_command(name="reload_cogs", help="모든 Cog를 다시 로드합니다. (봇 소유자만 가능)")
-@commands.is_owner()
-async def reload_cogs_command(ctx):
-    """모든 Cog를 다시 로드하는 명령어입니다."""
-    print("모든 Cog를 다시 로드합니다...")
-    loaded_extensions = list(bot.extensions.keys())
-    for extension_name in loaded_extensions:
-        try:
-            await bot.unload_extension(extension_name)
-            print(f"Cog 언로드: {extension_name}")
-        except Exception as e:
-            print(f"Cog 언로드 실패: {extension_name} - {e}")
-    
-    await load_all_cogs()
-    await ctx.send(embed=bot.embeds.success("Cog 리로드", "모든 Cog를 성공적으로 다시 로드했습니다!\n변경된 슬래시 명령어는 `!sync`로 별도 동기화해주세요."))
+            # sys.path[0]는 스크립트가 실행되는 디렉토리를 가리킵니다.
+            # 이 경로를 기준으로 cogs 폴더의 실제 위치를 찾습니다.
+            cogs_dir_path = os.path.join(sys.path[0], "cogs")
+            for filename in os.listdir(cogs_dir_path):
+                if filename.endswith('.py') and not filename.startswith('__'):
+                    extension_name = filename[:-3]
+                    extension_path = f"{cogs_path}.{extension_name}"
+                    if extension_path not in bot.extensions:
+                        try:
+                            await bot.load_extension(extension_path)
+                            print(f"Cog '{extension_name}' 로드 성공")
+                        except Exception as e:
+                            print(f"Cog '{extension_name}' 로드 실패: {type(e).__name__} - {e}")
+        except FileNotFoundError:
+            print(f"'{cogs_dir_path}' 디렉토리를 찾을 수 없습니다. Cog를 로드할 수 없습니다.")
+
+
+    # --- `sync` 명령어 강화: 특정 서버에 즉시 동기화 기능 추가 ---
+    @bot.hybrid_command(name="sync", help="슬래시 명령어를 동기화합니다. (봇 소유자만 가능)")
+    @commands.is_owner()
+    async def sync_command(ctx, guild_id: str = None):
+        """
+        특정 서버 또는 모든 서버에 슬래시 명령어를 동기화합니다.
+        사용법: !sync [서버_ID] (서버 ID 없으면 전역 동기화)
+        """
+        if guild_id:
+            try:
+                guild = discord.Object(id=int(guild_id))
+                bot.tree.copy_global_to(guild=guild)
+                synced = await bot.tree.sync(guild=guild)
+                await ctx.send(embed=bot.embeds.success("서버 동기화 성공", f"서버 ID `{guild_id}`에 {len(synced)}개의 명령어를 동기화했습니다. (즉시 반영)"))
+            except ValueError:
+                await ctx.send(embed=bot.embeds.error("오류", "잘못된 서버 ID입니다. 숫자만 입력해주세요."))
+            except Exception as e:
+                await ctx.send(embed=bot.embeds.error("서버 동기화 실패", f"해당 서버에 동기화 중 오류 발생: {e}"))
+        else:
+            await ctx.send(embed=bot.embeds.info("전역 동기화", "모든 서버에 전역으로 동기화를 시작합니다..."))
+            try:
+                synced = await bot.tree.sync()
+                await ctx.send(embed=bot.embeds.success("전역 동기화 성공", f"{len(synced)}개의 명령어가 전역으로 동기화되었습니다. (최대 1시간 소요)"))
+            except Exception as e:
+                await ctx.send(embed=bot.embeds.error("전역 동기화 실패", f"동기화 중 오류 발생: {e}"))
+
+
+    @bot.hybrid_command(name="reload_cogs", help="모든 Cog를 다시 로드합니다. (봇 소유자만 가능)")
+    @commands.is_owner()
+    async def reload_cogs_command(ctx):
+        """모든 Cog를 다시 로드하는 명령어입니다."""
+        print("모든 Cog를 다시 로드합니다...")
+        loaded_extensions = list(bot.extensions.keys())
+        for extension_name in loaded_extensions:
+            try:
+                await bot.unload_extension(extension_name)
+                print(f"Cog 언로드: {extension_name}")
+            except Exception as e:
+                print(f"Cog 언로드 실패: {extension_name} - {e}")
+
+        await load_all_cogs()
+        await ctx.send(embed=bot.embeds.success("Cog 리로드", "모든 Cog를 성공적으로 다시 로드했습니다!\n변경된 슬래시 명령어는 `!sync`로 별도 동기화해주세요."))
+
+    @bot.hybrid_command(name="reload_config", help="config.json과 서버별 접두사 설정을 다시 읽어옵니다. (봇 소유자만 가능)")
+    @commands.is_owner()
+    async def reload_config_command(ctx):
+        """파일 변경 감지를 기다리지 않고 설정 파일을 즉시 다시 로드합니다."""
+        prefix_resolver.reload()
+        await ctx.send(embed=bot.embeds.success("설정 리로드", f"설정을 다시 읽어왔습니다. 기본 접두사: `{prefix_resolver.default}`"))
+
+    @bot.hybrid_command(name="stats", help="각 기능의 캐시/저장/재생 통계를 보여줍니다. (봇 소유자만 가능)")
+    @commands.is_owner()
+    async def stats_command(ctx):
+        """get_stats()를 제공하는 Cog들의 통계를 모아 하나의 임베드로 보여줍니다."""
+        embed = bot.embeds.info("봇 통계")
+        sections = [{"음성 자동 퇴장": bot.idle_voice.stats(), "음성 믹서": bot.voice_mixer.stats()}]
+        for cog in bot.cogs.values():
+            get_stats = getattr(cog, "get_stats", None)
+            if get_stats:
+                sections.append(get_stats())
+        for stats in sections:
+            for section, values in stats.items():
+                lines = "\n".join(f"{key}: `{value}`" for key, value in values.items())
+                embed.add_field(name=section, value=lines[:1024] or "-", inline=False)
+        if not embed.fields:
+            embed.description = "표시할 통계가 없습니다."
+        await ctx.send(embed=embed)
+
+    return bot
+
 
 if __name__ == "__main__":
+    # 현재 작업 디렉토리를 기준으로 .env 파일 경로 설정
+    current_dir = os.getcwd()
+    dotenv_path = os.path.join(current_dir, '.env')
+
+    # .env 파일 로드 및 BOT_TOKEN 설정
+    load_dotenv(dotenv_path=dotenv_path)
+    BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+
+    bot = create_bot()
     if BOT_TOKEN:
         bot.run(BOT_TOKEN)
     else:
@@ -84,6 +84,18 @@ class AdminCommands(commands.Cog):
             # 접두사 명령어의 경우, 5초 뒤에 사라지는 메시지를 보냅니다.
             await ctx.send(embed=self.bot.embeds.success("청소 완료", final_message), delete_after=5)
 
+    @commands.hybrid_command(name="접두사", description="이 서버에서 사용할 명령어 접두사를 설정합니다.")
+    @commands.has_permissions(manage_guild=True) # '서버 관리' 권한이 있는 사용자만 사용 가능
+    async def set_prefix(self, ctx: commands.Context, prefix: Optional[str] = None):
+        """서버별 접두사를 설정합니다. 값을 비우면 기본 접두사로 되돌립니다."""
+        if prefix is not None and (len(prefix) > 5 or any(c.isspace() for c in prefix)):
+            await ctx.send(embed=self.bot.embeds.error("입력 오류", "접두사는 공백 없이 5자 이하로 입력해주세요."), ephemeral=True)
+            return
+
+        self.bot.prefixes.set_guild_prefix(ctx.guild.id, prefix)
+        current = self.bot.prefixes.get(ctx.guild.id)
+        await ctx.send(embed=self.bot.embeds.success("접두사 설정 완료", f"이 서버의 접두사가 `{current}` (으)로 설정되었습니다."))
+
 
 async def setup(bot: commands.Bot):
     """이 Cog를 봇에 추가하기 위해 discord.py가 호출하는 함수입니다."""
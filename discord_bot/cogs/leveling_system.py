@@ -1,16 +1,23 @@
 import discord
 from discord.ext import commands
-import json
 import os
 import asyncio
 from datetime import datetime, date
 import random
-from PIL import Image, ImageDraw, ImageFont
 import io
 import aiohttp
+import functools
+from collections import OrderedDict
 
 #-- 수정된 부분: 'check' -> 'check' 오타 수정
 from core import check
+from core.level_store import create_level_store
+from core.rank_index import RankIndex
+from core.pagination import PageView
+from core import render_worker
+from core.render_pool import RenderPool, RenderQueueFull
+from core.avatar_cache import AvatarCache
+from core.cache import LRUCache
 
 # 경로 설정
 COG_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +25,7 @@ DATA_DIR = os.path.join(COG_DIR, '..', 'data')
 USER_DATA_FILE = os.path.join(DATA_DIR, 'user_data.json')
 BOLD_FONT_PATH = os.path.join(DATA_DIR, 'bold_font.ttf')
 REGULAR_FONT_PATH = os.path.join(DATA_DIR, 'regular_font.ttf')
+AVATAR_CACHE_DIR = os.path.join(DATA_DIR, 'avatar_cache')
 
 
 if not os.path.exists(DATA_DIR):
@@ -26,46 +34,161 @@ if not os.path.exists(DATA_DIR):
 class LevelingSystem(commands.Cog):
     """서버별 아바타와 서버별 데이터 분리를 지원하는 레벨 시스템 Cog입니다."""
 
+    # 저장소 종류("json"/"sqlite"), 저장 주기(초), 즉시 저장을 유발하는 변경 수.
+    # config.json의 "leveling" 항목으로 덮어쓸 수 있습니다.
+    STORE_BACKEND = "json"
+    FLUSH_INTERVAL = 30.0
+    FLUSH_THRESHOLD = 100
+    # 순위표 한 페이지에 표시할 인원과, 서버별로 보관할 렌더링된 페이지 수
+    LEADERBOARD_PAGE_SIZE = 10
+    LEADERBOARD_CACHED_PAGES = 50
+    # 레벨 카드 렌더링 프로세스 수와 최대 대기 요청 수 (config.json의 "rank_card" 항목으로 덮어쓰기 가능)
+    RENDER_WORKERS = 2
+    RENDER_MAX_QUEUE = 8
+    # 아바타 캐시의 메모리 한도(MB)와 유효 시간(초), 디스크 보관 여부
+    AVATAR_CACHE_MB = 32
+    AVATAR_CACHE_TTL = 3600.0
+    AVATAR_CACHE_DISK = True
+    # 완성된 카드 PNG를 보관할 메모리 한도(MB)
+    CARD_CACHE_MB = 16
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         #-- 수정된 부분: 데이터 구조 변경 {guild_id: {user_id: data}}
-        self.user_data = {}
-        self.lock = asyncio.Lock()
-        self.bot.loop.create_task(self.load_user_data())
+        # 매 EXP 지급마다 바로 저장하지 않고, 변경된 항목만 표시해 두었다가 주기적으로 저장합니다.
+        settings = self.bot.config.get("leveling", {})
+        self.store = create_level_store(
+            settings.get("backend", self.STORE_BACKEND),
+            DATA_DIR,
+            flush_interval=settings.get("flush_interval", self.FLUSH_INTERVAL),
+            flush_threshold=settings.get("flush_threshold", self.FLUSH_THRESHOLD),
+        )
+        # 서버별 순위 인덱스 {guild_id: RankIndex}. 처음 필요할 때 만들고 이후에는 증분 갱신합니다.
+        # 데이터 전체가 이미 메모리에 있는 저장소(JSON)에서만 사용하고, SQLite는 DB 인덱스를 타는 쿼리로 순위를 계산합니다.
+        self.use_rank_index = self.store.IN_MEMORY
+        self.rank_indexes = {}
+        self._rank_index_builds = {}
+        # 인덱스를 만드는 동안 들어온 갱신 {guild_id: {user_id: (level, exp)}}
+        self._pending_rank_updates = {}
+        # 렌더링된 순위표 페이지 {guild_id: OrderedDict{page: text}}. 순위가 바뀐 구간의 페이지만 지웁니다.
+        # (순위가 바뀐 구간을 알 수 있는 순위 인덱스를 사용할 때만 보관합니다)
+        self.leaderboard_pages = {}
+        # 카드 렌더링(Pillow 작업과 PNG 인코딩)은 이벤트 루프를 막지 않도록 별도 프로세스에서 수행합니다.
+        # 폰트와 카드 템플릿은 각 작업자 프로세스가 시작될 때 한 번만 준비합니다.
+        render_settings = self.bot.config.get("rank_card", {})
+        self.render_pool = RenderPool(
+            max_workers=render_settings.get("workers", self.RENDER_WORKERS),
+            max_queue=render_settings.get("max_queue", self.RENDER_MAX_QUEUE),
+            initializer=render_worker.init_worker,
+            initargs=(BOLD_FONT_PATH, REGULAR_FONT_PATH),
+        )
         self.session = aiohttp.ClientSession()
-        
-    def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+        # 같은 아바타로 카드를 다시 만들 때는 다운로드와 디코딩을 모두 건너뜁니다.
+        self.avatar_cache = AvatarCache(
+            self.session,
+            max_bytes=int(render_settings.get("avatar_cache_mb", self.AVATAR_CACHE_MB) * 1024 * 1024),
+            ttl=render_settings.get("avatar_cache_ttl", self.AVATAR_CACHE_TTL),
+            spill_dir=AVATAR_CACHE_DIR if render_settings.get("avatar_cache_disk", self.AVATAR_CACHE_DISK) else None,
+        )
+        # 완성된 카드 PNG {(아바타 URL, 이름, 레벨, 경험치, 필요 경험치, 순위): bytes}
+        # 키가 그림에 영향을 주는 값 전부이므로, 그중 하나라도 바뀌면 자연히 새 키가 되어 다시 그립니다.
+        self.card_cache = LRUCache(max_bytes=int(render_settings.get("card_cache_mb", self.CARD_CACHE_MB) * 1024 * 1024))
+
+    async def cog_load(self):
+        await self.store.load()
+        self.store.start()
+        await asyncio.get_running_loop().run_in_executor(None, self.avatar_cache.prune_disk)
+
+    async def cog_unload(self):
+        # 봇 종료 시에도 discord.py가 Cog를 제거하면서 이 함수를 호출하므로, 남은 변경 사항이 저장됩니다.
+        await self.store.close()
+        await self.session.close()
+        self.render_pool.shutdown()
+
+    def get_stats(self) -> dict:
+        """`stats` 명령어에 표시할 통계를 반환합니다."""
+        return {
+            "레벨 데이터 저장": self.store.stats(),
+            "레벨 카드 렌더링": self.render_pool.stats(),
+            "아바타 캐시": self.avatar_cache.stats(),
+            "레벨 카드 캐시": self.card_cache.stats(),
+            "순위 인덱스": {
+                "인덱스가 있는 서버": len(self.rank_indexes),
+                "인덱스된 사용자": sum(len(index) for index in self.rank_indexes.values()),
+                "캐시된 순위표 페이지": sum(len(pages) for pages in self.leaderboard_pages.values()),
+            },
+        }
 
     # --- 데이터 관리 함수 ---
-    async def load_user_data(self):
-        async with self.lock:
-            if not os.path.exists(USER_DATA_FILE): self.user_data = {}; return
-            try:
-                with open(USER_DATA_FILE, 'r', encoding='utf-8') as f: self.user_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError): self.user_data = {}
+    def save_user_data(self, guild_id: int, user_id: int, data: dict):
+        """해당 사용자의 데이터가 바뀌었음을 표시하고 순위 인덱스를 갱신합니다. 실제 저장은 저장소가 모아서 처리합니다."""
+        self.store.mark_dirty(guild_id, user_id, data)
+        self._update_rank(guild_id, user_id, data["level"], data["exp"])
+
+    def _update_rank(self, guild_id: int, user_id: int, level: int, exp: int):
+        """순위 인덱스를 갱신하고, 순위가 바뀐 구간에 걸친 순위표 페이지 캐시만 무효화합니다."""
+        index = self.rank_indexes.get(guild_id)
+        if index is None:
+            if guild_id in self._pending_rank_updates:
+                self._pending_rank_updates[guild_id][user_id] = (level, exp)
+            return
+        moved = index.update(user_id, level, exp)
+        if moved:
+            self._invalidate_leaderboard(guild_id, *moved)
 
-    async def save_user_data(self):
-        async with self.lock:
-            with open(USER_DATA_FILE, 'w', encoding='utf-8') as f: json.dump(self.user_data, f, indent=4)
+    def _invalidate_leaderboard(self, guild_id: int, old_rank, new_rank: int):
+        pages = self.leaderboard_pages.get(guild_id)
+        if not pages:
+            return
+        size = self.LEADERBOARD_PAGE_SIZE
+        if old_rank is None:
+            # 새로 들어온 사용자는 그 아래 모든 순위를 한 칸씩 밀어냅니다.
+            first, last = (new_rank - 1) // size, None
+        else:
+            # 기존 사용자가 움직이면 이전 순위와 새 순위 사이의 구간만 바뀝니다.
+            first, last = (min(old_rank, new_rank) - 1) // size, (max(old_rank, new_rank) - 1) // size
+        for page in [p for p in pages if p >= first and (last is None or p <= last)]:
+            del pages[page]
+
+    async def get_rank(self, guild_id: int, user_id: int, data: dict) -> int:
+        """사용자의 서버 내 순위(1부터)를 반환합니다. data는 get_user_data()로 받은 현재 데이터입니다."""
+        if not self.use_rank_index:
+            return await self.store.rank_of(guild_id, user_id)
+        # 매번 정렬하지 않고, 증분 갱신되는 순위 인덱스에서 O(log n)으로 조회합니다.
+        index = await self.get_rank_index(guild_id)
+        self._update_rank(guild_id, user_id, data['level'], data['exp'])
+        return index.rank(user_id)
+
+    async def get_rank_index(self, guild_id: int) -> RankIndex:
+        """서버의 순위 인덱스를 반환합니다. 없으면 저장소의 데이터로 한 번만 만듭니다."""
+        index = self.rank_indexes.get(guild_id)
+        if index is not None:
+            return index
+        task = self._rank_index_builds.get(guild_id)
+        if task is None:
+            task = asyncio.create_task(self._build_rank_index(guild_id))
+            self._rank_index_builds[guild_id] = task
+        return await asyncio.shield(task)
+
+    async def _build_rank_index(self, guild_id: int) -> RankIndex:
+        pending = self._pending_rank_updates[guild_id] = {}
+        try:
+            entries = await self.store.ranking_entries(guild_id)
+            # 초기 정렬은 멤버 수에 비례하므로 실행기에서 수행합니다.
+            loop = asyncio.get_running_loop()
+            index = await loop.run_in_executor(None, RankIndex, entries)
+            for user_id, (level, exp) in pending.items():
+                index.update(user_id, level, exp)
+            self.rank_indexes[guild_id] = index
+            return index
+        finally:
+            self._pending_rank_updates.pop(guild_id, None)
+            self._rank_index_builds.pop(guild_id, None)
 
     #-- 수정된 부분: 서버 ID(guild_id)를 추가로 받아 서버별로 데이터를 관리
     async def get_user_data(self, guild_id: int, user_id: int):
         """특정 서버의 특정 사용자 데이터를 가져오거나, 없으면 생성합니다."""
-        guild_id_str = str(guild_id)
-        user_id_str = str(user_id)
-
-        # 서버 데이터가 없으면 빈 딕셔너리로 초기화
-        self.user_data.setdefault(guild_id_str, {})
-        
-        # 해당 서버에 사용자 데이터가 없으면 기본값으로 생성
-        self.user_data[guild_id_str].setdefault(user_id_str, {
-            "level": 1,
-            "exp": 0,
-            "last_message_timestamp": 0,
-            "last_checkin_date": "1970-01-01"
-        })
-        return self.user_data[guild_id_str][user_id_str]
+        return await self.store.get_user(guild_id, user_id)
 
     def get_required_exp(self, level: int):
         return 8 * (level ** 2) + (50 * level) + 100
@@ -91,7 +214,7 @@ class LevelingSystem(commands.Cog):
                 await target_channel.send(embed=self.bot.embeds.success("레벨 업!", f"축하합니다, {user.mention}님! **레벨 {data['level']}**을 달성하셨습니다! :tada:"))
             except discord.Forbidden: pass
             
-        await self.save_user_data()
+        self.save_user_data(user.guild.id, user.id, data)
 
     # --- 이벤트 리스너 ---
     @commands.Cog.listener()
@@ -109,61 +232,32 @@ class LevelingSystem(commands.Cog):
 
     # --- 레벨 카드 생성 함수 ---
     async def create_rank_card(self, user: discord.Member, level_data: dict, rank: int):
-        try:
-            name_font = ImageFont.truetype(BOLD_FONT_PATH, 120)      
-            level_font = ImageFont.truetype(REGULAR_FONT_PATH, 60)    
-            exp_font = ImageFont.truetype(BOLD_FONT_PATH, 40)      
-        except IOError: 
-            name_font, level_font, exp_font = ImageFont.load_default(), ImageFont.load_default(), ImageFont.load_default()
-
         #-- 수정된 부분: 서버별 프로필 사진(display_avatar)을 사용하도록 변경
-        avatar_url = user.display_avatar.url
-        async with self.session.get(str(avatar_url)) as response:
-            if response.status == 200:
-                avatar_bytes = await response.read()
-                avatar_image = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
-            else:
-                avatar_image = Image.new("RGBA", (200, 200), (255, 255, 255, 0))
+        avatar_url = str(user.display_avatar.url)
+        required_exp = self.get_required_exp(level_data['level'])
+        card_key = (avatar_url, user.display_name, level_data['level'], level_data['exp'], required_exp, rank)
+        png_bytes = self.card_cache.get(card_key)
+        if png_bytes is not None:
+            return discord.File(io.BytesIO(png_bytes), "rank_card.png")
 
-        card = Image.new("RGBA", (934, 350), (0, 0, 0, 0))
-        
-        start_color = (100, 180, 160); end_color = (80, 150, 90)
-        for y in range(card.height):
-            r = int(start_color[0] + (end_color[0] - start_color[0]) * (y / card.height)); g = int(start_color[1] + (end_color[1] - start_color[1]) * (y / card.height)); b = int(start_color[2] + (end_color[2] - start_color[2]) * (y / card.height))
-            ImageDraw.Draw(card).line([(0, y), (card.width, y)], fill=(r, g, b))
-
-        mask = Image.new("L", card.size, 0); draw_mask = ImageDraw.Draw(mask)
-        draw_mask.rounded_rectangle((0, 0, card.width, card.height), radius=20, fill=255)
-        card.putalpha(mask)
-
-        avatar_image = avatar_image.resize((210, 210)); avatar_mask = Image.new("L", avatar_image.size, 0)
-        ImageDraw.Draw(avatar_mask).ellipse((0, 0) + avatar_image.size, fill=255)
-        card.paste(avatar_image, (36, 60), avatar_mask)
-
-        draw = ImageDraw.Draw(card)
-        draw.text((290, 0), user.display_name, font=name_font, fill=(255, 255, 255), stroke_width=0, stroke_fill=(0,0,0))
-        draw.text((297, 155), f"Level {level_data['level']}", font=level_font, fill=(255, 255, 255), stroke_fill=(0,0,0))
-        draw.text((600, 155), f"Rank #{rank}", font=level_font, fill=(255, 255, 255), stroke_fill=(0,0,0))
-        draw.text((295, 230), f"{level_data['exp']} / {self.get_required_exp(level_data['level'])} EXP", font=exp_font, fill=(255, 255, 255))
-
-        bar_x, bar_y, bar_width, bar_height, bar_radius = 290, 280, 600, 30, 15
-        draw.rounded_rectangle((bar_x, bar_y, bar_x + bar_width, bar_y + bar_height), radius=bar_radius, fill=(50, 80, 55), outline=(75, 99, 62), width=3)
-        progress_ratio = level_data['exp'] / self.get_required_exp(level_data['level'])
-        fill_width = int(bar_width * progress_ratio)
-        if fill_width > 1:
-            fill_image = Image.new("RGBA", (fill_width, bar_height), (0, 0, 0, 0)); fill_draw = ImageDraw.Draw(fill_image)
-            grad_start = (105, 190, 115); grad_end = (180, 220, 130)
-            for x in range(fill_width):
-                r = int(grad_start[0] + (grad_end[0] - grad_start[0]) * (x / fill_width)); g = int(grad_start[1] + (grad_end[1] - grad_start[1]) * (x / fill_width)); b = int(grad_start[2] + (grad_end[2] - grad_start[2]) * (x / fill_width))
-                fill_draw.line([(x, 0), (x, bar_height)], fill=(r, g, b))
-            fill_mask = Image.new("L", fill_image.size, 0); draw_fill_mask = ImageDraw.Draw(fill_mask)
-            draw_fill_mask.rounded_rectangle((0, 0, fill_width, bar_height), radius=bar_radius, fill=255)
-            fill_image.putalpha(fill_mask)
-            card.paste(fill_image, (bar_x, bar_y), fill_image)
-            draw.rounded_rectangle((bar_x, bar_y, bar_x + fill_width, bar_y + bar_height), radius=bar_radius, outline=(50, 80, 55), width=2)
-
-        buffer = io.BytesIO(); card.save(buffer, "PNG"); buffer.seek(0)
-        return discord.File(buffer, "rank_card.png")
+        avatar = await self.avatar_cache.get(avatar_url)
+
+        # 프로세스 경계를 넘는 값은 아바타 바이트, 이름, 숫자뿐입니다.
+        # 캐시에 준비된 픽셀이 있으면 원본 대신 그것을 넘겨 작업자의 디코딩/리사이즈를 생략합니다.
+        avatar_bytes = prepared = None
+        if avatar is not None:
+            prepared = avatar.prepared
+            avatar_bytes = None if prepared else avatar.raw
+        png_bytes, new_prepared = await self.render_pool.submit(
+            render_worker.render_rank_card, avatar_bytes, prepared, user.display_name, level_data['level'], level_data['exp'],
+            required_exp, rank
+        )
+        if avatar_bytes and new_prepared:
+            self.avatar_cache.set_prepared(avatar_url, new_prepared)
+        # 아바타를 받지 못해 빈 아바타로 그린 카드는 다음에 다시 시도하도록 보관하지 않습니다.
+        if avatar is not None:
+            self.card_cache.put(card_key, png_bytes)
+        return discord.File(io.BytesIO(png_bytes), "rank_card.png")
 
     # --- 사용자 명령어 ---
     @commands.hybrid_command(name="레벨", description="자신의 레벨과 경험치를 그래픽 카드로 확인합니다.")
@@ -174,20 +268,69 @@ class LevelingSystem(commands.Cog):
         data = await self.get_user_data(ctx.guild.id, user.id)
 
         #-- 수정된 부분: 현재 서버의 유저들만 대상으로 랭킹을 계산
-        guild_data = self.user_data.get(str(ctx.guild.id), {})
-        sorted_users = sorted(guild_data.items(), key=lambda item: (item[1]['level'], item[1]['exp']), reverse=True)
-        rank = -1
-        for i, (user_id, _) in enumerate(sorted_users):
-            if int(user_id) == user.id:
-                rank = i + 1
-                break
+        rank = await self.get_rank(ctx.guild.id, user.id, data)
 
         try:
             rank_card_file = await self.create_rank_card(user, data, rank)
             await ctx.send(file=rank_card_file)
+        except RenderQueueFull:
+            await ctx.send(embed=self.bot.embeds.error("잠시 후 다시 시도해주세요", "레벨 카드 요청이 몰려 있어요. 잠시 후 다시 시도해주세요."))
         except Exception as e:
             await ctx.send(embed=self.bot.embeds.error("이미지 생성 실패", f"레벨 카드를 만드는 중 오류가 발생했습니다: {e}"))
             
+    async def render_leaderboard_page(self, guild: discord.Guild, viewer_id: int, page: int):
+        """
+        순위표의 한 페이지를 그립니다. 순위 인덱스를 쓰면 캐시된 페이지는 인덱스를 다시 읽지 않고,
+        SQLite 저장소면 필요한 페이지만 DB에서 (LIMIT/OFFSET) 읽어옵니다.
+        """
+        index = await self.get_rank_index(guild.id) if self.use_rank_index else None
+        total = len(index) if index is not None else await self.store.count(guild.id)
+        size = self.LEADERBOARD_PAGE_SIZE
+        page_count = max(1, -(-total // size))
+        page = min(page, page_count - 1)
+
+        pages = self.leaderboard_pages.setdefault(guild.id, OrderedDict()) if index is not None else None
+        text = pages.get(page) if pages is not None else None
+        if text is None:
+            offset = page * size
+            if index is not None:
+                entries = index.page(offset, size)
+            else:
+                entries = [(user_id, data["level"], data["exp"]) for user_id, data in await self.store.top(guild.id, offset, size)]
+            lines = [
+                f"**{offset + i + 1}.** <@{user_id}> — 레벨 {level} ({exp} EXP)"
+                for i, (user_id, level, exp) in enumerate(entries)
+            ]
+            text = "\n".join(lines) or "아직 순위 정보가 없습니다."
+            if pages is not None:
+                pages[page] = text
+                while len(pages) > self.LEADERBOARD_CACHED_PAGES:
+                    pages.popitem(last=False)
+        else:
+            pages.move_to_end(page)
+
+        embed = self.bot.embeds.info(f"{guild.name} 레벨 순위", text)
+        embed.add_field(name="페이지", value=f"{page + 1} / {page_count}", inline=True)
+        embed.add_field(name="참여 인원", value=f"{total}명", inline=True)
+        if index is not None:
+            viewer_rank = index.rank(viewer_id)
+        else:
+            viewer_rank = await self.store.rank_of(guild.id, viewer_id, create=False)
+        if viewer_rank > 0:
+            embed.add_field(name="내 순위", value=f"#{viewer_rank}", inline=True)
+        return embed, page_count
+
+    @commands.hybrid_command(name="랭킹", description="서버의 레벨 순위표를 페이지별로 확인합니다.")
+    async def leaderboard(self, ctx: commands.Context, 페이지: commands.Range[int, 1] = 1):
+        await ctx.defer()
+        view = PageView(
+            author_id=ctx.author.id,
+            render_page=functools.partial(self.render_leaderboard_page, ctx.guild, ctx.author.id),
+            page=페이지 - 1,
+        )
+        embed = await view.render()
+        view.message = await ctx.send(embed=embed, view=view)
+
     @commands.hybrid_command(name="출석", description="매일 한 번 출석하여 경험치를 얻습니다.")
     async def checkin(self, ctx: commands.Context):
         user = ctx.author
@@ -217,7 +360,7 @@ class LevelingSystem(commands.Cog):
         if level <= 0: await ctx.interaction.followup.send(embed=self.bot.embeds.error("입력 오류", "레벨은 1 이상이어야 합니다."), ephemeral=True); return
         #-- 수정된 부분: 해당 멤버가 속한 서버의 데이터 수정
         data = await self.get_user_data(member.guild.id, member.id)
-        data['level'] = level; data['exp'] = 0; await self.save_user_data()
+        data['level'] = level; data['exp'] = 0; self.save_user_data(member.guild.id, member.id, data)
         await ctx.interaction.followup.send(embed=self.bot.embeds.success("작업 완료", f"{member.mention}님의 레벨을 **{level}** (으)로 설정했습니다."), ephemeral=True)
 
     @adjust.command(name="경험치설정", description="특정 사용자의 경험치를 설정합니다.")
@@ -226,7 +369,7 @@ class LevelingSystem(commands.Cog):
         await ctx.defer(ephemeral=True)
         if exp < 0: await ctx.interaction.followup.send(embed=self.bot.embeds.error("입력 오류", "경험치는 0 이상이어야 합니다."), ephemeral=True); return
         data = await self.get_user_data(member.guild.id, member.id)
-        data['exp'] = exp; await self.save_user_data()
+        data['exp'] = exp; self.save_user_data(member.guild.id, member.id, data)
         await self.grant_exp(member, 0, channel=ctx.channel)
         await ctx.interaction.followup.send(embed=self.bot.embeds.success("작업 완료", f"{member.mention}님의 경험치를 **{exp}** (으)로 설정했습니다."), ephemeral=True)
 
@@ -239,7 +382,7 @@ class LevelingSystem(commands.Cog):
             data = await self.get_user_data(member.guild.id, member.id)
             data['exp'] += amount
             if data['exp'] < 0: data['exp'] = 0
-            await self.save_user_data()
+            self.save_user_data(member.guild.id, member.id, data)
         await ctx.interaction.followup.send(embed=self.bot.embeds.success("작업 완료", f"{member.mention}님에게 경험치 **{amount}**을(를) 적용했습니다."), ephemeral=True)
 
 
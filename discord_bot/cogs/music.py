@@ -2,13 +2,25 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import yt_dlp
 import functools
 from typing import List
 import os
 
 # --- core 폴더의 유틸리티들을 임포트합니다. ---
 from core import check, embed, exceptions
+from core.player import GuildPlayer
+from core.track import Track
+from core.prefetch import StreamPrefetcher
+from core.track_cache import TrackCache, is_url
+from core.search_cache import SearchCache
+from core.audio_cache import AudioCache
+from core.extractor import ExtractorService, ExtractionCancelled
+from core.pagination import PageView
+
+# 경로 설정
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+TRACK_CACHE_FILE = os.path.join(DATA_DIR, 'track_cache.json')
+AUDIO_CACHE_DIR = os.path.join(DATA_DIR, 'audio_cache')
 
 
 
@@ -32,6 +44,9 @@ ydl_opts = {
 ffmpeg_opts = {
     'options': '-vn -b:a 128k', # 오디오 비트레이트를 128kbps로 고정 (선택 사항)
     'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -probesize 20M -analyzeduration 15M',
+    # 재생 중인 곡을 현재 위치(-ss)부터 PCM으로 다시 열 때의 옵션. 이미 한 번 재생한 스트림이므로 형식 분석을 크게 잡지 않아
+    # (20MB를 미리 읽지 않아) 다시 여는 동안의 공백이 짧습니다.
+    'seek_before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
 }
 
 '''
@@ -41,13 +56,25 @@ ffmpeg_opts = {
 -b:a 192k (선택 사항): 오디오 비트레이트(bitrate)를 192kbps로 고정합니다. 음질을 일정 수준으로 유지하면서 데이터 전송량을 안정시키는 데 도움이 될 수 있습니다.
 '''
 
+
+def format_duration(seconds: float) -> str:
+    """초를 '분:초' (1시간 이상이면 '시:분:초') 형태로 바꿉니다."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
 # --- 검색 결과를 표시하고 상호작용을 처리할 View 클래스 ---
 class SearchView(discord.ui.View):
     def __init__(self, *, ctx: commands.Context, search_results: List[dict]):
         super().__init__(timeout=60.0) # 60초 후 타임아웃
         self.ctx = ctx
         self.bot = ctx.bot
-        self.search_results = search_results
+        self.message = None
+        # 선택 메뉴에는 최대 25개 항목만 넣을 수 있습니다.
+        self.search_results = list(search_results)[:25]
+        # 페이지 URL -> 검색 결과 항목. 선택된 곡의 정보를 다시 추출하지 않고 곡 정보 캐시에 넣을 때 사용합니다.
+        self.entries = {entry['webpage_url']: entry for entry in self.search_results}
 
         # 검색 결과를 바탕으로 드롭다운 메뉴를 생성하여 View에 추가
         self.add_item(SongSelect(ctx=ctx, options=self._create_select_options()))
@@ -56,11 +83,13 @@ class SearchView(discord.ui.View):
         """검색 결과로 SelectOption 목록을 생성합니다."""
         options = []
         for i, entry in enumerate(self.search_results):
+            duration = entry.get('duration')
+            duration_str = format_duration(duration) if duration else "N/A"
             # discord.SelectOption: 드롭다운의 각 항목
             options.append(discord.SelectOption(
                 label=f"{i+1}. {entry['title']}"[:100], # 라벨은 최대 100자
-                description=f"D: {entry.get('duration_string', 'N/A')} | V: {entry.get('view_count', 0):,}"[:100],
-                value=str(i) # 값으로는 리스트의 인덱스를 사용
+                description=f"아티스트: {entry.get('uploader') or 'Unknown Artist'} | 길이: {duration_str}"[:100],
+                value=entry['webpage_url'] # 값으로는 곡의 페이지 URL을 직접 사용
             ))
         return options
 
@@ -98,6 +127,10 @@ class SongSelect(discord.ui.Select):
         # music_cog를 찾아서 내부 함수 호출
         music_cog = self.bot.get_cog('Music')
         if music_cog:
+            # 캐시된 검색 결과에서 고른 곡이면, 그 사이 곡 정보 캐시에서 밀려났더라도 검색 결과로 다시 채워 둡니다.
+            entry = self.view.entries.get(selected_url) if self.view else None
+            if entry:
+                music_cog.track_cache.seed(entry)
             # 선택된 노래의 URL을 사용하여 재생 큐에 추가
             # _queue_and_play 함수가 상세 정보 로딩을 처리해 줄 것임
             await music_cog._queue_and_play(self.ctx, selected_url, interaction)
@@ -110,18 +143,136 @@ class SongSelect(discord.ui.Select):
 
                 
 class Music(commands.Cog):
+    # 현재 곡 재생 중에 스트림 URL을 미리 받아 둘 다음 곡 수와,
+    # 만료 몇 초 전에 URL을 다시 받을지 (config.json의 "music" 항목으로 덮어쓰기 가능)
+    PREFETCH_DEPTH = 2
+    PREFETCH_REFRESH_MARGIN = 120.0
+    # 곡 정보 캐시의 최대 곡 수, 유효 시간(초), 디스크 저장 주기(초)
+    TRACK_CACHE_SIZE = 5000
+    TRACK_CACHE_TTL = 7 * 24 * 3600
+    TRACK_CACHE_SAVE_INTERVAL = 300.0
+    # yt-dlp 추출 전용 스레드 수와, 한 서버가 동시에 실행할 수 있는 추출 수
+    EXTRACT_WORKERS = 4
+    EXTRACT_PER_GUILD = 2
+    # 서버 대기열에 넣을 수 있는 최대 곡 수와, 플레이리스트를 대기열에 넣을 때 한 번에 넘겨받을 항목 수
+    MAX_QUEUE_SIZE = 1000
+    PLAYLIST_CHUNK_SIZE = 50
+    # 대기열 명령어 한 페이지에 보여줄 곡 수
+    QUEUE_PAGE_SIZE = 10
+    # 검색 결과 캐시의 최대 검색어 수와 유효 시간(초)
+    SEARCH_CACHE_SIZE = 256
+    SEARCH_CACHE_TTL = 600.0
+    # 오디오 캐시: 몇 번째 재생부터 Opus 파일로 저장할지, 디렉터리 최대 크기(MB), 저장할 곡의 최대 길이(초)
+    AUDIO_CACHE_MIN_PLAYS = 3
+    AUDIO_CACHE_MB = 512
+    AUDIO_CACHE_MAX_DURATION = 900.0
+    # 재생 방식: 'opus'는 ffmpeg가 볼륨까지 처리해 Opus로 바로 보내고, 'pcm'은 Python에서 볼륨을 조절합니다.
+    PLAYBACK_MODE = 'opus'
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # self.vc는 더 이상 클래스 변수로 사용하지 않고, ctx.voice_client를 통해 접근합니다.
-        self.queue = []
-        self.current_song_info = None
-
-        # 서버(Guild) ID를 키로, 볼륨 배율을 값으로 저장하는 딕셔너리
-        self.user_volume_multipliers = {}
-        # 서버(Guild) ID를 키로, 기본 볼륨을 값으로 저장
-        self.base_volumes = {}
-        # 기본 볼륨을 상수로 정의하여 관리 용이성을 높임
-        self.DEFAULT_BASE_VOLUME = 0.2
+        # 서버(Guild) ID -> GuildPlayer. 대기열, 현재 곡, 볼륨 설정을 서버별로 따로 관리합니다.
+        self.players = {}
+        settings = self.bot.config.get("music", {})
+        self.prefetch_depth = settings.get("prefetch_depth", self.PREFETCH_DEPTH)
+        self.prefetch_refresh_margin = settings.get("prefetch_refresh_margin", self.PREFETCH_REFRESH_MARGIN)
+        # 검색/대기열 추가/재생에서 같은 곡을 매번 다시 추출하지 않도록 곡 정보를 모든 서버가 함께 캐시합니다.
+        self.track_cache = TrackCache(
+            TRACK_CACHE_FILE,
+            max_items=settings.get("track_cache_size", self.TRACK_CACHE_SIZE),
+            ttl=settings.get("track_cache_ttl", self.TRACK_CACHE_TTL),
+        )
+        self._track_cache_task = None
+        self.extractor = ExtractorService(
+            ydl_opts,
+            max_workers=settings.get("extract_workers", self.EXTRACT_WORKERS),
+            per_guild_limit=settings.get("extract_per_guild", self.EXTRACT_PER_GUILD),
+        )
+        self.max_queue_size = settings.get("max_queue_size", self.MAX_QUEUE_SIZE)
+        self.playback_mode = settings.get("playback_mode", self.PLAYBACK_MODE)
+        # 재생 방식별로 만든 소스 수 (PCM 전환: Opus로 재생 중 볼륨이 바뀌어 PCM으로 다시 시작한 횟수)
+        self.playback_counts = {"Opus (그대로 전송)": 0, "Opus (ffmpeg 볼륨)": 0, "PCM": 0, "PCM (TTS와 섞는 중 시작)": 0, "PCM 전환": 0}
+        self.search_cache = SearchCache(
+            max_items=settings.get("search_cache_size", self.SEARCH_CACHE_SIZE),
+            ttl=settings.get("search_cache_ttl", self.SEARCH_CACHE_TTL),
+        )
+        # 자주 재생되는 곡을 디스크에 Opus로 저장해 두는 오디오 캐시 (선택 기능)
+        self.audio_cache = None
+        if settings.get("audio_cache", False):
+            self.audio_cache = AudioCache(
+                AUDIO_CACHE_DIR,
+                max_bytes=settings.get("audio_cache_mb", self.AUDIO_CACHE_MB) * 1024 * 1024,
+                min_plays=settings.get("audio_cache_min_plays", self.AUDIO_CACHE_MIN_PLAYS),
+                max_duration=settings.get("audio_cache_max_duration", self.AUDIO_CACHE_MAX_DURATION),
+            )
+
+    def get_player(self, guild: discord.Guild) -> GuildPlayer:
+        """서버의 GuildPlayer를 반환합니다. 없으면 만들고 재생 작업을 시작합니다."""
+        player = self.players.get(guild.id)
+        if player is None:
+            prefetcher = StreamPrefetcher(self._resolve_stream, depth=self.prefetch_depth, refresh_margin=self.prefetch_refresh_margin)
+            player = GuildPlayer(self.bot, guild, self._create_source, prefetcher=prefetcher)
+            self.players[guild.id] = player
+        player.start()
+        return player
+
+    async def cog_load(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.track_cache.load)
+        if self.audio_cache:
+            await asyncio.get_running_loop().run_in_executor(None, self.audio_cache.load)
+        self._track_cache_task = asyncio.create_task(self._save_track_cache_loop())
+        self.bot.idle_voice.add_cleanup("music", self._cleanup_guild)
+
+    async def cog_unload(self):
+        self.bot.idle_voice.remove_cleanup("music")
+        for player in self.players.values():
+            player.destroy()
+            # 재생 작업만 끝내면 지금 곡은 음성 연결에서 계속 나오므로, 믹서의 음악 채널도 멈춥니다.
+            player.mixer.stop("music")
+        self.players.clear()
+        if self._track_cache_task:
+            self._track_cache_task.cancel()
+        await self.track_cache.save()
+        self.extractor.shutdown()
+        if self.audio_cache:
+            self.audio_cache.cancel_all()
+
+    async def _save_track_cache_loop(self):
+        """바뀐 곡 정보가 있으면 주기적으로 디스크에 저장합니다."""
+        while True:
+            await asyncio.sleep(self.TRACK_CACHE_SAVE_INTERVAL)
+            try:
+                await self.track_cache.save()
+            except Exception as e:
+                print(f"곡 정보 캐시 저장 실패: {e}")
+
+    def get_stats(self) -> dict:
+        """`stats` 명령어에 표시할 통계를 반환합니다."""
+        players = list(self.players.values())
+        transitions = sum(player.gap_count for player in players)
+        prefetch = {}
+        for player in players:
+            for key, value in player.prefetcher.stats().items():
+                prefetch[key] = prefetch.get(key, 0) + value
+        stats = {
+            "음악 재생": {
+                "플레이어가 있는 서버": len(players),
+                "재생 중인 서버": sum(1 for player in players if player.current),
+                "대기 중인 곡": sum(len(player.queue) for player in players),
+                "곡 전환": transitions,
+                "평균 곡 사이 공백(ms)": round(sum(player.total_gap for player in players) / transitions * 1000, 1) if transitions else 0.0,
+                "최대 곡 사이 공백(ms)": round(max((player.max_gap for player in players), default=0.0) * 1000, 1),
+            },
+            "재생 방식": dict(self.playback_counts),
+            "스트림 미리 받기": prefetch,
+            "곡 정보 캐시": self.track_cache.stats(),
+            "검색 결과 캐시": self.search_cache.stats(),
+            "yt-dlp 추출": self.extractor.stats(),
+        }
+        if self.audio_cache:
+            stats["오디오 캐시"] = self.audio_cache.stats()
+        return stats
 
     # --- Cog 전용 에러 핸들러를 추가하여 커스텀 에러를 처리합니다. ---
     @commands.Cog.listener()
@@ -153,19 +304,17 @@ class Music(commands.Cog):
         if not voice_client:
             return
 
-        # --- 핵심 개선 로직 ---
-        # before.channel: 유저가 '이전'에 있던 채널
-        # after.channel: 유저가 '이후'에 있는 채널
-        # 누군가가 봇이 있는 채널에서 나갔을 경우 (다른 채널로 이동했거나, 연결을 끊었을 때)
+        # 음성 채널을 나간 사용자가 요청해 둔 곡 정보 추출은 더 이상 필요 없으므로 취소
+        # (봇 혼자 남았을 때의 자동 퇴장은 bot.idle_voice가 서버마다 타이머 하나로 처리합니다)
         if before.channel == voice_client.channel and after.channel != voice_client.channel:
-            # 채널에 봇 혼자 남았는지 확인
-            if len(voice_client.channel.members) == 1:
-                # 60초 대기 후에도 여전히 혼자인지 최종 확인
-                await asyncio.sleep(60)
-                if voice_client.is_connected() and len(voice_client.channel.members) == 1:
-                    await voice_client.channel.send(embed=self.bot.embeds.info("자동 퇴장", "아무도 없어서 채널을 나갈게요! 👋"))
-                    self.queue = [] # 대기열 초기화
-                    await voice_client.disconnect()
+            self.extractor.cancel(member.guild.id, member.id)
+
+    def _cleanup_guild(self, guild: discord.Guild):
+        """자동 퇴장할 때 이 서버의 플레이어(대기열, 미리 받기)와 진행 중인 추출을 정리합니다."""
+        player = self.players.pop(guild.id, None)
+        if player:
+            player.destroy()
+        self.extractor.cancel(guild.id)
 
     # --- 큐 추가 및 재생 시작을 위한 내부 헬퍼 함수 ---
     async def _queue_and_play(self, ctx: commands.Context, search_term: str, interaction: discord.Interaction = None):
@@ -173,50 +322,86 @@ class Music(commands.Cog):
         send_method = interaction.followup.send if interaction else ctx.send
         send_kwargs = {'ephemeral': True} if interaction else {}
 
+        player = self.get_player(ctx.guild)
+        # 서버별 대기열 길이를 제한하여 큰 플레이리스트가 메모리를 무한정 차지하지 않게 합니다.
+        # 여기서는 바로 거절할 수 있는지만 보고, 실제로 넣을 수 있는 곡 수는 넣기 직전에 다시 계산합니다.
+        if len(player.queue) >= self.max_queue_size:
+            embed = self.bot.embeds.error("대기열 가득 참", f"대기열에는 최대 {self.max_queue_size}곡까지 넣을 수 있어요.")
+            return await send_method(embed=embed, **send_kwargs)
+
         try:
-            loop = asyncio.get_running_loop()
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                blocking_task = functools.partial(ydl.extract_info, search_term, download=False)
-                info = await loop.run_in_executor(None, blocking_task)
-            
+            # 이미 정보를 아는 곡 URL(검색 결과에서 고른 곡 등)이면 추출하지 않습니다.
+            cached = self.track_cache.get(search_term) if is_url(search_term) else None
+            if cached is not None:
+                track = Track.from_context(ctx, cached['webpage_url'], cached['title'])
+                # 재생 중이 아니면 서버의 재생 작업이 바로 이 곡을 재생합니다.
+                player.enqueue(track)
+                embed = self.bot.embeds.success("대기열 추가", f"'{track.title}'을(를) 대기열에 추가했습니다.")
+                return await send_method(embed=embed, **send_kwargs)
+
             # --- 핵심 수정 부분 ---
-            # 플레이리스트인 경우 (여러 'entries'가 존재)
-            if 'entries' in info and info['entries']:
-                added_count = 0
-                for entry in info['entries']:
-                    # 각 entry에서 필요한 정보를 추출
-                    title = entry.get('title', 'Unknown Song')
-                    source_url = entry.get('webpage_url')
-                    if source_url:
-                        song = {'source': source_url, 'title': title, 'channel': ctx.channel, 'requester': ctx.author, 'is_live': False}
-                        self.queue.append(song)
-                        added_count += 1
-                
+            # 플레이리스트 전체를 처리할 때까지 기다리지 않고, 가벼운 항목(URL/제목)을 받는 대로 대기열에 넣습니다.
+            # 첫 묶음이 들어가는 즉시 첫 곡이 재생되고, 각 곡의 스트림 URL은 재생 직전에(또는 미리 받기로) 추출됩니다.
+            info = None
+            added = 0
+            truncated = False
+            entries_stream = self.extractor.iter_entries(search_term, guild_id=ctx.guild.id, requester_id=ctx.author.id, chunk_size=self.PLAYLIST_CHUNK_SIZE)
+            try:
+                async for info, entries in entries_stream:
+                    # 플레이리스트를 받는 동안 다른 재생 요청도 같은 대기열에 곡을 넣을 수 있으므로,
+                    # 남은 자리는 묶음을 넣기 직전에 매번 다시 계산합니다. (이 사이에는 await가 없음)
+                    room = self.max_queue_size - len(player.queue)
+                    tracks = []
+                    for entry in entries:
+                        # 각 entry에서 필요한 정보를 추출
+                        source_url = entry.get('webpage_url') or entry.get('url')
+                        if not source_url:
+                            continue
+                        if len(tracks) >= room:
+                            truncated = True
+                            break
+                        if entry.get('format_id'):
+                            # 단일 곡은 스트림 URL까지 골라진 정보이므로, 재생할 때 다시 추출하지 않도록 저장합니다.
+                            self.track_cache.put_info(entry)
+                        else:
+                            self.track_cache.seed(entry)
+                        tracks.append(Track.from_context(ctx, source_url, entry.get('title') or source_url))
+                    if tracks and not added:
+                        first_title = tracks[0].title
+                    player.enqueue_many(tracks)
+                    added += len(tracks)
+                    if truncated:
+                        break
+            finally:
+                await entries_stream.aclose()
+
+            if info is None or not added:
+                if truncated:
+                    embed = self.bot.embeds.error("대기열 가득 참", f"대기열에는 최대 {self.max_queue_size}곡까지 넣을 수 있어요.")
+                else:
+                    embed = self.bot.embeds.error("정보 추출 실패", "재생할 수 있는 노래를 찾지 못했습니다.")
+                return await send_method(embed=embed, **send_kwargs)
+
+            # 플레이리스트인 경우 (검색어는 검색 결과 목록(scsearch1:)으로 따라가므로, 검색 추출기의 결과는 단일 곡으로 봅니다)
+            if info.get('_type') in ('playlist', 'multi_video') and 'search' not in (info.get('extractor_key') or info.get('extractor') or '').lower():
                 playlist_title = info.get('title', '이 플레이리스트')
-                embed = self.bot.embeds.success("플레이리스트 추가", f"'{playlist_title}'에서 **{added_count}개**의 노래를 대기열에 추가했습니다.")
-                await send_method(embed=embed, **send_kwargs)
-
+                description = f"'{playlist_title}'에서 **{added}개**의 노래를 대기열에 추가했습니다."
+                if truncated:
+                    description += f"\n대기열은 최대 {self.max_queue_size}곡까지라 나머지는 추가하지 않았어요."
+                embed = self.bot.embeds.success("플레이리스트 추가", description)
             # 단일 곡인 경우
             else:
-                title = info.get('title', 'Unknown Song')
-                source_url = info.get('webpage_url', search_term)
-                
-                song = {'source': source_url, 'title': title, 'channel': ctx.channel, 'requester': ctx.author, 'is_live': False}
-                self.queue.append(song)
-                
-                embed = self.bot.embeds.success("대기열 추가", f"'{title}'을(를) 대기열에 추가했습니다.")
-                await send_method(embed=embed, **send_kwargs)
+                embed = self.bot.embeds.success("대기열 추가", f"'{first_title}'을(를) 대기열에 추가했습니다.")
+            await send_method(embed=embed, **send_kwargs)
 
+        except ExtractionCancelled:
+            # 요청한 사용자가 음성 채널을 나갔으므로 대기열에 추가하지 않습니다.
+            return
         except Exception as e:
             print(f"Error extracting info: {e}")
             embed = self.bot.embeds.error("정보 추출 실패", "노래의 상세 정보를 가져오는데 실패했습니다.")
             return await send_method(embed=embed, **send_kwargs)
 
-        # 노래가 재생 중이 아닐 때만 재생 시작
-        if not ctx.voice_client.is_playing() and not ctx.voice_client.is_paused():
-            await self.play_next_song(ctx)
-
     @commands.hybrid_command(name="참가", help="음성 채널에 봇을 연결합니다.")
     async def join(self, ctx):
         if not ctx.author.voice:
@@ -232,7 +417,10 @@ class Music(commands.Cog):
     @commands.hybrid_command(name="빠빠이", help="음성 채널에서 봇을 내보냅니다.")
     @check.is_bot_connected() # 수정: is_bot_playing -> is_bot_connected
     async def leave(self, ctx):
-        self.queue = []
+        self.get_player(ctx.guild).clear()
+        self.extractor.cancel(ctx.guild.id)
+        # 음악과 함께 재생 중이던 TTS까지 멈추고 서버 믹서를 정리합니다.
+        self.bot.voice_mixer.remove(ctx.guild)
         await ctx.voice_client.disconnect()
         await ctx.send(embed=self.bot.embeds.info("연결 종료", "음성 채널에서 나갔습니다."))
 
@@ -258,24 +446,16 @@ class Music(commands.Cog):
         # --- 대기열 번호로 재생하는 기능 추가 ---
         if search.isdigit():
             index = int(search)
-            if not self.queue:
+            player = self.get_player(ctx.guild)
+            if not player.queue:
                 return await ctx.send(embed=self.bot.embeds.error("오류", "대기열이 비어있습니다."))
-            if not 1 <= index <= len(self.queue):
-                return await ctx.send(embed=self.bot.embeds.error("입력 오류", f"1에서 {len(self.queue)} 사이의 번호를 입력해주세요."))
+            if not 1 <= index <= len(player.queue):
+                return await ctx.send(embed=self.bot.embeds.error("입력 오류", f"1에서 {len(player.queue)} 사이의 번호를 입력해주세요."))
 
-            # 사용자가 선택한 노래를 대기열에서 꺼냄
-            song_to_play = self.queue.pop(index - 1)
-            # 대기열의 가장 맨 앞에 다시 삽입
-            self.queue.insert(0, song_to_play)
-
-            # 현재 재생 중인 노래를 멈춰서 다음 곡(방금 맨 앞에 넣은 곡)으로 넘어감
-            if ctx.voice_client.is_playing() or ctx.voice_client.is_paused():
-                ctx.voice_client.stop()
-            else:
-                # 만약 아무것도 재생 중이 아니었다면 바로 재생 시작
-                await self.play_next_song(ctx)
+            # 사용자가 선택한 노래를 대기열 맨 앞으로 옮기고, 현재 곡을 멈춰서 바로 넘어감
+            track = player.play_now(index - 1)
             
-            await ctx.send(embed=self.bot.embeds.success("재생 목록 변경", f"대기열의 {index}번째 노래 '{song_to_play['title']}'을(를) 바로 재생합니다."))
+            await ctx.send(embed=self.bot.embeds.success("재생 목록 변경", f"대기열의 {index}번째 노래 '{track.title}'을(를) 바로 재생합니다."))
             return # 번호 재생 로직은 여기서 종료
 
         '''
@@ -309,82 +489,36 @@ class Music(commands.Cog):
             send_method = ctx.send
 
         try:
-            loop = asyncio.get_running_loop()
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # 검색 대상을 ytsearch10 -> scsearch10 으로 변경
-                blocking_task = functools.partial(ydl.extract_info, f"scsearch10:{query}", download=False, process=False)
-                info = await loop.run_in_executor(None, blocking_task)
+            # 검색 대상을 ytsearch10 -> scsearch10 으로 변경
+            # 같은 검색어(대소문자/공백 무시)는 잠시 동안 캐시된 결과를 쓰고, 동시에 들어온 같은 검색은 한 번만 실행합니다.
+            async def search(key: str) -> dict:
+                return await self.extractor.extract(f"scsearch10:{key}", guild_id=ctx.guild.id, requester_id=ctx.author.id, process=False)
+            entries = await self.search_cache.search(query, search)
 
-            if not info or not info.get('entries'):
-                return await send_method(embed=self.bot.embeds.error("검색 실패", "검색 결과가 없습니다."), ephemeral=True if ctx.interaction else False)
+            if not entries:
+                return await send_method(embed=self.bot.embeds.error("검색 실패", "재생 가능한 트랙이 검색 결과에 없습니다."), ephemeral=True if ctx.interaction else False)
 
-            entries = list(info['entries'])
+            # 검색 결과의 제목/길이를 캐시해 두면, 목록에서 고른 곡을 대기열에 넣을 때 다시 추출하지 않습니다.
+            for entry in entries:
+                self.track_cache.seed(entry)
 
+        except ExtractionCancelled:
+            return
         except Exception as e:
             return await send_method(embed=self.bot.embeds.error("검색 오류", str(e)), ephemeral=True if ctx.interaction else False)
 
-        # --- SearchView와 SongSelect는 사운드클라우드에서도 재사용 가능합니다 ---
-        # 다만, SelectOption에 들어갈 데이터를 사운드클라우드에 맞게 수정합니다.
-        
-        # 1. SearchView 클래스의 _create_select_options 메서드 수정
-        #    재생 횟수(view_count) -> 재생 시간(duration_string)으로 변경하거나 둘 다 표시
-        #    (이 부분은 Music(commands.Cog) 클래스 안에 있는 SearchView 클래스를 직접 수정해야 합니다)
-        
-        # 2. 이 search 함수 내에서 options를 만드는 로직 수정
-        options = []
-        for i, entry in enumerate(entries):
-            title = entry.get('title', '이름 없는 항목')
-            uploader = entry.get('uploader', 'Unknown Artist')
-            duration = entry.get('duration', 0)
-            # 초 단위의 duration을 '분:초' 형태로 변환
-            duration_str = f"{int(duration // 60)}:{int(duration % 60):02d}" if duration else "N/A"
-
-            # [핵심] URL을 직접 사용. 유튜브처럼 ID로 조립하지 않습니다.
-            url = entry.get('webpage_url')
-            if not url:
-                continue
-            
-            label = f"{i+1}. {title}"
-            
-            # discord.SelectOption: 드롭다운의 각 항목
-            options.append(discord.SelectOption(
-                label=label[:100],
-                description=f"아티스트: {uploader} | 길이: {duration_str}"[:100],
-                value=url # Select의 값으로 사운드클라우드 URL을 직접 사용
-            ))
-
-        if not options:
-            return await send_method(embed=self.bot.embeds.error("검색 실패", "재생 가능한 트랙이 검색 결과에 없습니다."), ephemeral=True if ctx.interaction else False)
-
-        options = options[:25]
-
-        view = discord.ui.View(timeout=60.0)
-        # SongSelect 클래스는 수정 없이 재사용 가능
-        view.add_item(SongSelect(ctx=ctx, options=options))
-        
-        # (이하 View 관련 로직은 기존 코드와 거의 동일하게 사용)
-        async def interaction_check(interaction: discord.Interaction) -> bool:
-            if interaction.user.id != ctx.author.id:
-                await interaction.response.send_message("명령어를 실행한 사용자만 선택할 수 있습니다.", ephemeral=True)
-                return False
-            return True
-        view.interaction_check = interaction_check
-        
-        async def on_timeout():
-            if hasattr(view, 'message') and view.message:
-                timeout_embed = self.bot.embeds.error("시간 초과", "60초가 지나 선택이 취소되었습니다.")
-                await view.message.edit(embed=timeout_embed, view=None)
-        view.on_timeout = on_timeout
+        # 캐시된 검색 결과로 바로 드롭다운 메뉴를 만듭니다.
+        view = SearchView(ctx=ctx, search_results=entries)
 
         description = ""
-        for i, option in enumerate(options):
-            description += f"**{i+1}.** {option.label.split('. ', 1)[1]}\n"
+        for i, entry in enumerate(view.search_results):
+            description += f"**{i+1}.** {entry['title']}\n"
         
         initial_embed = self.bot.embeds.info("사운드클라우드 검색 결과", description)
         
-        first_playable_entry = next((e for e in entries if e.get('id')), None)
-        if first_playable_entry and first_playable_entry.get('thumbnail'):
-            initial_embed.set_image(url=first_playable_entry['thumbnail'])
+        first_thumbnail = next((entry['thumbnail'] for entry in view.search_results if entry.get('thumbnail')), None)
+        if first_thumbnail:
+            initial_embed.set_image(url=first_thumbnail)
         
         initial_embed.set_footer(text="아래 메뉴에서 재생할 트랙을 선택하세요.")
 
@@ -395,58 +529,68 @@ class Music(commands.Cog):
 
 
 
-    # play_next_song 함수 (수정된 버전)
-    async def play_next_song(self, ctx: commands.Context):
-        if self.queue:
-            song_info = self.queue[0]
-            source, title, channel, requester = song_info['source'], song_info['title'], song_info['channel'], song_info['requester']
-
-            try:
-                loop = asyncio.get_running_loop()
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    blocking_task = functools.partial(ydl.extract_info, source, download=False)
-                    info = await loop.run_in_executor(None, blocking_task)
+    # --- GuildPlayer가 다음 곡을 재생할 때 호출하는 소스 생성 함수 ---
+    async def _resolve_stream(self, track: Track) -> str:
+        """곡의 페이지 URL에서 실제 스트림 URL을 얻습니다. (StreamPrefetcher가 미리 호출하기도 합니다)"""
+        # 곡 정보 캐시에 아직 유효한 스트림 URL이 있으면 추출하지 않습니다.
+        extract = functools.partial(self.extractor.extract, guild_id=track.guild_id)
+        entry = await self.track_cache.resolve(track.source, extract, need_stream=True, margin=self.prefetch_refresh_margin)
+        stream_url = entry.get('stream_url')
+        # 플레이리스트에서 들어온 항목은 제목이 없을 수 있으므로, 추출한 정보로 채웁니다.
+        if entry.get('title'):
+            track.title = entry['title']
 
-                if 'entries' in info: info = info['entries'][0]
-                stream_url = info.get('url')
+        if not stream_url:
+            raise ValueError("스트림 URL을 찾을 수 없습니다.")
+        return stream_url
 
-                if not stream_url:
-                    raise ValueError("스트림 URL을 찾을 수 없습니다.")
-                
-                self.queue.pop(0)
-
-                if ctx.voice_client and ctx.voice_client.is_connected():
-                    # --- 핵심 수정 부분: 두 종류의 볼륨을 모두 계산 ---
-                    # 1. 이 서버에 설정된 기본 볼륨을 가져옴. 없으면 전역 기본값 사용
-                    base_volume = self.base_volumes.get(ctx.guild.id, self.DEFAULT_BASE_VOLUME)
-                    # 2. 이 서버에 설정된 사용자 배율을 가져옴. 없으면 기본값 1.0
-                    user_multiplier = self.user_volume_multipliers.get(ctx.guild.id, 1.0)
-                    # 3. 최종 시작 볼륨을 계산
-                    initial_volume = base_volume * user_multiplier
-
-                    base_source = discord.FFmpegPCMAudio(stream_url, **ffmpeg_opts)
-                    # 4. 계산된 최종 볼륨으로 PCMVolumeTransformer를 생성
-                    volume_controlled_source = discord.PCMVolumeTransformer(base_source, volume=initial_volume)
-                    
-                    ctx.voice_client.play(volume_controlled_source, after=lambda e: self.on_song_end(ctx, e))
-                    # ---------------------------------------------------------
-
-                    embed = self.bot.embeds.info("재생 시작", f"▶️ 이제 '{title}'을(를) 재생합니다.")
-                    embed.set_footer(text=f"요청: {requester.display_name}", icon_url=requester.avatar)
-                    await channel.send(embed=embed)
+    async def _create_source(self, player: GuildPlayer, track: Track, position: float = None) -> discord.AudioSource:
+        """
+        곡을 재생할 AudioSource를 만듭니다. position(초)이 있으면 재생 중 볼륨을 바꾸거나 TTS와 섞기 위한 재시작이므로
+        재생 방식과 관계없이 그 위치부터 PCM 소스로 만듭니다.
+        Opus 방식이라도 곡을 시작하는 순간 TTS가 재생 중이면 곧바로 PCM으로 다시 열어야 하므로 처음부터 PCM으로 만듭니다.
+        """
+        # 오디오 캐시에 저장된 곡은 원격 스트림 대신 로컬 Opus 파일을 재생합니다. (스트림 분석 옵션이 필요 없어 바로 시작됩니다)
+        cached_path = self.audio_cache.lookup(track.source) if self.audio_cache and not track.is_live else None
+        if cached_path:
+            source_url, before_options = cached_path, ''
+        else:
+            # 미리 받아 둔 URL이 아직 유효하면 추출 없이 바로 재생합니다.
+            source_url = await player.prefetcher.get_stream(track)
+            before_options = ffmpeg_opts['seek_before_options' if position else 'before_options']
+            if self.audio_cache and not track.is_live and position is None:
+                cached = self.track_cache.get(track.source)
+                self.audio_cache.record_play(track.source, source_url, duration=cached.get('duration') if cached else None)
+
+        mixing = player.mixer.has_other_playing("music")
+        if position is None and self.playback_mode == 'opus' and not mixing:
+            return await self._create_opus_source(source_url, before_options, player.volume, codec='copy' if cached_path else None)
+
+        # PCM 방식: 서버 기본 볼륨 x 사용자 배율로 계산된 최종 볼륨으로 시작하며, 재생 중에도 볼륨을 바로 바꿀 수 있습니다.
+        if position:
+            before_options = f"-ss {position:.2f} {before_options}".strip()
+            self.playback_counts["PCM 전환"] += 1
+        elif self.playback_mode == 'opus':
+            self.playback_counts["PCM (TTS와 섞는 중 시작)"] += 1
+        else:
+            self.playback_counts["PCM"] += 1
+        base_source = discord.FFmpegPCMAudio(source_url, before_options=before_options, options=ffmpeg_opts['options'])
+        return discord.PCMVolumeTransformer(base_source, volume=player.volume)
 
-            except Exception as e:
-                print(f"Error playing '{title}': {e}")
-                await channel.send(embed=self.bot.embeds.error("재생 오류", f"'{title}'을(를) 재생하는 중 오류가 발생했습니다."))
-                # 오류 발생 시 해당 곡을 큐에서 제거해야 다음 곡으로 넘어갈 수 있음
-                if self.queue and self.queue[0]['source'] == source:
-                    self.queue.pop(0)
-                self.on_song_end(ctx, e)
-    
-    def on_song_end(self, ctx: commands.Context, error):
-        if error: print(f'Player error: {error}')
-        if self.queue:
-            asyncio.run_coroutine_threadsafe(self.play_next_song(ctx), self.bot.loop)
+    async def _create_opus_source(self, source_url: str, before_options: str, volume: float, codec: str = None) -> discord.FFmpegOpusAudio:
+        """
+        ffmpeg가 Opus로 바로 인코딩해 넘겨주는 소스를 만듭니다. Python에서 PCM을 읽고 볼륨을 곱하고
+        다시 Opus로 인코딩하는 과정이 없어 재생 중인 서버 하나당 CPU 사용량이 크게 줄어듭니다.
+        """
+        if volume == 1.0:
+            # 볼륨을 바꿀 필요가 없으면 코덱을 확인해, 원본이 Opus일 때는 다시 인코딩하지 않고 그대로 보냅니다.
+            self.playback_counts["Opus (그대로 전송)"] += 1
+            if codec:
+                return discord.FFmpegOpusAudio(source_url, codec=codec, before_options=before_options, options='-vn')
+            return await discord.FFmpegOpusAudio.from_probe(source_url, before_options=before_options, options='-vn')
+        # 볼륨은 ffmpeg 필터로 적용합니다. (필터를 쓰면 그대로 전송할 수 없으므로 ffmpeg가 Opus로 인코딩)
+        self.playback_counts["Opus (ffmpeg 볼륨)"] += 1
+        return discord.FFmpegOpusAudio(source_url, before_options=before_options, options=f'-vn -filter:a volume={volume:.3f}')
 
     @commands.hybrid_group(name="볼륨", aliases=["volume"], description="봇의 볼륨 관련 설정을 관리합니다.")
     async def volume(self, ctx: commands.Context):
@@ -457,15 +601,9 @@ class Music(commands.Cog):
     @volume.command(name="설정", description="개인별 볼륨 배율을 조절합니다 (기본값 100).")
     async def volume_set(self, ctx: commands.Context, 배율: commands.Range[int, 0, 200]):
         """기본 볼륨에 대한 배율을 조절합니다. (0~200%)"""
-        guild_id = ctx.guild.id
         multiplier = 배율 / 100.0
-        self.user_volume_multipliers[guild_id] = multiplier
-        
         # 현재 재생 중인 노래가 있다면, 새 배율을 즉시 적용
-        if ctx.voice_client and ctx.voice_client.source:
-            base_volume = self.base_volumes.get(guild_id, self.DEFAULT_BASE_VOLUME)
-            final_volume = base_volume * multiplier
-            ctx.voice_client.source.volume = final_volume
+        self.get_player(ctx.guild).set_volume(multiplier=multiplier)
             
         await ctx.send(embed=self.bot.embeds.success("배율 설정 완료", f"🔊 개인 볼륨 배율을 **{배율}%**로 조절했습니다."), ephemeral=True)
 
@@ -473,25 +611,26 @@ class Music(commands.Cog):
     @commands.has_permissions(manage_guild=True) # '서버 관리' 권한이 있는 사람만 사용 가능
     async def volume_base(self, ctx: commands.Context, 기본볼륨: commands.Range[int, 0, 100]):
         """서버의 기본 시작 볼륨을 조절합니다. 모든 유저에게 적용됩니다."""
-        guild_id = ctx.guild.id
         base_volume = 기본볼륨 / 100.0
-        self.base_volumes[guild_id] = base_volume
-        
         # 현재 재생 중인 노래가 있다면, 새 기본 볼륨을 즉시 적용
-        if ctx.voice_client and ctx.voice_client.source:
-            user_multiplier = self.user_volume_multipliers.get(guild_id, 1.0)
-            final_volume = base_volume * user_multiplier
-            ctx.voice_client.source.volume = final_volume
+        self.get_player(ctx.guild).set_volume(base_volume=base_volume)
             
         await ctx.send(embed=self.bot.embeds.success("기본 볼륨 설정 완료", f"🔊 이 서버의 기본 볼륨을 **{기본볼륨}%**로 조절했습니다."))
 
     @volume.command(name="상태", description="현재 볼륨 설정을 확인합니다.")
     async def status(self, ctx: commands.Context):
         """현재 서버의 기본 볼륨과 개인 배율, 최종 볼륨을 보여줍니다."""
-        guild_id = ctx.guild.id
-        base_volume = self.base_volumes.get(guild_id, self.DEFAULT_BASE_VOLUME)
-        user_multiplier = self.user_volume_multipliers.get(guild_id, 1.0)
-        final_volume = base_volume * user_multiplier
+        # 조회만 하므로, 음악을 재생한 적 없는 서버에 재생 작업을 만들지 않고 기본값을 보여줍니다.
+        player = self.players.get(ctx.guild.id)
+        if player is None:
+            description = (
+                "아직 이 서버에서 음악을 재생하지 않았어요.\n"
+                f"**기본 볼륨:** `{int(GuildPlayer.DEFAULT_BASE_VOLUME * 100)}%` (기본값)"
+            )
+            return await ctx.send(embed=self.bot.embeds.info("현재 볼륨 설정", description))
+        base_volume = player.base_volume
+        user_multiplier = player.volume_multiplier
+        final_volume = player.volume
         
         description = (
             f"**기본 볼륨:** `{int(base_volume * 100)}%`\n"
@@ -505,72 +644,93 @@ class Music(commands.Cog):
     @commands.hybrid_command(name="일시정지", help="노래를 일시정지합니다.")
     @check.is_bot_playing() 
     async def pause(self, ctx):
-        if ctx.voice_client.is_paused():
+        if self.get_player(ctx.guild).is_paused():
             return await ctx.send(embed=self.bot.embeds.error("오류", "이미 일시정지된 상태입니다."))
-        ctx.voice_client.pause()
+        self.get_player(ctx.guild).pause()
         await ctx.send(embed=self.bot.embeds.info("일시정지", "⏸️ 노래를 일시정지했습니다."))
 
     @commands.hybrid_command(name="계속", help="노래를 다시 재생합니다.")
     @check.is_bot_connected() # 수정: is_bot_playing -> is_bot_connected
     async def resume(self, ctx):
-        # 명령어 내부에서 is_paused() 상태를 직접 확인
-        if not ctx.voice_client.is_paused():
+        # 명령어 내부에서 is_paused() 상태를 직접 확인 (TTS는 일시정지되지 않으므로 음악 채널의 상태를 봅니다)
+        if not self.get_player(ctx.guild).is_paused():
             return await ctx.send(embed=self.bot.embeds.error("오류", "일시정지된 노래가 없습니다."))
-        ctx.voice_client.resume()
+        self.get_player(ctx.guild).resume()
         await ctx.send(embed=self.bot.embeds.info("다시 재생", "▶️ 노래를 다시 재생합니다."))
             
     @commands.hybrid_command(name="중지", help="노래를 중지하고 대기열을 비웁니다.")
     @check.is_bot_connected() # 수정: is_bot_playing -> is_bot_connected
     async def stop(self, ctx):
-        self.queue = []
-        if ctx.voice_client.is_playing() or ctx.voice_client.is_paused():
-            ctx.voice_client.stop()
+        self.get_player(ctx.guild).clear()
+        self.extractor.cancel(ctx.guild.id)
         await ctx.send(embed=self.bot.embeds.info("재생 중지", "⏹️ 노래를 중지하고 대기열을 초기화했습니다."))
 
     # skip 명령어는 '재생 중'인 곡을 건너뛰는 것이므로, is_bot_playing()을 유지합니다.
     @commands.hybrid_command(name="스킵", help="현재 노래를 건너뜁니다.")
     @check.is_bot_playing() 
     async def skip(self, ctx):
-        ctx.voice_client.stop()
+        # 음성 연결 전체를 멈추면 읽고 있던 TTS도 끊기므로 음악 채널만 멈춥니다.
+        self.get_player(ctx.guild).skip()
         await ctx.send(embed=self.bot.embeds.info("건너뛰기", "⏭️ 현재 곡을 건너뛰었습니다."))
             
     
+    def _now_playing_text(self, player: GuildPlayer) -> str:
+        """현재 곡 제목과 재생 위치(경과 / 전체 길이)를 한 줄로 만듭니다."""
+        track = player.current
+        cached = self.track_cache.get(track.source)
+        duration = cached.get('duration') if cached else None
+        position = format_duration(player.elapsed)
+        if duration and not track.is_live:
+            position = f"{position} / {format_duration(duration)}"
+        state = "⏸️" if player.is_paused() else "▶️"
+        text = f"{state} **{track.title}** `{position}`"
+        requester = track.requester(player.guild)
+        if requester:
+            text += f" — {requester.mention}"
+        return text
+
+    async def render_queue_page(self, guild: discord.Guild, page: int):
+        """대기열의 한 페이지를 그립니다. 요청된 페이지의 곡만 꺼내 만들므로 대기열 길이와 관계없이 빠릅니다."""
+        player = self.players.get(guild.id)
+        if player is None:
+            # 페이지를 넘기는 사이 봇이 나가 재생 상태가 정리되었으면 빈 대기열로 보여줍니다.
+            return self.bot.embeds.info("재생 대기열", "현재 재생 중인 노래와 대기열에 노래가 없습니다."), 1
+        size = self.QUEUE_PAGE_SIZE
+        total = len(player.queue)
+        page_count = max(1, -(-total // size))
+        page = min(page, page_count - 1)
+        offset = page * size
+
+        embed = self.bot.embeds.info("재생 대기열")
+        if player.current is not None:
+            embed.add_field(name="현재 재생 중", value=self._now_playing_text(player)[:1024], inline=False)
+        if total:
+            # 사용자가 /재생 에서 사용할 번호(offset+i+1)를 명확하게 보여줌
+            lines = [f"**{offset + i + 1}.** {track.title}"[:200] for i, track in enumerate(player.queue[offset:offset + size])]
+            embed.description = "\n".join(lines)
+        else:
+            embed.description = "다음 대기열에 노래가 없습니다."
+        embed.add_field(name="페이지", value=f"{page + 1} / {page_count}", inline=True)
+        embed.add_field(name="대기 중인 곡", value=f"{total}곡", inline=True)
+        return embed, page_count
+
     @commands.hybrid_command(name="대기열", help="재생 대기열을 보여줍니다.")
-    async def queue_info(self, ctx: commands.Context):
-        """현재 재생 중인 노래와 재생 대기열을 번호와 함께 보여줍니다."""
-        is_slash_command = ctx.interaction is not None
-        if is_slash_command:
+    async def queue_info(self, ctx: commands.Context, 페이지: commands.Range[int, 1] = 1):
+        """현재 재생 중인 노래와 재생 대기열을 번호와 함께 페이지별로 보여줍니다."""
+        if ctx.interaction:
             await ctx.defer(ephemeral=True)
 
-        if not ctx.voice_client or not (ctx.voice_client.is_playing() or ctx.voice_client.is_paused()) and not self.queue:
-             return await ctx.send(embed=self.bot.embeds.info("대기열", "현재 재생 중인 노래와 대기열에 노래가 없습니다."))
+        player = self.players.get(ctx.guild.id)
+        if player is None or (player.current is None and not player.queue):
+            return await ctx.send(embed=self.bot.embeds.info("대기열", "현재 재생 중인 노래와 대기열에 노래가 없습니다."), ephemeral=True)
 
-        embed = self.bot.embeds.info("재생 대기열")
-        
-        # 현재 재생 중인 노래 표시
-        if ctx.voice_client.source:
-            # 현재 재생 중인 노래의 제목을 찾기 (조금 복잡한 로직)
-            # 이 예제에서는 간단하게 표시, 실제로는 현재 곡 정보를 저장하는 변수가 필요할 수 있음
-            embed.add_field(name="현재 재생 중", value="▶️ ... (현재 곡 정보)", inline=False)
-        
-        # 다음 대기열 목록 표시
-        if not self.queue:
-            embed.description = "다음 대기열에 노래가 없습니다."
-        else:
-            song_list = ""
-            for i, song in enumerate(self.queue):
-                # 사용자가 !play 에서 사용할 번호(i+1)를 명확하게 보여줌
-                song_list += f"**{i+1}.** {song['title']}\n"
-            embed.add_field(name="다음 곡 목록", value=song_list, inline=False)
-        
-        # 슬래시 명령어와 접두사 명령어의 응답 방식을 분리
-        if is_slash_command:
-            # 슬래시 명령어는 followup.send를 사용해야 합니다.
-            # ephemeral=True 옵션도 유지합니다.
-            await ctx.interaction.followup.send(embed=embed, ephemeral=True)
-        else:
-            # 접두사 명령어는 ctx.send를 사용합니다.
-            await ctx.send(embed=embed)
+        view = PageView(
+            author_id=ctx.author.id,
+            render_page=functools.partial(self.render_queue_page, ctx.guild),
+            page=페이지 - 1,
+        )
+        embed = await view.render()
+        view.message = await ctx.send(embed=embed, view=view, ephemeral=True)
 
 
 async def setup(bot):
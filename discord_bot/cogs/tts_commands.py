@@ -1,19 +1,104 @@
 import discord
 from discord.ext import commands
-from gtts import gTTS
-from io import BytesIO
 import asyncio
 import functools
+import os
 
 # core 폴더의 유틸리티들을 임포트
 from core import embed
+from core.speaker import GuildSpeaker, Utterance
+from core.tts_cache import TTSCache
+from core.config import ConfigFile
+from core.tts_engine import ENGINES, DEFAULT_ENGINE
+
+# 경로 설정
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+TTS_CACHE_DIR = os.path.join(DATA_DIR, 'tts_cache')
+TTS_ENGINE_FILE = os.path.join(DATA_DIR, 'tts_engine.json')
 
 class TTSCommands(commands.Cog):
     """사용자별 TTS 기능을 관리하는 Cog입니다."""
+    # 서버마다 읽기를 기다릴 수 있는 최대 메시지 수 (넘치면 가장 오래된 메시지부터 버림)
+    MAX_BACKLOG = 10
+    # 긴 메시지를 나누어 합성할 문장 조각의 최대 길이(자)
+    CHUNK_CHARS = 200
+    # TTS 재생 볼륨
+    VOLUME = 0.5
+    # 합성된 음성 캐시: 메모리/디스크 최대 크기(MB)와 캐시할 메시지의 최대 길이(자)
+    CACHE_MB = 16
+    CACHE_DISK_MB = 128
+    CACHE_MAX_TEXT = 50
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         # TTS가 활성화된 사용자의 ID를 저장하는 집합(set)
         self.tts_enabled_users = set()
+        # 서버(Guild) ID -> GuildSpeaker. 서버마다 읽을 메시지를 쌓아 두고 차례대로 읽어 줍니다.
+        self.speakers = {}
+        settings = self.bot.config.get("tts", {})
+        self.max_backlog = settings.get("max_backlog", self.MAX_BACKLOG)
+        self.chunk_chars = settings.get("chunk_chars", self.CHUNK_CHARS)
+        # "ㅋㅋㅋ", "ㅇㅇ", 인사처럼 자주 나오는 짧은 문구는 한 번 합성한 음성을 다시 사용합니다.
+        self.tts_cache = TTSCache(
+            max_bytes=settings.get("cache_mb", self.CACHE_MB) * 1024 * 1024,
+            disk_dir=TTS_CACHE_DIR if settings.get("cache_disk", True) else None,
+            disk_max_bytes=settings.get("cache_disk_mb", self.CACHE_DISK_MB) * 1024 * 1024,
+            max_text=settings.get("cache_max_text", self.CACHE_MAX_TEXT),
+        )
+        # 사용할 수 있는 TTS 엔진과, 서버별로 선택한 엔진 ({"서버 ID": "엔진 이름"})
+        self.engines = {name: engine() for name, engine in ENGINES.items()}
+        self.default_engine = settings.get("engine", DEFAULT_ENGINE)
+        self.guild_engines = ConfigFile(TTS_ENGINE_FILE)
+
+    def engine_for(self, guild_id: int):
+        """서버에서 사용할 TTS 엔진을 반환합니다. 선택한 엔진을 쓸 수 없으면 기본 엔진을 사용합니다."""
+        for name in (self.guild_engines.get(str(guild_id)), self.default_engine, DEFAULT_ENGINE):
+            engine = self.engines.get(name)
+            if engine is not None and engine.available():
+                return engine
+        return self.engines[DEFAULT_ENGINE]
+
+    def get_speaker(self, guild: discord.Guild) -> GuildSpeaker:
+        speaker = self.speakers.get(guild.id)
+        if speaker is None:
+            speaker = GuildSpeaker(self.bot, guild, self._synthesize, max_backlog=self.max_backlog, chunk_chars=self.chunk_chars)
+            self.speakers[guild.id] = speaker
+        return speaker
+
+    async def cog_load(self):
+        self.bot.idle_voice.add_cleanup("tts", self._cleanup_guild)
+        await asyncio.get_running_loop().run_in_executor(None, self.tts_cache.load)
+
+    async def cog_unload(self):
+        self.bot.idle_voice.remove_cleanup("tts")
+        for speaker in self.speakers.values():
+            speaker.destroy()
+        self.speakers.clear()
+
+    def _cleanup_guild(self, guild: discord.Guild):
+        """자동 퇴장할 때 이 서버에서 읽기를 기다리던 메시지를 버립니다."""
+        speaker = self.speakers.pop(guild.id, None)
+        if speaker:
+            speaker.destroy()
+
+    def get_stats(self) -> dict:
+        """`stats` 명령어에 표시할 통계를 반환합니다."""
+        speakers = list(self.speakers.values())
+        totals = {}
+        for speaker in speakers:
+            for key, value in speaker.stats().items():
+                totals[key] = totals.get(key, 0) + value
+        spoken = sum(speaker.spoken for speaker in speakers)
+        return {
+            "TTS": {
+                "TTS를 켠 사용자": len(self.tts_enabled_users),
+                "대기열이 있는 서버": len(speakers),
+                **totals,
+                "평균 지연(ms)": round(sum(speaker.total_latency for speaker in speakers) / spoken * 1000, 1) if spoken else 0.0,
+                "최대 지연(ms)": round(max((speaker.max_latency for speaker in speakers), default=0.0) * 1000, 1),
+            },
+            "TTS 음성 캐시": self.tts_cache.stats(),
+        }
 
     # --- TTS 기능을 켜고 끄는 명령어 그룹 ---
     @commands.hybrid_group(name="tts", description="TTS 기능을 켜거나 끕니다.")
@@ -54,12 +139,35 @@ class TTSCommands(commands.Cog):
         await ctx.send(embed=self.bot.embeds.success("TTS 비활성화", f"{author.mention}님의 TTS 기능이 꺼졌습니다."), ephemeral=True)
 
 
+    @tts.command(name="엔진", description="이 서버에서 사용할 TTS 엔진을 확인하거나 바꿉니다.")
+    @commands.has_permissions(manage_guild=True) # '서버 관리' 권한이 있는 사람만 사용 가능
+    async def tts_engine(self, ctx: commands.Context, 엔진: str = None):
+        """엔진 이름 없이 실행하면 현재 엔진과 사용할 수 있는 엔진 목록을 보여줍니다."""
+        available = [engine for engine in self.engines.values() if engine.available()]
+        if 엔진 is None:
+            current = self.engine_for(ctx.guild.id)
+            lines = "\n".join(f"`{engine.name}` — {engine.label}" for engine in available)
+            return await ctx.send(embed=self.bot.embeds.info("TTS 엔진", f"현재 엔진: **{current.label}**\n\n사용할 수 있는 엔진:\n{lines}"), ephemeral=True)
+
+        engine = self.engines.get(엔진.lower())
+        if engine is None or not engine.available():
+            names = ", ".join(f"`{engine.name}`" for engine in available)
+            return await ctx.send(embed=self.bot.embeds.error("오류", f"사용할 수 없는 엔진입니다. 사용할 수 있는 엔진: {names}"), ephemeral=True)
+
+        data = dict(self.guild_engines.data)
+        data[str(ctx.guild.id)] = engine.name
+        self.guild_engines.save(data)
+        await ctx.send(embed=self.bot.embeds.success("TTS 엔진 변경", f"이제 이 서버에서는 **{engine.label}** 엔진으로 읽어줍니다."), ephemeral=True)
+
     # --- 메시지를 감지하여 TTS를 실행하는 리스너 ---
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         # 봇 자신의 메시지, DM, 명령어는 무시
         if message.author.bot or not message.guild or message.content.startswith(('!', '/', '?', '.')): # 사용중인 접두사들
             return
+        # 서버별로 설정된 접두사로 시작하는 명령어도 무시
+        if message.content.startswith(self.bot.prefixes.get(message.guild.id)):
+            return
 
         # TTS가 활성화된 사용자의 메시지인지 확인
         if message.author.id not in self.tts_enabled_users:
@@ -78,37 +186,39 @@ class TTSCommands(commands.Cog):
             else:
                 return
 
-        # --- 음악 재생과의 충돌 방지 ---
-        # 현재 음악을 재생 중이거나, 일시정지 중이면 TTS를 실행하지 않음
-        if voice_client.is_playing() or voice_client.is_paused():
-            return
-
-        # gTTS를 사용하여 텍스트를 음성으로 변환 (메모리 상에서 처리)
+        # 메시지를 서버의 TTS 대기열에 넣습니다. 앞의 메시지를 읽는 중이면 끝난 뒤 이어서 읽습니다.
+        # 긴 메시지는 GuildSpeaker가 문장 단위로 나누어, 첫 문장부터 읽으면서 나머지를 합성합니다.
+        # 음악이 재생 중이면 서버 믹서가 음악 볼륨을 줄이고 함께 재생합니다.
+        engine = self.engine_for(message.guild.id)
+        self.get_speaker(message.guild).say(Utterance(message.content, 'ko', message.author.id, engine.name))
+
+    # --- GuildSpeaker가 사용하는 합성 함수 ---
+    async def _synthesize(self, utterance: Utterance) -> bytes:
+        """발화(문장 조각)를 합성해 재생할 PCM으로 반환합니다. 캐시에 있는 문구는 다시 합성하지 않습니다."""
+        engine = self.engines.get(utterance.engine) or self.engine_for(None)
+        synthesize = functools.partial(engine.synthesize, utterance.text, utterance.lang)
+        audio = await self.tts_cache.get(utterance.text, utterance.lang, synthesize, engine=engine.name)
+        return await self._decode(audio)
+
+    async def _decode(self, audio: bytes) -> bytes:
+        """
+        음성 데이터(MP3/WAV)를 FFmpeg로 PCM(48kHz, 16비트 스테레오)으로 디코딩하고 TTS 기본 볼륨(50%)을 적용합니다.
+        음악과 같은 재생 스레드(믹서)에서 FFmpeg를 실행하면 음악이 끊기므로, 재생 전에 이벤트 루프에서 미리 디코딩합니다.
+        """
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-filter:a", f"volume={self.VOLUME}",
+            "-f", "s16le", "-ar", "48000", "-ac", "2", "pipe:1",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
         try:
-            # gTTS가 너무 긴 텍스트는 처리하지 못할 수 있으므로 200자로 제한
-            text_to_read = message.content[:200]
-            
-            # gTTS 실행은 동기 함수이므로, run_in_executor로 비동기 처리
-            tts = gTTS(text=text_to_read, lang='ko')
-            fp = BytesIO()
-            
-            loop = asyncio.get_running_loop()
-            blocking_task = functools.partial(tts.write_to_fp, fp)
-            await loop.run_in_executor(None, blocking_task)
-            
-            fp.seek(0)
-            
-            # 변환된 음성 데이터를 FFmpeg으로 재생
-            source = discord.FFmpegPCMAudio(fp, pipe=True)
-            voice_client.play(source)
-
-            # --- TTS 기본 볼륨을 50%로 설정합니다. ---
-            if voice_client.source:
-                voice_client.source.volume = 0.5
-            # --------------------------------------
-
-        except Exception as e:
-            print(f"TTS 생성 또는 재생 중 오류 발생: {e}")
+            pcm, stderr = await process.communicate(audio)
+        except asyncio.CancelledError:
+            # 발화가 취소되면(대기열 정리, 자동 퇴장 등) 디코딩 중인 FFmpeg도 끝냅니다.
+            process.kill()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg 디코딩 실패: {stderr.decode(errors='replace').strip()}")
+        return pcm
 
 
 async def setup(bot: commands.Bot):
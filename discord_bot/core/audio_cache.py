@@ -0,0 +1,143 @@
+# baldheadbot/core/audio_cache.py
+
+import asyncio
+import hashlib
+import os
+
+from core.cache import LRUCache
+from core.track_cache import canonical_url
+
+
+class AudioCache:
+    """
+    자주 재생되는 곡을 Opus 파일로 변환해 두는 디스크 캐시입니다.
+
+    - 곡(정규화된 페이지 URL)이 `min_plays`번 재생되면, 다음 재생부터 쓸 수 있도록 백그라운드에서 Opus(Ogg)로 변환합니다.
+      저장된 파일은 48kHz 스테레오 Opus이므로 FFmpegOpusAudio가 다시 인코딩하지 않고 그대로 보낼 수 있습니다.
+    - 디렉터리 전체 크기를 `max_bytes`로 제한하며, 가장 오래 재생되지 않은 파일부터 지웁니다.
+      (재생할 때마다 파일 수정 시각을 갱신하므로 재시작 후에도 순서가 유지됩니다)
+    - 변환은 한 번에 하나씩만 실행하고, `max_duration`초보다 긴 곡이나 라이브 방송은 저장하지 않습니다.
+    """
+    # 원격 스트림을 읽다가 끊겼을 때 다시 연결하는 옵션 (재생용 ffmpeg_opts와 같음)
+    RECONNECT_OPTIONS = ('-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5')
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, min_plays: int = 3, max_duration: float = 900.0,
+                 bitrate: int = 128, executable: str = 'ffmpeg'):
+        self.directory = directory
+        self.min_plays = min_plays
+        self.max_duration = max_duration
+        self.bitrate = bitrate
+        self.executable = executable
+        os.makedirs(directory, exist_ok=True)
+        # 파일 경로(정규화된 URL의 해시) -> 파일 경로
+        self.files = LRUCache(max_bytes=max_bytes, on_evict=self._remove)
+        # 정규화된 URL -> 재생 횟수 (아직 저장되지 않은 곡만)
+        self.play_counts = LRUCache(max_items=10000)
+        # 파일 경로 -> 변환 Task
+        self._transcoding = {}
+        self._slots = asyncio.Semaphore(1)
+        # --- 통계 ---
+        self.transcodes = 0
+        self.transcode_failures = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".opus")
+
+    def _remove(self, key: str, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def load(self):
+        """디렉터리에 남아 있는 파일을 마지막 재생 순서대로 다시 등록합니다. (블로킹 함수이므로 실행기에서 호출)"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                # 변환 도중 종료되어 남은 파일
+                self._remove(None, entry.path)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(files):
+            self.files.put(path, path, size=size)
+
+    # --- 조회 ---
+    def lookup(self, url: str):
+        """저장된 Opus 파일 경로를 반환합니다. 없으면 None입니다."""
+        path = self._path(canonical_url(url))
+        cached = self.files.get(path)
+        if cached is None:
+            return None
+        try:
+            # 마지막 재생 시각을 기록해 두어 재시작 후에도 LRU 순서가 유지되게 합니다.
+            os.utime(cached)
+        except OSError:
+            # 누군가 파일을 지웠다면 캐시에서도 뺍니다.
+            self.files.pop(path)
+            return None
+        return cached
+
+    # --- 저장 ---
+    def record_play(self, url: str, stream_url: str, duration: float = None):
+        """원격 스트림으로 곡을 재생할 때 호출합니다. min_plays번째 재생이면 변환을 시작합니다."""
+        key = canonical_url(url)
+        path = self._path(key)
+        if path in self.files or path in self._transcoding:
+            return
+        if duration is not None and duration > self.max_duration:
+            return
+        count = self.play_counts.get(key, 0) + 1
+        if count < self.min_plays:
+            self.play_counts.put(key, count, size=1)
+            return
+        self.play_counts.pop(key)
+        task = asyncio.create_task(self._transcode(path, stream_url))
+        task.add_done_callback(lambda t, path=path: self._transcoding.pop(path, None))
+        self._transcoding[path] = task
+
+    async def _transcode(self, path: str, stream_url: str):
+        async with self._slots:
+            tmp = path + ".tmp"
+            process = await asyncio.create_subprocess_exec(
+                self.executable, '-nostdin', '-loglevel', 'error', *self.RECONNECT_OPTIONS,
+                '-i', stream_url, '-vn', '-map_metadata', '-1',
+                '-c:a', 'libopus', '-b:a', f'{self.bitrate}k', '-ar', '48000', '-ac', '2',
+                '-f', 'opus', '-y', tmp,
+                stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                self._remove(None, tmp)
+                raise
+            if process.returncode != 0:
+                self.transcode_failures += 1
+                self._remove(None, tmp)
+                print(f"오디오 캐시 변환 실패: {stderr.decode(errors='replace').strip()[-200:]}")
+                return
+            os.replace(tmp, path)
+            self.files.put(path, path, size=os.path.getsize(path))
+            if path not in self.files:
+                # 캐시 전체 크기보다 큰 파일은 보관하지 않습니다.
+                self._remove(path, path)
+                return
+            self.transcodes += 1
+
+    def cancel_all(self):
+        for task in self._transcoding.values():
+            task.cancel()
+        self._transcoding.clear()
+
+    def stats(self) -> dict:
+        stats = self.files.stats()
+        del stats["항목 수"]
+        stats["저장된 곡"] = len(self.files)
+        stats["변환 중"] = len(self._transcoding)
+        stats["변환 완료"] = self.transcodes
+        stats["변환 실패"] = self.transcode_failures
+        return stats
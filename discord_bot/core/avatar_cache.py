@@ -0,0 +1,138 @@
+# baldheadbot/core/avatar_cache.py
+
+import asyncio
+import hashlib
+import os
+import time
+
+import aiohttp
+
+from core.cache import LRUCache, SingleFlight
+
+
+class CachedAvatar:
+    """아바타 원본 바이트와, 카드에 바로 붙일 수 있게 준비된 210x210 RGBA 픽셀 바이트입니다."""
+    __slots__ = ("raw", "prepared")
+
+    def __init__(self, raw: bytes, prepared: bytes = None):
+        self.raw = raw
+        self.prepared = prepared
+
+    @property
+    def size(self) -> int:
+        return len(self.raw) + len(self.prepared or b"")
+
+
+class AvatarCache:
+    """
+    아바타 URL을 키로 하는 캐시입니다.
+    Discord 아바타 URL에는 이미지 해시가 들어 있어 사용자가 아바타를 바꾸면 URL도 바뀌므로,
+    URL이 같으면 같은 이미지라고 보고 네트워크 요청 없이 메모리(또는 디스크)의 바이트를 사용합니다.
+
+    - 메모리: 전체 바이트 수로 제한하는 LRU + TTL
+    - 디스크(선택): 메모리에서 밀려난 원본 바이트를 `spill_dir`에 보관하고, TTL이 지나면 버립니다.
+    """
+    def __init__(self, session: aiohttp.ClientSession, max_bytes: int = 32 * 1024 * 1024, ttl: float = 3600.0, spill_dir: str = None):
+        self.session = session
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.memory = LRUCache(max_bytes=max_bytes, ttl=ttl, sizeof=lambda avatar: avatar.size, on_evict=self._spill)
+        # 같은 URL을 동시에 요청하면 다운로드를 한 번만 합니다.
+        self._inflight = SingleFlight()
+        # --- 통계 ---
+        self.disk_hits = 0
+        self.downloads = 0
+        self.download_failures = 0
+
+    # --- 디스크 계층 ---
+    def _spill_path(self, url: str) -> str:
+        return os.path.join(self.spill_dir, hashlib.sha1(url.encode()).hexdigest())
+
+    def _spill(self, url: str, avatar: CachedAvatar):
+        """메모리에서 밀려난 원본 바이트를 디스크에 기록합니다. (준비된 픽셀은 원본에서 다시 만들 수 있으므로 기록하지 않음)"""
+        if not self.spill_dir:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_spill(url, avatar.raw)
+            return
+        loop.run_in_executor(None, self._write_spill, url, avatar.raw)
+
+    def _write_spill(self, url: str, raw: bytes):
+        path = self._spill_path(url)
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(raw)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"아바타 캐시 디스크 기록 실패: {e}")
+
+    def _read_spill(self, url: str):
+        path = self._spill_path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def prune_disk(self) -> int:
+        """TTL이 지난 디스크 파일을 지우고 지운 개수를 반환합니다. (블로킹 함수이므로 실행기에서 호출)"""
+        if not self.spill_dir:
+            return 0
+        removed = 0
+        now = time.time()
+        for entry in os.scandir(self.spill_dir):
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime > self.ttl:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    # --- 조회 ---
+    async def get(self, url: str):
+        """URL의 CachedAvatar를 반환합니다. 메모리와 디스크에 모두 없을 때만 다운로드하며, 실패하면 None입니다."""
+        avatar = self.memory.get(url)
+        if avatar is not None:
+            return avatar
+
+        return await self._inflight.run(url, self._load, url)
+
+    async def _load(self, url: str):
+        raw = None
+        if self.spill_dir:
+            raw = await asyncio.get_running_loop().run_in_executor(None, self._read_spill, url)
+            if raw is not None:
+                self.disk_hits += 1
+        if raw is None:
+            self.downloads += 1
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    self.download_failures += 1
+                    return None
+                raw = await response.read()
+        avatar = CachedAvatar(raw)
+        self.memory.put(url, avatar)
+        return avatar
+
+    def set_prepared(self, url: str, prepared: bytes):
+        """렌더링 중에 만든 RGBA 픽셀을 저장해 두어, 다음 카드부터는 디코딩/리사이즈를 건너뜁니다."""
+        avatar = self.memory.pop(url)
+        if avatar is None:
+            return
+        avatar.prepared = prepared
+        self.memory.put(url, avatar)
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats["디스크 적중"] = self.disk_hits
+        stats["다운로드"] = self.downloads
+        stats["다운로드 실패"] = self.download_failures
+        return stats
@@ -0,0 +1,158 @@
+# baldheadbot/core/cache.py
+
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    항목 수 또는 전체 바이트 수로 크기를 제한하는 LRU 캐시입니다.
+
+    - `max_items`/`max_bytes`를 넘으면 가장 오래 사용하지 않은 항목부터 내보냅니다.
+    - `ttl`(초)이 지난 항목은 조회할 때 만료로 처리합니다.
+    - 항목 크기는 `sizeof(value)`로 계산하며, put()에 직접 넘길 수도 있습니다.
+    - 내보낸 항목은 `on_evict(key, value)`로 알려주므로 디스크 등 하위 계층에 옮겨 둘 수 있습니다.
+    """
+    def __init__(self, max_items: int = None, max_bytes: int = None, ttl: float = None, sizeof=len, on_evict=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        # key -> (value, size, expires_at)
+        self._entries = OrderedDict()
+        self.bytes = 0
+        # --- 통계 ---
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry) -> bool:
+        return entry[2] is not None and entry[2] <= time.monotonic()
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._expired(entry):
+            self._discard(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size: int = None, ttl: float = None):
+        """항목을 넣습니다. 크기 제한보다 큰 항목은 보관하지 않습니다."""
+        size = self.sizeof(value) if size is None else size
+        self._discard(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+        self._shrink()
+
+    def pop(self, key, default=None):
+        entry = self._discard(key)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def items(self):
+        """만료되지 않은 (키, 값, 남은 유효 시간 또는 None)을 오래된 순서대로 반환합니다. 통계와 순서는 바꾸지 않습니다."""
+        now = time.monotonic()
+        return [
+            (key, value, None if expires_at is None else expires_at - now)
+            for key, (value, _, expires_at) in self._entries.items()
+            if expires_at is None or expires_at > now
+        ]
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+        return entry
+
+    def _shrink(self):
+        while self._entries and (
+            (self.max_items is not None and len(self._entries) > self.max_items)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            key, (value, size, _) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "항목 수": len(self._entries),
+            "사용 중(KB)": round(self.bytes / 1024, 1),
+            "적중": self.hits,
+            "실패": self.misses,
+            "적중률(%)": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "내보냄": self.evictions,
+            "만료": self.expirations,
+        }
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 비동기 작업이 동시에 여러 번 요청되면, 한 번만 실행하고 결과를 함께 나눠 받게 합니다.
+    (캐시가 비어 있을 때 같은 항목을 동시에 여러 번 가져오는 것을 막습니다.)
+
+    먼저 실행한 요청(리더)이 자기 사정으로 끝난 경우(`retry_on` 예외, 리더 Task 취소)에는 그 결과를 나눠 받지 않고,
+    기다리던 요청이 자기 인자로 다시 실행합니다. (예: 한 서버의 추출 취소가 다른 서버의 요청까지 취소하지 않도록)
+    """
+    def __init__(self):
+        self._inflight = {}
+        self.coalesced = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._inflight
+
+    async def run(self, key, func, *args, retry_on=()):
+        """key에 대해 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 `await func(*args)`를 실행합니다."""
+        while (pending := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 이 요청이 취소된 것이 아니라 리더의 작업이 취소된 것이면 다시 시도합니다.
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            except retry_on:
+                pass
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func(*args)
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없을 때 "예외가 회수되지 않음" 경고가 뜨지 않도록 표시해 둡니다.
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        return result
@@ -0,0 +1,77 @@
+# baldheadbot/core/config.py
+
+import json
+import os
+import time
+
+
+class ConfigFile:
+    """
+    JSON 설정 파일을 메모리에 캐시하는 클래스입니다.
+    파일의 mtime/inode/크기가 바뀌었을 때만 다시 읽어오며,
+    stat 확인 자체도 `check_interval`초에 한 번으로 제한하여 매 호출마다 디스크에 접근하지 않습니다.
+    """
+    def __init__(self, path: str, default: dict = None, check_interval: float = 2.0):
+        self.path = path
+        self.default = default if default is not None else {}
+        self.check_interval = check_interval
+
+        self._data = dict(self.default)
+        self._signature = None
+        self._next_check = 0.0
+        # 설정이 다시 로드될 때마다 1씩 증가 (캐시 무효화 용도)
+        self.version = 0
+
+    def _stat_signature(self):
+        """파일 변경 여부를 판단하기 위한 (inode, mtime, 크기) 튜플을 반환합니다."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self, signature):
+        """파일을 실제로 읽어 파싱합니다. 실패하면 기본값을 사용합니다."""
+        if signature is None:
+            self._data = dict(self.default)
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                self._data = loaded if isinstance(loaded, dict) else dict(self.default)
+            except (json.JSONDecodeError, OSError):
+                print(f"Warning: '{self.path}' 파일을 읽는 중 오류가 발생했습니다. 기본 설정을 사용합니다.")
+                self._data = dict(self.default)
+        self._signature = signature
+        self.version += 1
+
+    def reload(self):
+        """파일 변경 여부와 관계없이 즉시 다시 읽어옵니다. (리로드 명령어용)"""
+        self._load(self._stat_signature())
+        self._next_check = time.monotonic() + self.check_interval
+        return self._data
+
+    @property
+    def data(self) -> dict:
+        """캐시된 설정을 반환합니다. 확인 주기가 지났고 파일이 바뀌었다면 다시 로드합니다."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            signature = self._stat_signature()
+            if signature != self._signature:
+                self._load(signature)
+        return self._data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def save(self, data: dict):
+        """설정을 임시 파일에 쓴 뒤 교체하여 원자적으로 저장하고, 캐시도 갱신합니다."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._data = data
+        self._signature = self._stat_signature()
+        self._next_check = time.monotonic() + self.check_interval
+        self.version += 1
@@ -0,0 +1,262 @@
+# baldheadbot/core/extractor.py
+
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yt_dlp
+
+
+class ExtractionCancelled(Exception):
+    """요청한 사용자가 음성 채널을 나가는 등의 이유로 추출 요청이 취소되었을 때 발생하는 예외입니다."""
+    pass
+
+
+# 플레이리스트 스트리밍에서 작업자 스레드가 보내는 종료/취소 신호
+_DONE = object()
+_CANCELLED = object()
+
+
+class _EntryStream:
+    """작업자 스레드가 플레이리스트 항목을 조금씩 넘겨주는 통로입니다."""
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.stop = threading.Event()
+        # 작업자 스레드가 추출을 시작한 시각 (perf_counter)
+        self.started = None
+
+    def cancel(self):
+        self.stop.set()
+        self.queue.put_nowait(_CANCELLED)
+
+    def done(self) -> bool:
+        return self.stop.is_set()
+
+
+class ExtractorService:
+    """
+    yt-dlp 추출 전용 스레드 풀입니다.
+
+    - 기본 실행기(run_in_executor(None, ...))와 분리되어, 플레이리스트 추출이 몰려도 TTS 등 다른 작업이 밀리지 않습니다.
+    - 작업자 스레드마다 YoutubeDL 인스턴스를 하나씩 만들어 재사용합니다.
+    - 서버마다 동시에 실행할 수 있는 추출 수를 제한하여 한 서버가 풀을 독차지하지 못하게 합니다.
+    - 서버/요청자 단위로 대기 중이거나 진행 중인 요청을 취소할 수 있습니다.
+      (이미 스레드에서 실행 중인 추출은 끝까지 돌지만, 결과는 버려집니다.)
+    """
+    def __init__(self, ydl_opts: dict, max_workers: int = 4, per_guild_limit: int = 2):
+        self.ydl_opts = ydl_opts
+        self.max_workers = max_workers
+        self.per_guild_limit = per_guild_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-dlp")
+        self._local = threading.local()
+        # 서버 ID -> Semaphore
+        self._guild_slots = {}
+        # (서버 ID, 요청자 ID) -> 진행 중인 Task / _EntryStream 집합
+        self._requests = {}
+        self._cancelled = set()
+        # --- 통계 ---
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.total_exec = 0.0
+        self.max_wait = 0.0
+
+    # --- 작업자 스레드 ---
+    def _ydl(self) -> yt_dlp.YoutubeDL:
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            ydl = self._local.ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+        return ydl
+
+    def _run(self, query: str, process: bool):
+        """작업자 스레드에서 실행됩니다. (결과, 시작 시각, 실행 시간)을 반환합니다."""
+        started = time.perf_counter()
+        info = self._ydl().extract_info(query, download=False, process=process)
+        # process=False면 검색/플레이리스트 항목이 지연 제너레이터로 오므로, 여기서 다 받아 두어야
+        # 항목을 가져오는 HTTP 요청이 이벤트 루프가 아니라 작업자 스레드에서 실행됩니다.
+        entries = info.get('entries') if info else None
+        if entries is not None and not isinstance(entries, list):
+            info['entries'] = list(entries)
+        return info, started, time.perf_counter() - started
+
+    def _run_entries(self, query: str, stream: _EntryStream, loop, chunk_size: int):
+        """
+        작업자 스레드에서 실행됩니다. 항목을 처리하지 않고(process=False) 추출한 뒤,
+        플레이리스트면 항목을 chunk_size개씩 이벤트 루프로 넘기고, 단일 곡이면 포맷까지 선택한 정보를 넘깁니다.
+        """
+        def push(item):
+            loop.call_soon_threadsafe(stream.queue.put_nowait, item)
+
+        started = stream.started = time.perf_counter()
+        try:
+            ydl = self._ydl()
+            info = ydl.extract_info(query, download=False, process=False)
+            # 검색어나 단축 URL은 실제 대상을 가리키는 'url' 결과로 오므로 한 단계씩 따라갑니다.
+            for _ in range(3):
+                if info.get('_type') not in ('url', 'url_transparent'):
+                    break
+                info = ydl.extract_info(info['url'], download=False, process=False)
+            entries = info.pop('entries', None)
+            if entries is None:
+                # 단일 곡은 여기서 스트림 URL까지 골라 두어 재생할 때 다시 추출하지 않게 합니다.
+                if info.get('_type', 'video') == 'video':
+                    info = ydl.process_ie_result(info, download=False)
+                push((info, [info]))
+            else:
+                chunk = []
+                pushed = False
+                # 항목이 제너레이터면 페이지를 받아 오는 대로 넘기므로, 첫 곡을 전체 목록보다 먼저 재생할 수 있습니다.
+                # 첫 항목은 바로 넘겨 재생이 최대한 빨리 시작되게 하고, 이후로는 chunk_size개씩 묶어 넘깁니다.
+                for entry in entries:
+                    if stream.stop.is_set():
+                        break
+                    if entry:
+                        chunk.append(entry)
+                    if chunk and (len(chunk) >= chunk_size or not pushed):
+                        push((info, chunk))
+                        chunk = []
+                        pushed = True
+                if chunk and not stream.stop.is_set():
+                    push((info, chunk))
+        except Exception as e:
+            push(e)
+        finally:
+            push(_DONE)
+        return started, time.perf_counter() - started
+
+    # --- 요청 ---
+    def _slots(self, guild_id):
+        if guild_id is None:
+            return contextlib.nullcontext()
+        slots = self._guild_slots.get(guild_id)
+        if slots is None:
+            slots = self._guild_slots[guild_id] = asyncio.Semaphore(self.per_guild_limit)
+        return slots
+
+    async def _extract(self, query: str, guild_id, process: bool):
+        submitted = time.perf_counter()
+        async with self._slots(guild_id):
+            loop = asyncio.get_running_loop()
+            info, started, elapsed = await loop.run_in_executor(self._executor, self._run, query, process)
+        self._record_wait(started - submitted)
+        self.total_exec += elapsed
+        return info
+
+    async def extract(self, query: str, *, guild_id: int = None, requester_id: int = None, process: bool = True) -> dict:
+        """
+        yt-dlp의 extract_info(query, download=False, process=process) 결과를 반환합니다.
+        cancel()로 취소되면 ExtractionCancelled가 발생합니다.
+        """
+        task = asyncio.ensure_future(self._extract(query, guild_id, process))
+        key = (guild_id, requester_id)
+        self._requests.setdefault(key, set()).add(task)
+        self.in_flight += 1
+        try:
+            info = await task
+        except asyncio.CancelledError:
+            if task in self._cancelled:
+                self.cancelled += 1
+                raise ExtractionCancelled() from None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._cancelled.discard(task)
+            self._discard_request(key, task)
+        self.completed += 1
+        return info
+
+    async def iter_entries(self, query: str, *, guild_id: int = None, requester_id: int = None, chunk_size: int = 50):
+        """
+        플레이리스트를 한 번에 처리하지 않고 (정보, [항목, ...])를 조금씩 내보내는 비동기 제너레이터입니다.
+        항목은 처리되지 않은 가벼운 dict(url/title 정도)이며, 단일 곡이면 포맷이 선택된 정보 하나를 내보냅니다.
+        반복을 중간에 멈추면 작업자 스레드도 다음 항목을 받지 않고 멈춥니다.
+        """
+        stream = _EntryStream()
+        key = (guild_id, requester_id)
+        self._requests.setdefault(key, set()).add(stream)
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        failed = cancelled = False
+        try:
+            async with self._slots(guild_id):
+                loop = asyncio.get_running_loop()
+                job = loop.run_in_executor(self._executor, self._run_entries, query, stream, loop, chunk_size)
+                waited = False
+                while True:
+                    item = await stream.queue.get()
+                    if item is _DONE:
+                        break
+                    if item is _CANCELLED:
+                        cancelled = True
+                        raise ExtractionCancelled()
+                    if isinstance(item, Exception):
+                        failed = True
+                        raise item
+                    if not waited:
+                        waited = True
+                        self._record_wait(stream.started - submitted)
+                    yield item
+                started, elapsed = await job
+                self.total_exec += elapsed
+        finally:
+            # 소비하는 쪽이 중간에 반복을 멈춘 경우(대기열 가득 참 등)도 정상 완료로 셉니다.
+            if cancelled:
+                self.cancelled += 1
+            elif failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            stream.stop.set()
+            self.in_flight -= 1
+            self._discard_request(key, stream)
+
+    def _record_wait(self, wait: float):
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _discard_request(self, key, request):
+        requests = self._requests.get(key)
+        if requests is not None:
+            requests.discard(request)
+            if not requests:
+                del self._requests[key]
+
+    def cancel(self, guild_id: int, requester_id: int = None) -> int:
+        """서버의 요청(요청자를 지정하면 그 사람의 요청만)을 취소하고 취소한 개수를 반환합니다."""
+        count = 0
+        for (gid, rid), tasks in list(self._requests.items()):
+            if gid != guild_id or (requester_id is not None and rid != requester_id):
+                continue
+            for request in tasks:
+                if request.done():
+                    continue
+                if isinstance(request, _EntryStream):
+                    request.cancel()
+                else:
+                    self._cancelled.add(request)
+                    request.cancel()
+                count += 1
+        return count
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "작업자 수": self.max_workers,
+            "진행/대기 중": self.in_flight,
+            "완료": self.completed,
+            "실패": self.failed,
+            "취소": self.cancelled,
+            "평균 대기(ms)": round(self.total_wait / done * 1000, 1),
+            "최대 대기(ms)": round(self.max_wait * 1000, 1),
+            "평균 실행(ms)": round(self.total_exec / done * 1000, 1),
+        }
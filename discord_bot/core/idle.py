@@ -0,0 +1,100 @@
+# baldheadbot/core/idle.py
+
+import asyncio
+import inspect
+
+import discord
+
+
+class IdleVoiceScheduler:
+    """
+    음성 채널에 봇 혼자 남으면 일정 시간 뒤 연결을 끊는 타이머를 서버마다 하나씩 관리합니다.
+
+    - 음성 상태가 바뀔 때마다 핸들러 안에서 기다리는 대신, 서버마다 취소할 수 있는 타이머(call_later) 하나만 둡니다.
+      여러 명이 연달아 나가도 타이머는 하나이고, 누군가 다시 들어오면 취소됩니다.
+    - 음악/TTS 등 같은 음성 연결을 쓰는 Cog들이 함께 사용합니다. (bot.idle_voice)
+    - 타이머가 끝나면 Cog들이 등록한 정리 함수 `cleanup(guild)`를 호출해 서버별 자원을 정리한 뒤 연결을 끊습니다.
+    """
+    def __init__(self, bot, timeout: float = 60.0):
+        self.bot = bot
+        self.timeout = timeout
+        # 서버 ID -> TimerHandle
+        self._timers = {}
+        # 이름 -> cleanup(guild) (일반 함수 또는 코루틴 함수)
+        self._cleanups = {}
+        # 진행 중인 연결 끊기 작업 (이벤트 루프는 작업을 약하게 참조하므로 끝날 때까지 여기서 붙잡아 둡니다)
+        self._tasks = set()
+        # --- 통계 ---
+        self.scheduled = 0
+        self.cancelled = 0
+        self.disconnects = 0
+        bot.add_listener(self._on_voice_state_update, "on_voice_state_update")
+
+    # --- 정리 함수 등록 ---
+    def add_cleanup(self, name: str, callback):
+        self._cleanups[name] = callback
+
+    def remove_cleanup(self, name: str):
+        self._cleanups.pop(name, None)
+
+    # --- 타이머 ---
+    @staticmethod
+    def is_alone(voice_client) -> bool:
+        """봇이 연결된 음성 채널에 사람(봇 제외)이 없는지 확인합니다."""
+        if not voice_client or not voice_client.is_connected() or voice_client.channel is None:
+            return False
+        return not any(not member.bot for member in voice_client.channel.members)
+
+    async def _on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        if before.channel != after.channel:
+            self.update(member.guild)
+
+    def update(self, guild: discord.Guild):
+        """서버의 음성 채널 상태에 맞춰 타이머를 시작하거나 취소합니다. 이미 돌고 있는 타이머는 다시 시작하지 않습니다."""
+        if self.is_alone(guild.voice_client):
+            if guild.id not in self._timers:
+                self._timers[guild.id] = asyncio.get_running_loop().call_later(self.timeout, self._fire, guild.id)
+                self.scheduled += 1
+        else:
+            self.cancel(guild.id)
+
+    def cancel(self, guild_id: int):
+        handle = self._timers.pop(guild_id, None)
+        if handle is not None:
+            handle.cancel()
+            self.cancelled += 1
+
+    def _fire(self, guild_id: int):
+        self._timers.pop(guild_id, None)
+        task = asyncio.create_task(self._disconnect(guild_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _disconnect(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        voice_client = guild.voice_client if guild else None
+        # 타이머가 도는 사이 누군가 들어왔거나 이미 나간 상태라면 아무것도 하지 않습니다.
+        if not self.is_alone(voice_client):
+            return
+        try:
+            await voice_client.channel.send(embed=self.bot.embeds.info("자동 퇴장", "아무도 없어서 채널을 나갈게요! 👋"))
+        except discord.HTTPException:
+            pass
+        for name, cleanup in list(self._cleanups.items()):
+            try:
+                result = cleanup(guild)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"자동 퇴장 정리 중 오류 발생 ({name}): {e}")
+        await voice_client.disconnect()
+        self.disconnects += 1
+
+    def stats(self) -> dict:
+        return {
+            "대기 중인 타이머": len(self._timers),
+            "혼자 연결된 채널": sum(1 for voice_client in self.bot.voice_clients if self.is_alone(voice_client)),
+            "타이머 시작": self.scheduled,
+            "타이머 취소": self.cancelled,
+            "자동 퇴장": self.disconnects,
+        }
@@ -0,0 +1,541 @@
+# baldheadbot/core/level_store.py
+
+import asyncio
+import functools
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def atomic_write(path: str, payload: bytes):
+    """임시 파일에 모두 쓴 뒤 os.replace로 교체하여, 저장 중 종료되어도 기존 파일이 깨지지 않게 합니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def default_user_data() -> dict:
+    """새 사용자에게 부여되는 기본 레벨 데이터입니다."""
+    return {
+        "level": 1,
+        "exp": 0,
+        "last_message_timestamp": 0,
+        "last_checkin_date": "1970-01-01"
+    }
+
+
+def rank_key(user_id: int, data: dict) -> tuple:
+    """순위 정렬 키입니다. 레벨 → 경험치 내림차순, 동점이면 사용자 ID 오름차순으로 정렬합니다."""
+    return (-data["level"], -data["exp"], user_id)
+
+
+class LevelStore(ABC):
+    """
+    레벨 데이터 저장소의 공통 기반 클래스입니다. (지연 저장 + 통계)
+
+    - 데이터가 바뀌면 mark_dirty()로 '변경됨'을 표시합니다.
+    - 백그라운드 작업이 `flush_interval`초마다, 또는 변경 항목 수가 `flush_threshold`에 도달하면 저장합니다.
+    - 실제 기록 방식은 하위 클래스의 _write()가 정의합니다. (추상 메서드를 모두 구현하지 않은 하위 클래스는 만들 수 없습니다)
+    """
+    # stats()에 표시할 기록량의 단위
+    WRITTEN_LABEL = "기록량"
+    # 모든 데이터를 메모리에 들고 있는지 여부. True면 순위를 메모리의 순위 인덱스(core.rank_index)로 계산하고,
+    # False면 저장소의 rank_of()/count()/top() 쿼리로 계산합니다. (서버 전체를 메모리에 올리지 않기 위함)
+    IN_MEMORY = False
+
+    def __init__(self, flush_interval: float = 30.0, flush_threshold: int = 100):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+        self._dirty = set()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flush_task = None
+
+        # --- 저장 통계 ---
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.written = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    # --- 하위 클래스가 구현하는 부분 ---
+    @abstractmethod
+    async def load(self):
+        """저장된 데이터를 읽어 저장소를 준비합니다."""
+
+    @abstractmethod
+    async def get_user(self, guild_id: int, user_id: int) -> dict:
+        """특정 서버의 특정 사용자 데이터를 가져오거나, 없으면 생성합니다. (반환된 dict를 직접 수정)"""
+
+    @abstractmethod
+    def mark_dirty(self, guild_id: int, user_id: int, data: dict = None):
+        """사용자 데이터가 바뀌었음을 표시합니다. data는 get_user()로 받아 수정한 dict입니다."""
+
+    @abstractmethod
+    async def rank_of(self, guild_id: int, user_id: int, create: bool = True) -> int:
+        """
+        서버 내 사용자의 순위(1부터)를 반환합니다.
+        create=True면 get_user()처럼 데이터가 없는 사용자도 기본 데이터 기준으로 계산하고, False면 -1을 반환합니다.
+        """
+
+    @abstractmethod
+    async def count(self, guild_id: int) -> int:
+        """서버에 데이터가 있는 사용자 수입니다."""
+
+    @abstractmethod
+    async def top(self, guild_id: int, offset: int = 0, limit: int = 10) -> list:
+        """순위 순서대로 [(user_id, data), ...]를 offset부터 limit개 반환합니다."""
+
+    @abstractmethod
+    async def ranking_entries(self, guild_id: int) -> list:
+        """순위 인덱스를 만들기 위한 서버 전체의 [(user_id, level, exp), ...]를 반환합니다. (IN_MEMORY 저장소용)"""
+
+    @abstractmethod
+    async def _write(self, dirty: set) -> int:
+        """변경된 항목을 기록하고 기록량을 반환합니다."""
+
+    async def _close_backend(self):
+        pass
+
+    # --- 시작 / 종료 ---
+    def start(self):
+        """주기적으로 저장하는 백그라운드 작업을 시작합니다."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """백그라운드 작업을 멈추고 남아 있는 변경 사항을 모두 저장합니다. (cog_unload/종료 시 호출)"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        try:
+            await self.flush()
+        finally:
+            await self._close_backend()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"레벨 데이터 저장 중 오류 발생: {e}")
+
+    def _mark(self, key):
+        self._dirty.add(key)
+        if len(self._dirty) >= self.flush_threshold:
+            self._wakeup.set()
+
+    # --- 저장 ---
+    async def flush(self):
+        """변경된 항목이 있으면 기록합니다."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+
+            started = time.perf_counter()
+            try:
+                written = await self._write(dirty)
+            except Exception:
+                # 저장에 실패한 항목은 다시 변경됨으로 표시하여 다음 주기에 재시도합니다.
+                self._dirty |= dirty
+                self.flush_errors += 1
+                raise
+            elapsed = time.perf_counter() - started
+
+            self.flush_count += 1
+            self.written += written
+            self.last_flush_seconds = elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            self.total_flush_seconds += elapsed
+
+    def stats(self) -> dict:
+        avg = self.total_flush_seconds / self.flush_count if self.flush_count else 0.0
+        return {
+            "저장소": type(self).__name__,
+            "저장 횟수": self.flush_count,
+            "저장 실패": self.flush_errors,
+            "대기 중인 변경": len(self._dirty),
+            self.WRITTEN_LABEL: self.written,
+            "최근 저장 시간(ms)": round(self.last_flush_seconds * 1000, 2),
+            "평균 저장 시간(ms)": round(avg * 1000, 2),
+            "최대 저장 시간(ms)": round(self.max_flush_seconds * 1000, 2),
+        }
+
+
+class JsonLevelStore(LevelStore):
+    """
+    {guild_id: {user_id: data}} 구조 전체를 메모리에 두고 user_data.json에 지연 저장하는 저장소입니다.
+    서버별로 직렬화한 JSON 조각을 보관해 두고, 변경된 서버만 다시 직렬화합니다.
+    """
+    WRITTEN_LABEL = "기록한 바이트"
+    IN_MEMORY = True
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.data = {}
+        # 서버 ID(str) -> 직렬화된 JSON 문자열
+        self._fragments = {}
+        # 직렬화 조각을 아직 만들지 않은 서버 (파일 내용과는 같으므로 저장을 유발하지 않음)
+        self._stale_fragments = set()
+
+    def _read_file(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    async def load(self):
+        loop = asyncio.get_running_loop()
+        self.data = await loop.run_in_executor(None, self._read_file)
+        self._fragments = {}
+        self._stale_fragments = set(self.data.keys())
+        self._dirty = set()
+
+    async def get_user(self, guild_id: int, user_id: int) -> dict:
+        guild_data = self.data.setdefault(str(guild_id), {})
+        return guild_data.setdefault(str(user_id), default_user_data())
+
+    def mark_dirty(self, guild_id: int, user_id: int, data: dict = None):
+        # 모든 데이터를 메모리에 두므로 get_user()가 돌려준 dict가 곧 저장할 데이터입니다.
+        self._mark(str(guild_id))
+
+    def _sorted_guild(self, guild_id: int) -> list:
+        guild_data = self.data.get(str(guild_id), {})
+        return sorted(((int(uid), data) for uid, data in guild_data.items()), key=lambda item: rank_key(*item))
+
+    async def rank_of(self, guild_id: int, user_id: int, create: bool = True) -> int:
+        if create:
+            await self.get_user(guild_id, user_id)
+        for i, (uid, _) in enumerate(self._sorted_guild(guild_id)):
+            if uid == user_id:
+                return i + 1
+        return -1
+
+    async def count(self, guild_id: int) -> int:
+        return len(self.data.get(str(guild_id), {}))
+
+    async def top(self, guild_id: int, offset: int = 0, limit: int = 10) -> list:
+        return self._sorted_guild(guild_id)[offset:offset + limit]
+
+    async def ranking_entries(self, guild_id: int) -> list:
+        guild_data = self.data.get(str(guild_id), {})
+        return [(int(uid), data["level"], data["exp"]) for uid, data in guild_data.items()]
+
+    def _serialize(self, dirty: set) -> bytes:
+        for guild_id in dirty | self._stale_fragments:
+            guild_data = self.data.get(guild_id)
+            if guild_data is None:
+                self._fragments.pop(guild_id, None)
+            else:
+                self._fragments[guild_id] = json.dumps(guild_data, ensure_ascii=False)
+        self._stale_fragments = set()
+        body = ", ".join(f"{json.dumps(guild_id)}: {fragment}" for guild_id, fragment in self._fragments.items())
+        return ("{" + body + "}").encode("utf-8")
+
+    async def _write(self, dirty: set) -> int:
+        # 직렬화는 데이터를 수정하는 이벤트 루프에서 수행하고, 파일 쓰기만 실행기로 넘깁니다.
+        payload = self._serialize(dirty)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(atomic_write, self.path, payload))
+        return len(payload)
+
+
+# --- SQLite 저장소 ---
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_levels (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    level INTEGER NOT NULL DEFAULT 1,
+    exp INTEGER NOT NULL DEFAULT 0,
+    last_message_timestamp REAL NOT NULL DEFAULT 0,
+    last_checkin_date TEXT NOT NULL DEFAULT '1970-01-01',
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_user_levels_rank ON user_levels (guild_id, level DESC, exp DESC, user_id);
+"""
+
+COLUMNS = ("level", "exp", "last_message_timestamp", "last_checkin_date")
+
+UPSERT_SQL = """
+INSERT INTO user_levels (guild_id, user_id, level, exp, last_message_timestamp, last_checkin_date)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (guild_id, user_id) DO UPDATE SET
+    level = excluded.level,
+    exp = excluded.exp,
+    last_message_timestamp = excluded.last_message_timestamp,
+    last_checkin_date = excluded.last_checkin_date
+"""
+
+
+def open_database(db_path: str) -> sqlite3.Connection:
+    """WAL 모드로 데이터베이스를 열고 스키마를 준비합니다."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row_values(guild_id: int, user_id: int, data: dict) -> tuple:
+    defaults = default_user_data()
+    return (guild_id, user_id) + tuple(data.get(column, defaults[column]) for column in COLUMNS)
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str, conn: sqlite3.Connection = None) -> int:
+    """
+    기존 user_data.json의 내용을 SQLite 데이터베이스로 옮기고 옮긴 행 수를 반환합니다.
+    원본 JSON 파일은 그대로 남겨 둡니다.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    rows = [
+        _row_values(int(guild_id), int(user_id), user_data)
+        for guild_id, guild_data in data.items()
+        for user_id, user_data in guild_data.items()
+    ]
+    own_conn = conn is None
+    conn = conn or open_database(db_path)
+    try:
+        with conn:
+            conn.executemany(UPSERT_SQL, rows)
+    finally:
+        if own_conn:
+            conn.close()
+    return len(rows)
+
+
+class SqliteLevelStore(LevelStore):
+    """
+    SQLite(WAL 모드)에 레벨 데이터를 저장하는 저장소입니다.
+
+    - 최근에 사용한 사용자만 메모리(LRU)에 두고, 나머지는 필요할 때 DB에서 읽어옵니다.
+    - 순위/목록 조회는 (guild_id, level, exp) 인덱스를 사용하는 쿼리로 처리합니다.
+    - 모든 DB 접근은 전용 스레드 하나에서 실행하여 이벤트 루프를 막지 않습니다.
+    """
+    WRITTEN_LABEL = "기록한 행 수"
+
+    def __init__(self, db_path: str, migrate_from: str = None, cache_size: int = 10000, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self.migrate_from = migrate_from
+        self.cache_size = cache_size
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-db")
+        self._conn = None
+        # (guild_id, user_id) -> data
+        self._cache = OrderedDict()
+        # 아직 DB에 기록하지 않은 변경: (guild_id, user_id) -> mark_dirty() 시점의 데이터 사본
+        self._pending = {}
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    # --- DB 스레드에서 실행되는 함수들 ---
+    def _open(self) -> int:
+        self._conn = open_database(self.db_path)
+        migrated = 0
+        if self.migrate_from and os.path.exists(self.migrate_from):
+            (existing,) = self._conn.execute("SELECT COUNT(*) FROM user_levels").fetchone()
+            if existing == 0:
+                migrated = migrate_json_to_sqlite(self.migrate_from, self.db_path, conn=self._conn)
+        return migrated
+
+    def _fetch_user(self, guild_id: int, user_id: int):
+        return self._conn.execute(
+            "SELECT level, exp, last_message_timestamp, last_checkin_date FROM user_levels WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id)
+        ).fetchone()
+
+    def _fetch_rank(self, guild_id: int, level: int, exp: int, user_id: int) -> int:
+        # OR 조건 대신 인덱스 범위 검색 세 개로 나누어 각각 인덱스를 타도록 합니다.
+        (ahead,) = self._conn.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM user_levels WHERE guild_id = ?1 AND level > ?2)
+              + (SELECT COUNT(*) FROM user_levels WHERE guild_id = ?1 AND level = ?2 AND exp > ?3)
+              + (SELECT COUNT(*) FROM user_levels WHERE guild_id = ?1 AND level = ?2 AND exp = ?3 AND user_id < ?4)
+            """,
+            (guild_id, level, exp, user_id)
+        ).fetchone()
+        return ahead + 1
+
+    def _fetch_count(self, guild_id: int) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM user_levels WHERE guild_id = ?", (guild_id,)).fetchone()
+        return count
+
+    def _fetch_top(self, guild_id: int, offset: int, limit: int) -> list:
+        return self._conn.execute(
+            """
+            SELECT user_id, level, exp, last_message_timestamp, last_checkin_date FROM user_levels
+            WHERE guild_id = ? ORDER BY level DESC, exp DESC, user_id LIMIT ? OFFSET ?
+            """,
+            (guild_id, limit, offset)
+        ).fetchall()
+
+    def _fetch_ranking(self, guild_id: int) -> list:
+        return self._conn.execute(
+            "SELECT user_id, level, exp FROM user_levels WHERE guild_id = ? ORDER BY level DESC, exp DESC, user_id",
+            (guild_id,)
+        ).fetchall()
+
+    def _upsert(self, rows: list):
+        with self._conn:
+            self._conn.executemany(UPSERT_SQL, rows)
+
+    def _close_conn(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    # --- 비동기 인터페이스 ---
+    async def load(self):
+        migrated = await self._run(self._open)
+        if migrated:
+            print(f"user_data.json에서 {migrated}명의 레벨 데이터를 SQLite로 옮겼습니다.")
+
+    async def get_user(self, guild_id: int, user_id: int) -> dict:
+        key = (guild_id, user_id)
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+            return data
+
+        row = await self._run(self._fetch_user, guild_id, user_id)
+        # DB를 기다리는 동안 다른 작업이 같은 사용자를 먼저 캐시했을 수 있습니다.
+        data = self._cache.get(key)
+        if data is None:
+            data = dict(zip(COLUMNS, row)) if row else default_user_data()
+            self._cache[key] = data
+            self._evict()
+        return data
+
+    def _evict(self):
+        """캐시가 가득 차면 가장 오래 사용하지 않은, 저장이 끝난 항목부터 내보냅니다."""
+        skipped = 0
+        while len(self._cache) > self.cache_size and skipped < len(self._cache):
+            key = next(iter(self._cache))
+            if key in self._pending:
+                # 아직 저장되지 않은(저장 중인 것 포함) 항목은 내보내지 않고 뒤로 돌립니다.
+                # 내보냈다가 다시 읽으면 DB의 이전 값을 읽게 됩니다.
+                self._cache.move_to_end(key)
+                skipped += 1
+            else:
+                del self._cache[key]
+
+    def mark_dirty(self, guild_id: int, user_id: int, data: dict = None):
+        key = (guild_id, user_id)
+        if data is None:
+            data = self._cache.get(key)
+            if data is None:
+                print(f"레벨 데이터 저장 실패: 캐시에 없는 사용자입니다. {key}")
+                return
+        elif self._cache.get(key) is not data:
+            # get_user()로 받은 뒤 await하는 사이 캐시에서 내보내졌더라도, 호출한 쪽의 데이터가 최신입니다.
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+        # 저장할 값을 지금 사본으로 떠 두므로, 이후 캐시에서 내보내지더라도 변경 사항을 잃지 않습니다.
+        self._pending[key] = dict(data)
+        self._mark(key)
+
+    async def _flush_guild(self, guild_id: int):
+        """순위 계산 전에 해당 서버의 미저장 변경 사항을 DB에 반영합니다."""
+        if any(key[0] == guild_id for key in self._dirty):
+            await self.flush()
+
+    async def rank_of(self, guild_id: int, user_id: int, create: bool = True) -> int:
+        await self._flush_guild(guild_id)
+        if create:
+            # 아직 DB에 없는 신규 사용자도 현재 데이터 기준의 순위를 계산합니다.
+            data = await self.get_user(guild_id, user_id)
+        else:
+            key = (guild_id, user_id)
+            data = self._cache.get(key)
+            if data is None:
+                row = await self._run(self._fetch_user, guild_id, user_id)
+                if row is None:
+                    return -1
+                data = dict(zip(COLUMNS, row))
+        return await self._run(self._fetch_rank, guild_id, data["level"], data["exp"], user_id)
+
+    async def count(self, guild_id: int) -> int:
+        await self._flush_guild(guild_id)
+        return await self._run(self._fetch_count, guild_id)
+
+    async def top(self, guild_id: int, offset: int = 0, limit: int = 10) -> list:
+        await self._flush_guild(guild_id)
+        rows = await self._run(self._fetch_top, guild_id, offset, limit)
+        return [(row[0], dict(zip(COLUMNS, row[1:]))) for row in rows]
+
+    async def ranking_entries(self, guild_id: int) -> list:
+        await self._flush_guild(guild_id)
+        return await self._run(self._fetch_ranking, guild_id)
+
+    async def _write(self, dirty: set) -> int:
+        snapshots = {key: self._pending[key] for key in dirty if key in self._pending}
+        rows = [_row_values(guild_id, user_id, data) for (guild_id, user_id), data in snapshots.items()]
+        await self._run(self._upsert, rows)
+        for key, data in snapshots.items():
+            # 기록하는 사이 다시 바뀐 항목은 새 사본을 남겨 두어 다음 저장 때 기록합니다.
+            if self._pending.get(key) is data:
+                del self._pending[key]
+        self._evict()
+        return len(rows)
+
+    async def _close_backend(self):
+        await self._run(self._close_conn)
+        self._executor.shutdown(wait=False)
+
+
+def create_level_store(backend: str, data_dir: str, **kwargs) -> LevelStore:
+    """설정값("json" 또는 "sqlite")에 맞는 저장소를 생성합니다."""
+    json_path = os.path.join(data_dir, "user_data.json")
+    if backend == "sqlite":
+        return SqliteLevelStore(os.path.join(data_dir, "user_data.db"), migrate_from=json_path, **kwargs)
+    if backend == "json":
+        return JsonLevelStore(json_path, **kwargs)
+    raise ValueError(f"알 수 없는 레벨 저장소 종류입니다: {backend}")
+
+
+if __name__ == "__main__":
+    # 수동 일회성 이전: python core/level_store.py <user_data.json> <user_data.db>
+    if len(sys.argv) != 3:
+        print("사용법: python core/level_store.py <user_data.json 경로> <user_data.db 경로>")
+        sys.exit(1)
+    count = migrate_json_to_sqlite(sys.argv[1], sys.argv[2])
+    print(f"{count}명의 레벨 데이터를 옮겼습니다.")
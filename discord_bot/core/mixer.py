@@ -0,0 +1,367 @@
+# baldheadbot/core/mixer.py
+
+import threading
+import time
+from dataclasses import dataclass
+
+import discord
+import numpy as np
+
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+SILENCE = b"\x00" * FRAME_SIZE
+# 한 프레임(20ms) 안에서 볼륨을 서서히 바꿀 때 쓰는 0 -> 1 비율 (스테레오이므로 샘플마다 두 번씩)
+_RAMP = np.repeat(np.linspace(0.0, 1.0, FRAME_SIZE // 4, endpoint=False, dtype=np.float32), 2)
+
+
+@dataclass(slots=True)
+class MixerChannel:
+    """믹서에 연결된 소스 하나(음악, TTS 등)입니다."""
+    source: discord.AudioSource
+    # 소스가 끝나거나 멈췄을 때 호출할 함수 after(error) (VoiceClient.play의 after와 같음, 재생 스레드에서 호출될 수 있음)
+    after: object = None
+    # 이 채널이 재생되는 동안 다른 채널의 볼륨을 줄일지 여부 (TTS)
+    ducks_others: bool = False
+    # Opus 소스를 다른 채널과 섞어야 할 때 PCM 소스로 바꿔 달라고 요청하는 함수 (이벤트 루프에서 호출)
+    on_mix: object = None
+    paused: bool = False
+    # 지금 적용 중인 볼륨 배율. 덕킹할 때 프레임마다 조금씩 바뀝니다.
+    gain: float = 1.0
+    mix_requested: bool = False
+
+
+class MixerSource(discord.AudioSource):
+    """VoiceClient가 재생하는 소스입니다. 프레임마다 VoiceMixer가 채널들을 섞은 결과를 돌려줍니다."""
+    def __init__(self, mixer):
+        self.mixer = mixer
+        # 마지막으로 돌려준 프레임이 Opus인지 여부. discord.py는 read() 직후 is_opus()로 인코딩 여부를 정하므로,
+        # 읽은 프레임과 같은 값을 돌려줍니다. (처음에는 False여야 VoiceClient가 Opus 인코더를 만듭니다)
+        self._opus = False
+
+    def read(self) -> bytes:
+        data, self._opus = self.mixer._read(self)
+        return data
+
+    def is_opus(self) -> bool:
+        return self._opus
+
+    def cleanup(self):
+        self.mixer._source_closed(self)
+
+
+class VoiceMixer:
+    """
+    서버 하나의 음성 연결에서 여러 소스(음악, TTS)를 동시에 재생하는 믹서입니다.
+
+    discord.py의 VoiceClient는 한 번에 소스 하나만 재생할 수 있으므로, 음성 연결에는 MixerSource 하나만 재생하고
+    각 기능은 이름 붙은 채널(`"music"`, `"tts"`)로 소스를 넣습니다. 재생 스레드가 20ms마다 채널별 PCM 프레임을 읽어
+    NumPy로 더한 뒤 잘라내기(clip)하며, `ducks_others` 채널(TTS)이 재생되는 동안에는 나머지 채널의 볼륨을
+    `duck_volume`배로 서서히 줄입니다.
+
+    - 재생 중인 채널이 Opus 소스 하나뿐이면 섞지 않고 그대로 보내므로, 음악만 재생할 때는 Opus 재생 방식의 이점이 유지됩니다.
+      다른 채널과 섞어야 하면 그 채널의 `on_mix()`를 호출해 PCM 소스로 바꿔 달라고 요청하고, 바뀔 때까지는 그 채널을 건너뜁니다.
+    - 채널이 모두 끝나면 MixerSource도 끝나고, 새 채널이 들어오면 다시 재생을 시작합니다. (재생할 것이 없을 때 무음을 보내지 않음)
+    - 모든 채널이 일시정지되면 음성 연결도 일시정지합니다.
+    """
+    # 덕킹할 때 한 프레임(20ms)마다 바꿀 볼륨 배율의 최대 크기 (0.1이면 약 0.2초에 걸쳐 줄어듦)
+    DUCK_STEP = 0.1
+
+    def __init__(self, bot, guild: discord.Guild, duck_volume: float = 0.3):
+        self.bot = bot
+        self.guild = guild
+        self.duck_volume = duck_volume
+        # 채널 이름 -> MixerChannel
+        self._channels = {}
+        # 재생 스레드가 다음 프레임을 읽기 전에 정리할 채널 (읽는 도중에 소스를 정리하지 않기 위함)
+        self._retired = []
+        # 지금 음성 연결에서 재생 중인 MixerSource (없으면 None)
+        self._source = None
+        self._lock = threading.Lock()
+        # --- 통계 (재생 스레드에서 갱신) ---
+        self.mixed_frames = 0
+        self.passthrough_frames = 0
+        self.single_frames = 0
+        self.mix_time = 0.0
+        self.max_mix_time = 0.0
+        self.pcm_requests = 0
+
+    # --- 채널 조작 (이벤트 루프에서 호출) ---
+    def play(self, name: str, source: discord.AudioSource, *, after=None, ducks_others: bool = False, on_mix=None):
+        """채널에 소스를 넣고 재생합니다. 같은 이름의 채널이 이미 재생 중이면 ClientException이 발생합니다."""
+        with self._lock:
+            if name in self._channels:
+                raise discord.ClientException(f"믹서 채널 '{name}'이(가) 이미 재생 중입니다.")
+            self._channels[name] = MixerChannel(source, after=after, ducks_others=ducks_others, on_mix=on_mix)
+        try:
+            self._sync()
+        except Exception:
+            with self._lock:
+                self._channels.pop(name, None)
+            raise
+
+    def stop(self, name: str):
+        """채널의 재생을 멈춥니다. 소스를 정리한 뒤 채널의 after(None)가 호출됩니다."""
+        with self._lock:
+            channel = self._channels.pop(name, None)
+            if channel is None:
+                return
+            if self._source is not None:
+                self._retired.append(channel)
+                channel = None
+        if channel is not None:
+            self._close(channel)
+        self._sync()
+
+    def replace(self, name: str, source: discord.AudioSource) -> bool:
+        """재생 중인 채널의 소스를 바꿉니다. (Opus 소스를 같은 위치의 PCM 소스로 바꿀 때 사용) 채널이 없으면 False입니다."""
+        with self._lock:
+            channel = self._channels.get(name)
+            if channel is None:
+                return False
+            old = MixerChannel(channel.source)
+            channel.source = source
+            channel.mix_requested = False
+            if self._source is not None:
+                self._retired.append(old)
+                old = None
+        if old is not None:
+            self._close(old)
+        return True
+
+    def pause(self, name: str):
+        channel = self._channels.get(name)
+        if channel is not None:
+            channel.paused = True
+            self._sync()
+
+    def resume(self, name: str):
+        channel = self._channels.get(name)
+        if channel is not None:
+            channel.paused = False
+            self._sync()
+
+    def source(self, name: str):
+        channel = self._channels.get(name)
+        return channel.source if channel else None
+
+    def is_playing(self, name: str) -> bool:
+        channel = self._channels.get(name)
+        return channel is not None and not channel.paused
+
+    def is_paused(self, name: str) -> bool:
+        channel = self._channels.get(name)
+        return channel is not None and channel.paused
+
+    def has_other_playing(self, name: str) -> bool:
+        """name 외에 재생 중인(일시정지되지 않은) 채널이 있는지 여부입니다. (곡을 처음부터 PCM으로 열지 정할 때 사용)"""
+        return any(other != name and not channel.paused for other, channel in list(self._channels.items()))
+
+    def close(self):
+        """모든 채널을 멈추고 믹서 재생을 끝냅니다. (자동 퇴장, 나가기)"""
+        vc = self.guild.voice_client
+        with self._lock:
+            source = self._source
+            if source is not None and vc is not None:
+                # 재생 스레드가 소스를 읽는 중일 수 있으므로, 채널은 재생 스레드가 멈추면서 정리하게 합니다.
+                self._retired.extend(self._channels.values())
+                channels = []
+            else:
+                channels = self._retired + list(self._channels.values())
+                self._retired = []
+                self._source = None
+            self._channels.clear()
+        for channel in channels:
+            self._close(channel)
+        if source is not None and vc is not None:
+            vc.stop()
+
+    def _sync(self):
+        """채널 상태에 맞춰 음성 연결의 재생/일시정지/정지를 맞춥니다."""
+        vc = self.guild.voice_client
+        if not vc or not vc.is_connected():
+            return
+        with self._lock:
+            empty = not self._channels
+            active = any(not channel.paused for channel in self._channels.values())
+            source = self._source
+        if source is None:
+            if not active:
+                return
+            # 채널이 모두 끝나 멈추는 중인 이전 MixerSource(또는 믹서를 거치지 않은 소스)가 있으면 먼저 멈춥니다.
+            if vc.is_playing() or vc.is_paused():
+                vc.stop()
+            source = MixerSource(self)
+            with self._lock:
+                self._source = source
+            try:
+                vc.play(source, after=self._after_source)
+            except Exception:
+                with self._lock:
+                    self._source = None
+                raise
+        elif empty and vc.is_paused():
+            # 일시정지 중에 마지막 채널이 멈췄으면 재생 스레드가 깨어나지 않으므로 음성 연결을 멈춰 정리합니다.
+            vc.stop()
+        elif active and vc.is_paused():
+            vc.resume()
+        elif not active and not empty and vc.is_playing():
+            vc.pause()
+
+    def _after_source(self, error):
+        if error:
+            print(f"음성 믹서 재생 중 오류 발생: {error}")
+
+    # --- 재생 스레드 ---
+    def _close(self, channel: MixerChannel, error=None):
+        try:
+            channel.source.cleanup()
+        except Exception as e:
+            print(f"믹서 채널 정리 중 오류 발생: {e}")
+        if channel.after:
+            try:
+                channel.after(error)
+            except Exception as e:
+                print(f"믹서 채널 after 콜백 오류: {e}")
+
+    def _source_closed(self, source: MixerSource):
+        """MixerSource가 정리될 때(연결 종료, vc.stop() 등) 남은 채널을 모두 정리합니다."""
+        with self._lock:
+            if self._source is not source:
+                return
+            self._source = None
+            channels = self._retired + list(self._channels.values())
+            self._retired = []
+            self._channels.clear()
+        for channel in channels:
+            self._close(channel)
+
+    def _finish(self, channel: MixerChannel, error=None):
+        with self._lock:
+            for name, current in list(self._channels.items()):
+                if current is channel:
+                    del self._channels[name]
+        self._close(channel, error)
+
+    def _read(self, source: MixerSource):
+        """다음 20ms 프레임과 그 프레임이 Opus인지 여부를 반환합니다. 끝났으면 b""입니다."""
+        while True:
+            with self._lock:
+                if source is not self._source:
+                    return b"", False
+                retired, self._retired = self._retired, []
+                if not self._channels and not retired:
+                    self._source = None
+                    return b"", False
+                channels = [channel for channel in self._channels.values() if not channel.paused]
+            for channel in retired:
+                self._close(channel)
+            if not channels:
+                if retired:
+                    continue
+                # 모든 채널이 일시정지됨: _sync()가 음성 연결을 일시정지할 때까지 무음을 보냅니다.
+                return SILENCE, False
+
+            # 재생 중인 채널이 Opus 소스 하나뿐이면 섞지 않고 그대로 보냅니다.
+            if len(channels) == 1 and channels[0].source.is_opus():
+                channel = channels[0]
+                try:
+                    data = channel.source.read()
+                except Exception as e:
+                    self._finish(channel, e)
+                    continue
+                if not data:
+                    self._finish(channel)
+                    continue
+                self.passthrough_frames += 1
+                return data, True
+
+            frames = []
+            for channel in channels:
+                if channel.source.is_opus():
+                    # Opus는 섞을 수 없으므로 PCM 소스로 바꿔 달라고 한 번만 요청하고, 바뀔 때까지 건너뜁니다.
+                    if not channel.mix_requested and channel.on_mix:
+                        channel.mix_requested = True
+                        self.pcm_requests += 1
+                        self.bot.loop.call_soon_threadsafe(channel.on_mix)
+                    continue
+                try:
+                    data = channel.source.read()
+                except Exception as e:
+                    self._finish(channel, e)
+                    continue
+                if not data:
+                    self._finish(channel)
+                    continue
+                frames.append((channel, data))
+            if not frames:
+                if any(not channel.source.is_opus() for channel in channels):
+                    # 이번 프레임에 끝난 채널이 있으므로 남은 채널로 다시 읽습니다.
+                    continue
+                return SILENCE, False
+            # 이번 프레임에 끝난 TTS 채널은 덕킹에 넣지 않으므로, TTS가 끝난 프레임부터 바로 볼륨이 돌아옵니다.
+            return self._mix(frames, ducking=any(channel.ducks_others for channel, _ in frames)), False
+
+    def _mix(self, frames, ducking: bool) -> bytes:
+        started = time.perf_counter()
+        # 소스가 하나이고 볼륨을 바꿀 필요가 없으면 그대로 보냅니다.
+        if len(frames) == 1:
+            channel, data = frames[0]
+            target = self.duck_volume if ducking and not channel.ducks_others else 1.0
+            if channel.gain == target == 1.0:
+                self.single_frames += 1
+                return data
+        mix = np.zeros(FRAME_SIZE // 2, dtype=np.float32)
+        for channel, data in frames:
+            samples = np.frombuffer(data, dtype=np.int16, count=min(len(data), FRAME_SIZE) // 2)
+            target = self.duck_volume if ducking and not channel.ducks_others else 1.0
+            gain = channel.gain
+            if gain != target:
+                # 볼륨을 한 번에 바꾸면 딸깍 소리가 나므로 프레임 안에서 직선으로 서서히 바꿉니다.
+                step = max(-self.DUCK_STEP, min(self.DUCK_STEP, target - gain))
+                channel.gain = gain + step
+                mix[:samples.size] += samples * (gain + step * _RAMP[:samples.size])
+            elif gain == 1.0:
+                mix[:samples.size] += samples
+            else:
+                mix[:samples.size] += samples * np.float32(gain)
+        np.clip(mix, -32768, 32767, out=mix)
+        data = mix.astype(np.int16).tobytes()
+        elapsed = time.perf_counter() - started
+        self.mixed_frames += 1
+        self.mix_time += elapsed
+        self.max_mix_time = max(self.max_mix_time, elapsed)
+        return data
+
+
+class VoiceMixerManager:
+    """서버별 VoiceMixer를 관리합니다. 음악/TTS Cog가 함께 사용합니다. (bot.voice_mixer)"""
+    def __init__(self, bot, duck_volume: float = 0.3):
+        self.bot = bot
+        self.duck_volume = duck_volume
+        # 서버 ID -> VoiceMixer
+        self.mixers = {}
+
+    def get(self, guild: discord.Guild) -> VoiceMixer:
+        mixer = self.mixers.get(guild.id)
+        if mixer is None:
+            mixer = VoiceMixer(self.bot, guild, duck_volume=self.duck_volume)
+            self.mixers[guild.id] = mixer
+        return mixer
+
+    def remove(self, guild: discord.Guild):
+        """서버의 믹서를 멈추고 없앱니다. 자동 퇴장/나가기 때 호출합니다. (bot.idle_voice 정리 함수로도 등록)"""
+        mixer = self.mixers.pop(guild.id, None)
+        if mixer is not None:
+            mixer.close()
+
+    def stats(self) -> dict:
+        mixers = list(self.mixers.values())
+        mixed = sum(mixer.mixed_frames for mixer in mixers)
+        return {
+            "믹서가 있는 서버": len(mixers),
+            "섞은 프레임": mixed,
+            "그대로 보낸 프레임(Opus)": sum(mixer.passthrough_frames for mixer in mixers),
+            "단일 PCM 프레임": sum(mixer.single_frames for mixer in mixers),
+            "PCM 전환 요청": sum(mixer.pcm_requests for mixer in mixers),
+            "평균 믹싱 시간(µs)": round(sum(mixer.mix_time for mixer in mixers) / mixed * 1e6, 1) if mixed else 0.0,
+            "최대 믹싱 시간(µs)": round(max((mixer.max_mix_time for mixer in mixers), default=0.0) * 1e6, 1),
+        }
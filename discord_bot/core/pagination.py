@@ -0,0 +1,60 @@
+# baldheadbot/core/pagination.py
+
+import discord
+from typing import Awaitable, Callable, Tuple
+
+# render_page(page) -> (임베드, 전체 페이지 수). page는 0부터 시작합니다.
+PageRenderer = Callable[[int], Awaitable[Tuple[discord.Embed, int]]]
+
+
+class PageView(discord.ui.View):
+    """
+    이전/다음 버튼으로 페이지를 넘기는 View입니다.
+    목록 전체를 미리 만들지 않고, 버튼을 누를 때마다 render_page로 요청된 페이지 하나만 그립니다.
+    """
+    def __init__(self, *, author_id: int, render_page: PageRenderer, page: int = 0, timeout: float = 120.0):
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.render_page = render_page
+        self.page = page
+        self.page_count = 1
+        self.message = None
+
+    async def render(self) -> discord.Embed:
+        """현재 페이지를 그리고 버튼 상태를 맞춘 임베드를 반환합니다."""
+        embed, self.page_count = await self.render_page(self.page)
+        # 그리는 사이 목록이 줄어들었을 수 있으므로 범위를 다시 맞춥니다.
+        if self.page >= self.page_count > 0:
+            self.page = self.page_count - 1
+            embed, self.page_count = await self.render_page(self.page)
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+        return embed
+
+    async def _move(self, interaction: discord.Interaction, delta: int):
+        self.page = max(0, self.page + delta)
+        embed = await self.render()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="◀ 이전", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._move(interaction, -1)
+
+    @discord.ui.button(label="다음 ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._move(interaction, 1)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """명령어를 실행한 사용자만 페이지를 넘길 수 있도록 제한합니다."""
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("명령어를 실행한 사용자만 페이지를 넘길 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        """시간이 지나면 버튼을 제거합니다."""
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
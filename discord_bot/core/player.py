@@ -0,0 +1,282 @@
+# baldheadbot/core/player.py
+
+import asyncio
+import time
+import discord
+
+from core.extractor import ExtractionCancelled
+from core.track import Track
+
+
+class GuildPlayer:
+    """
+    서버 하나의 음악 재생 상태(대기열, 현재 곡, 볼륨)와 재생 작업을 담당하는 클래스입니다.
+
+    서버마다 전용 재생 작업(asyncio Task)이 하나씩 돌며, 대기열에 곡이 들어오거나
+    현재 곡이 끝났다는 신호(asyncio.Event)를 받으면 다음 곡을 재생합니다.
+    FFmpeg 스레드에서 호출되는 `after` 콜백은 이벤트를 설정하기만 하므로,
+    다른 서버의 재생이나 이벤트 루프와 엉키지 않습니다.
+
+    `create_source(player, track, position=None)`는 곡(Track)을 받아 재생할 AudioSource를 만드는 코루틴 함수입니다.
+    (스트림 URL 추출 등은 이 함수에서 처리합니다.) Opus로 그대로 보내는 소스는 재생 중에 볼륨을 바꾸거나 TTS와 섞을 수 없으므로,
+    그럴 때는 `position`(초)을 넘겨 그 위치부터 PCM 소스(PCMVolumeTransformer)로 다시 만들게 합니다.
+    곡은 음성 연결에 직접 재생하지 않고 서버 믹서(bot.voice_mixer)의 "music" 채널로 재생하므로 TTS와 동시에 들립니다.
+    `prefetcher`(StreamPrefetcher)가 있으면 곡이 시작될 때마다 다음 곡들의 스트림 URL을 미리 받습니다.
+    """
+    DEFAULT_BASE_VOLUME = 0.2
+
+    def __init__(self, bot, guild: discord.Guild, create_source, prefetcher=None):
+        self.bot = bot
+        self.guild = guild
+        self.create_source = create_source
+        self.prefetcher = prefetcher
+
+        self.queue = []
+        self.current = None
+        # 서버 기본 볼륨과 사용자 배율. 최종 볼륨은 두 값의 곱입니다.
+        self.base_volume = self.DEFAULT_BASE_VOLUME
+        self.volume_multiplier = 1.0
+
+        # 대기열에 곡이 들어왔을 때 / 현재 곡이 끝났을 때 설정되는 신호
+        self._wakeup = asyncio.Event()
+        self._track_finished = asyncio.Event()
+        self._task = None
+        # Opus 소스를 PCM 소스로 바꾸는 작업
+        self._restart_task = None
+
+        # --- 현재 곡 재생 위치 ---
+        # 현재 곡을 재생하기 시작한 시각(time.time(), 표시용)
+        self.started_at = None
+        # 재생을 시작한 시각(monotonic), 일시정지한 시각, 지금까지 일시정지해 있던 시간
+        self._started_at = None
+        self._paused_at = None
+        self._paused_total = 0.0
+
+        # --- 곡 사이 공백 측정 ---
+        # 이전 곡이 끝난 시각(perf_counter)과, 곡이 끝나고 다음 곡이 시작되기까지 걸린 시간들
+        self._track_ended_at = None
+        self.gap_count = 0
+        self.total_gap = 0.0
+        self.max_gap = 0.0
+        self.last_gap = None
+
+    # --- 상태 ---
+    @property
+    def voice_client(self):
+        return self.guild.voice_client
+
+    @property
+    def mixer(self):
+        return self.bot.voice_mixer.get(self.guild)
+
+    @property
+    def volume(self) -> float:
+        return self.base_volume * self.volume_multiplier
+
+    def is_active(self) -> bool:
+        return self.mixer.is_playing("music") or self.mixer.is_paused("music")
+
+    def is_paused(self) -> bool:
+        return self.mixer.is_paused("music")
+
+    @property
+    def elapsed(self) -> float:
+        """현재 곡을 재생한 시간(초)입니다. 일시정지해 있던 시간은 빼고 계산합니다."""
+        if self._started_at is None:
+            return 0.0
+        now = self._paused_at if self._paused_at is not None else time.monotonic()
+        return max(0.0, now - self._started_at - self._paused_total)
+
+    # --- 재생 작업 ---
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._player_loop(), name=f"music-player-{self.guild.id}")
+
+    def destroy(self):
+        """재생 작업을 종료합니다. 음성 연결은 호출한 쪽에서 정리합니다."""
+        self.queue.clear()
+        self.current = None
+        self.started_at = self._started_at = None
+        if self.prefetcher:
+            self.prefetcher.cancel_all()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._restart_task:
+            self._restart_task.cancel()
+            self._restart_task = None
+
+    async def _player_loop(self):
+        while True:
+            if not self.queue:
+                # 대기열이 빈 채로 곡이 끝났다면 이어지는 곡이 없으므로 공백으로 세지 않습니다.
+                self._track_ended_at = None
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            vc = self.voice_client
+            if not vc or not vc.is_connected():
+                # 음성 채널에서 나간 상태라면 남은 대기열은 의미가 없으므로 비웁니다.
+                self.queue.clear()
+                continue
+
+            track = self.queue.pop(0)
+            try:
+                source = await self.create_source(self, track)
+            except ExtractionCancelled:
+                # 중지/퇴장으로 추출이 취소된 경우이므로 오류로 알리지 않습니다.
+                continue
+            except Exception as e:
+                print(f"Error playing '{track.title}': {e}")
+                await self._send(track, self.bot.embeds.error("재생 오류", f"'{track.title}'을(를) 재생하는 중 오류가 발생했습니다."))
+                continue
+
+            # 소스를 준비하는 사이 연결이 끊겼을 수 있습니다.
+            vc = self.voice_client
+            if not vc or not vc.is_connected():
+                source.cleanup()
+                continue
+
+            # TTS가 재생 중이어도 믹서가 함께 섞어 재생하므로 기다리지 않습니다.
+            self._track_finished.clear()
+            try:
+                self.mixer.play("music", source, after=self._after_track, on_mix=self._request_pcm)
+            except discord.ClientException as e:
+                print(f"Error playing '{track.title}': {e}")
+                source.cleanup()
+                continue
+            self.current = track
+            self.started_at = time.time()
+            self._started_at = time.monotonic()
+            self._paused_at = None
+            self._paused_total = 0.0
+            self._record_gap()
+            # 현재 곡이 재생되는 동안 다음 곡들의 스트림 URL을 미리 받아 둡니다.
+            if self.prefetcher:
+                self.prefetcher.schedule(self.queue)
+
+            embed = self.bot.embeds.info("재생 시작", f"▶️ 이제 '{track.title}'을(를) 재생합니다.")
+            requester = track.requester(self.guild)
+            if requester:
+                embed.set_footer(text=f"요청: {requester.display_name}", icon_url=requester.display_avatar.url)
+            await self._send(track, embed)
+
+            await self._track_finished.wait()
+            self.current = None
+            self.started_at = self._started_at = None
+
+    def _after_track(self, error):
+        """FFmpeg 재생 스레드에서 호출됩니다. 이벤트 루프 쪽으로 신호만 넘깁니다."""
+        if error:
+            print(f'Player error: {error}')
+        self._track_ended_at = time.perf_counter()
+        self.bot.loop.call_soon_threadsafe(self._track_finished.set)
+
+    def _record_gap(self):
+        if self._track_ended_at is None:
+            return
+        gap = time.perf_counter() - self._track_ended_at
+        self._track_ended_at = None
+        self.gap_count += 1
+        self.total_gap += gap
+        self.max_gap = max(self.max_gap, gap)
+        self.last_gap = gap
+
+    async def _send(self, track: Track, embed: discord.Embed):
+        channel = track.channel(self.guild)
+        if channel is None:
+            return
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+    # --- 대기열 조작 ---
+    def _queue_changed(self):
+        self._wakeup.set()
+        # 재생 중에 대기열 앞쪽이 바뀌었으면 새로 다음 곡이 된 곡들도 미리 받습니다.
+        if self.prefetcher and self.current is not None:
+            self.prefetcher.schedule(self.queue)
+
+    def enqueue(self, track: Track):
+        self.queue.append(track)
+        self._queue_changed()
+
+    def enqueue_many(self, tracks):
+        self.queue.extend(tracks)
+        self._queue_changed()
+
+    def play_now(self, index: int) -> Track:
+        """대기열의 index번째(0부터) 곡을 맨 앞으로 옮기고, 현재 곡을 멈춰 바로 재생되게 합니다."""
+        track = self.queue.pop(index)
+        self.queue.insert(0, track)
+        self.skip()
+        self._queue_changed()
+        return track
+
+    def skip(self):
+        self.mixer.stop("music")
+
+    def clear(self):
+        """대기열을 비우고 현재 곡을 멈춥니다."""
+        self.queue.clear()
+        if self.prefetcher:
+            self.prefetcher.cancel_all()
+        self.skip()
+
+    # --- 일시정지 ---
+    # TTS는 계속 읽을 수 있도록 음성 연결 전체가 아니라 믹서의 음악 채널만 일시정지합니다.
+    def pause(self):
+        if self.mixer.is_playing("music"):
+            self.mixer.pause("music")
+            self._paused_at = time.monotonic()
+
+    def resume(self):
+        if self.mixer.is_paused("music"):
+            self.mixer.resume("music")
+            if self._paused_at is not None:
+                self._paused_total += time.monotonic() - self._paused_at
+                self._paused_at = None
+
+    # --- 볼륨 ---
+    def set_volume(self, base_volume: float = None, multiplier: float = None):
+        """볼륨 설정을 바꾸고, 재생 중인 곡이 있으면 즉시 적용합니다."""
+        if base_volume is not None:
+            self.base_volume = base_volume
+        if multiplier is not None:
+            self.volume_multiplier = multiplier
+        source = self.mixer.source("music")
+        if source is None:
+            return
+        if isinstance(source, discord.PCMVolumeTransformer):
+            source.volume = self.volume
+        elif source.is_opus():
+            # Opus로 그대로 보내는 중에는 볼륨을 바꿀 수 없으므로, 지금 위치부터 PCM 소스로 바꿔 재생합니다.
+            self._request_pcm()
+
+    def _request_pcm(self):
+        """Opus로 재생 중인 현재 곡을 지금 위치부터 PCM 소스로 다시 재생합니다. (볼륨 변경, TTS와 섞을 때)"""
+        if self.current is not None and (self._restart_task is None or self._restart_task.done()):
+            self._restart_task = asyncio.create_task(self._restart_as_pcm(self.current))
+
+    async def _restart_as_pcm(self, track: Track):
+        try:
+            source = await self.create_source(self, track, position=self.elapsed)
+        except Exception as e:
+            print(f"볼륨 적용을 위한 재시작 실패 ('{track.title}'): {e}")
+            return
+        # 만드는 사이 볼륨이 또 바뀌었을 수 있으므로 최신 값을 적용합니다.
+        if isinstance(source, discord.PCMVolumeTransformer):
+            source.volume = self.volume
+        # 소스를 만드는 사이 곡이 바뀌었거나 끝났다면 버립니다. (이전 소스는 믹서가 재생 스레드에서 정리합니다)
+        if self.current is not track or not self.mixer.replace("music", source):
+            source.cleanup()
+
+    def stats(self) -> dict:
+        """곡 사이 공백(이전 곡 종료 ~ 다음 곡 시작) 통계입니다."""
+        return {
+            "곡 전환": self.gap_count,
+            "평균 공백(ms)": round(self.total_gap / self.gap_count * 1000, 1) if self.gap_count else 0.0,
+            "최대 공백(ms)": round(self.max_gap * 1000, 1),
+        }
@@ -0,0 +1,149 @@
+# baldheadbot/core/prefetch.py
+
+import asyncio
+import base64
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+# 만료 시각을 URL에서 알아낼 수 없을 때 가정하는 유효 시간(초)
+DEFAULT_URL_TTL = 30 * 60
+
+
+def stream_url_expiry(url: str, default_ttl: float = DEFAULT_URL_TTL) -> float:
+    """
+    서명된 스트림 URL의 만료 시각(time.time() 기준)을 반환합니다.
+    - YouTube 등: `expire=`/`Expires=` 쿼리 값 (유닉스 시간)
+    - SoundCloud(CloudFront): `Policy=` 값(base64 JSON)의 DateLessThan
+    둘 다 없으면 지금부터 default_ttl 뒤로 가정합니다.
+    """
+    try:
+        query = parse_qs(urlparse(url).query)
+        for key in ("expire", "Expires", "expires"):
+            if key in query:
+                return float(query[key][0])
+        if "Policy" in query:
+            policy = query["Policy"][0].replace("-", "+").replace("_", "=").replace("~", "/")
+            statement = json.loads(base64.b64decode(policy))["Statement"][0]
+            return float(statement["Condition"]["DateLessThan"]["AWS:EpochTime"])
+    except (ValueError, KeyError, IndexError, TypeError):
+        pass
+    return time.time() + default_ttl
+
+
+class StreamPrefetcher:
+    """
+    대기열 앞쪽 곡들의 스트림 URL을 현재 곡이 재생되는 동안 미리 받아 두는 클래스입니다.
+
+    `resolve(track)`은 곡의 스트림 URL을 반환하는 코루틴 함수입니다. 받아 둔 URL과 만료 시각은
+    곡(Track)의 stream_url / stream_expires_at에 저장하며, 만료가 가까워지면 다시 받습니다.
+    """
+    def __init__(self, resolve, depth: int = 2, refresh_margin: float = 120.0):
+        self.resolve = resolve
+        self.depth = depth
+        self.refresh_margin = refresh_margin
+        # id(track) -> (track, Task) / (track, TimerHandle)
+        self._tasks = {}
+        self._timers = {}
+        # --- 통계 ---
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def is_fresh(self, track) -> bool:
+        expires_at = track.stream_expires_at
+        return bool(track.stream_url) and expires_at is not None and expires_at - time.time() > self.refresh_margin
+
+    async def _resolve_into(self, track) -> str:
+        stream_url = await self.resolve(track)
+        track.stream_url = stream_url
+        track.stream_expires_at = stream_url_expiry(stream_url)
+        return stream_url
+
+    def _start(self, track):
+        key = id(track)
+        entry = self._tasks.get(key)
+        if entry is not None and not entry[1].done():
+            return
+        task = asyncio.create_task(self._resolve_into(track))
+        task.add_done_callback(lambda t, key=key: self._on_resolved(key, t))
+        self._tasks[key] = (track, task)
+
+    def _on_resolved(self, key: int, task: asyncio.Task):
+        entry = self._tasks.get(key)
+        if entry is not None and entry[1] is task:
+            del self._tasks[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # 실제 재생 시점에 다시 시도하므로 여기서는 기록만 합니다.
+            print(f"스트림 미리 받기 실패 ('{entry[0].title if entry else '?'}'): {error}")
+            return
+        if entry is not None:
+            self._schedule_refresh(entry[0])
+
+    def _schedule_refresh(self, track):
+        """URL이 만료되기 refresh_margin초 전에 다시 받도록 예약합니다."""
+        key = id(track)
+        old = self._timers.pop(key, None)
+        if old is not None:
+            old[1].cancel()
+        delay = max(0.0, track.stream_expires_at - time.time() - self.refresh_margin)
+        handle = asyncio.get_running_loop().call_later(delay, self._refresh, track)
+        self._timers[key] = (track, handle)
+
+    def _refresh(self, track):
+        self._timers.pop(id(track), None)
+        self.refreshes += 1
+        self._start(track)
+
+    def schedule(self, queue: list):
+        """대기열 앞쪽 depth곡을 미리 받기 시작하고, 범위에서 벗어난 곡의 작업은 취소합니다."""
+        window = queue[:self.depth]
+        wanted = {id(track) for track in window}
+        for key in [key for key in self._tasks if key not in wanted]:
+            self._tasks.pop(key)[1].cancel()
+        for key in [key for key in self._timers if key not in wanted]:
+            self._timers.pop(key)[1].cancel()
+        for track in window:
+            if not self.is_fresh(track):
+                self._start(track)
+            elif id(track) not in self._timers:
+                self._schedule_refresh(track)
+
+    async def get_stream(self, track) -> str:
+        """재생 직전에 호출합니다. 미리 받은 URL이 유효하면 바로 반환하고, 아니면 지금 받습니다."""
+        key = id(track)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer[1].cancel()
+        if self.is_fresh(track):
+            self.hits += 1
+            return track.stream_url
+        entry = self._tasks.pop(key, None)
+        if entry is not None and not entry[1].done():
+            self.waits += 1
+            try:
+                return await entry[1]
+            except Exception:
+                pass
+        self.misses += 1
+        return await self._resolve_into(track)
+
+    def cancel_all(self):
+        for _, task in self._tasks.values():
+            task.cancel()
+        for _, handle in self._timers.values():
+            handle.cancel()
+        self._tasks.clear()
+        self._timers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "미리 받은 URL 사용": self.hits,
+            "받는 중 대기": self.waits,
+            "재생 시점에 추출": self.misses,
+            "만료 전 재추출": self.refreshes,
+        }
@@ -0,0 +1,74 @@
+# baldheadbot/core/prefix.py
+
+from .config import ConfigFile
+
+DEFAULT_PREFIX = "!"
+
+
+class PrefixResolver:
+    """
+    메시지마다 호출되는 접두사 조회를 담당하는 클래스입니다.
+    config.json의 기본 접두사와 prefix.json의 서버별 접두사를 메모리에 들고 있다가,
+    파일이 바뀌었을 때만 다시 읽어 {서버 ID: 접두사} 딕셔너리를 재구성합니다. (조회는 O(1))
+    """
+    def __init__(self, config: ConfigFile, guild_prefix_file: ConfigFile):
+        self.config = config
+        self.guild_prefix_file = guild_prefix_file
+
+        self._default = DEFAULT_PREFIX
+        self._guild_prefixes = {}
+        self._versions = None
+
+    def _refresh(self):
+        """두 설정 파일 중 하나라도 다시 로드되었다면 내부 조회 테이블을 재구성합니다."""
+        config_data = self.config.data
+        guild_data = self.guild_prefix_file.data
+        versions = (self.config.version, self.guild_prefix_file.version)
+        if versions == self._versions:
+            return
+
+        prefix = config_data.get("prefix")
+        if not prefix:
+            print(f"Warning: config.json 파일에 'prefix' 설정이 없습니다. 기본 접두사 '{DEFAULT_PREFIX}'를 사용합니다.")
+            prefix = DEFAULT_PREFIX
+        self._default = prefix
+
+        # prefix.json은 {"서버 ID": "접두사"} 형태이며, 숫자가 아닌 키는 무시합니다.
+        self._guild_prefixes = {
+            int(guild_id): value
+            for guild_id, value in guild_data.items()
+            if str(guild_id).isdigit() and isinstance(value, str) and value
+        }
+        self._versions = versions
+
+    @property
+    def default(self) -> str:
+        """서버별 설정이 없을 때 사용하는 기본 접두사입니다."""
+        self._refresh()
+        return self._default
+
+    def get(self, guild_id: int = None) -> str:
+        """해당 서버의 접두사를 반환합니다. (DM이면 guild_id=None)"""
+        self._refresh()
+        if guild_id is not None:
+            prefix = self._guild_prefixes.get(guild_id)
+            if prefix:
+                return prefix
+        return self._default
+
+    def set_guild_prefix(self, guild_id: int, prefix: str = None):
+        """서버별 접두사를 설정하거나(prefix=None이면 삭제) prefix.json에 저장합니다."""
+        # 이 서버의 항목만 바꾸고, 다른 키(서버 ID가 아닌 설정 포함)는 그대로 남깁니다.
+        data = dict(self.guild_prefix_file.data)
+        if prefix:
+            data[str(guild_id)] = prefix
+        else:
+            data.pop(str(guild_id), None)
+        self.guild_prefix_file.save(data)
+        self._refresh()
+
+    def reload(self):
+        """두 설정 파일을 즉시 다시 읽어옵니다."""
+        self.config.reload()
+        self.guild_prefix_file.reload()
+        self._refresh()
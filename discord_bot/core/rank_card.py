@@ -0,0 +1,137 @@
+# baldheadbot/core/rank_card.py
+
+import io
+from collections import OrderedDict
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+# --- 카드 레이아웃 ---
+CARD_SIZE = (934, 350)
+CARD_RADIUS = 20
+BACKGROUND_COLORS = ((100, 180, 160), (80, 150, 90))
+
+AVATAR_SIZE = (210, 210)
+AVATAR_POSITION = (36, 60)
+
+BAR_X, BAR_Y, BAR_WIDTH, BAR_HEIGHT, BAR_RADIUS = 290, 280, 600, 30, 15
+BAR_COLORS = ((105, 190, 115), (180, 220, 130))
+
+TEXT_COLOR = (255, 255, 255)
+
+
+def gradient(size: tuple, start: tuple, end: tuple, horizontal: bool = False) -> Image.Image:
+    """
+    두 색 사이의 선형 그라데이션 이미지를 만듭니다.
+    Pillow의 linear_gradient 마스크를 크기에 맞게 늘린 뒤 composite 한 번으로 합성하므로
+    픽셀 줄마다 선을 그리는 방식보다 훨씬 빠릅니다.
+    """
+    mask = Image.linear_gradient("L")
+    if horizontal:
+        mask = mask.transpose(Image.Transpose.ROTATE_90)
+    mask = mask.resize(size, Image.Resampling.BILINEAR)
+    return Image.composite(Image.new("RGB", size, end), Image.new("RGB", size, start), mask)
+
+
+def rounded_mask(size: tuple, radius: int) -> Image.Image:
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, size[0], size[1]), radius=radius, fill=255)
+    return mask
+
+
+class RankCardRenderer:
+    """
+    레벨 카드를 그리는 클래스입니다.
+    폰트, 배경 템플릿, 진행 바 배경, 아바타 마스크처럼 사용자와 무관한 부분은 처음 한 번만 만들어 두고,
+    매 호출마다 아바타/텍스트/진행 바 채움처럼 사용자별로 달라지는 부분만 합성합니다.
+    """
+    FILL_CACHE_SIZE = 64
+
+    def __init__(self, bold_font_path: str, regular_font_path: str):
+        try:
+            self.name_font = ImageFont.truetype(bold_font_path, 120)
+            self.level_font = ImageFont.truetype(regular_font_path, 60)
+            self.exp_font = ImageFont.truetype(bold_font_path, 40)
+        except IOError:
+            self.name_font = self.level_font = self.exp_font = ImageFont.load_default()
+
+        # 배경: 세로 그라데이션 + 둥근 모서리
+        self.template = gradient(CARD_SIZE, *BACKGROUND_COLORS).convert("RGBA")
+        self.template.putalpha(rounded_mask(CARD_SIZE, CARD_RADIUS))
+
+        # 진행 바 배경: 텍스트 위에 덮어 그려지던 기존 순서를 유지하기 위해 별도 레이어로 보관
+        self.bar_layer = Image.new("RGBA", (BAR_WIDTH + 1, BAR_HEIGHT + 1), (0, 0, 0, 0))
+        ImageDraw.Draw(self.bar_layer).rounded_rectangle(
+            (0, 0, BAR_WIDTH, BAR_HEIGHT), radius=BAR_RADIUS, fill=(50, 80, 55), outline=(75, 99, 62), width=3
+        )
+
+        self.avatar_mask = Image.new("L", AVATAR_SIZE, 0)
+        ImageDraw.Draw(self.avatar_mask).ellipse((0, 0) + AVATAR_SIZE, fill=255)
+        self.blank_avatar = Image.new("RGBA", AVATAR_SIZE, (255, 255, 255, 0))
+
+        # 채움 너비(px) -> 둥근 모서리가 적용된 그라데이션 채움 이미지
+        self._fills = OrderedDict()
+
+    def prepare_avatar(self, avatar_bytes: bytes = None) -> Image.Image:
+        """아바타 이미지를 디코딩하여 카드에 바로 붙일 수 있는 210x210 원형 RGBA로 만듭니다."""
+        if not avatar_bytes:
+            return self.blank_avatar
+        avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA").resize(AVATAR_SIZE)
+        avatar.putalpha(ImageChops.multiply(avatar.getchannel("A"), self.avatar_mask))
+        return avatar
+
+    def _fill_image(self, width: int) -> Image.Image:
+        fill = self._fills.get(width)
+        if fill is None:
+            fill = gradient((width, BAR_HEIGHT), *BAR_COLORS, horizontal=True).convert("RGBA")
+            fill.putalpha(rounded_mask((width, BAR_HEIGHT), BAR_RADIUS))
+            ImageDraw.Draw(fill).rounded_rectangle((0, 0, width, BAR_HEIGHT), radius=BAR_RADIUS, outline=(50, 80, 55), width=2)
+            self._fills[width] = fill
+            while len(self._fills) > self.FILL_CACHE_SIZE:
+                self._fills.popitem(last=False)
+        else:
+            self._fills.move_to_end(width)
+        return fill
+
+    def render(self, avatar: Image.Image, display_name: str, level: int, exp: int, required_exp: int, rank: int) -> bytes:
+        """카드를 그려 PNG 바이트로 반환합니다. avatar는 prepare_avatar()의 결과입니다."""
+        card = self.template.copy()
+        card.alpha_composite(avatar, AVATAR_POSITION)
+
+        draw = ImageDraw.Draw(card)
+        draw.text((290, 0), display_name, font=self.name_font, fill=TEXT_COLOR)
+        draw.text((297, 155), f"Level {level}", font=self.level_font, fill=TEXT_COLOR)
+        draw.text((600, 155), f"Rank #{rank}", font=self.level_font, fill=TEXT_COLOR)
+        draw.text((295, 230), f"{exp} / {required_exp} EXP", font=self.exp_font, fill=TEXT_COLOR)
+
+        card.alpha_composite(self.bar_layer, (BAR_X, BAR_Y))
+        fill_width = min(int(BAR_WIDTH * exp / required_exp), BAR_WIDTH) if required_exp else 0
+        if fill_width > 1:
+            card.alpha_composite(self._fill_image(fill_width), (BAR_X, BAR_Y))
+
+        buffer = io.BytesIO()
+        # 압축 수준을 낮추면 파일은 조금 커지지만 인코딩 시간이 크게 줄어듭니다.
+        card.save(buffer, "PNG", compress_level=1)
+        return buffer.getvalue()
+
+
+# --- 프로세스 풀 작업자용 함수 ---
+# 작업자 프로세스마다 렌더러를 한 번만 만들어 두고, 이벤트 루프 쪽에서는 피클 가능한 값만 넘깁니다.
+_worker_renderer = None
+
+
+def init_worker(bold_font_path: str, regular_font_path: str):
+    """프로세스 풀의 initializer로 사용되어, 작업자 프로세스 안에서 폰트와 템플릿을 준비합니다."""
+    global _worker_renderer
+    _worker_renderer = RankCardRenderer(bold_font_path, regular_font_path)
+
+
+def render_rank_card(avatar_bytes, prepared_avatar, display_name: str, level: int, exp: int, required_exp: int, rank: int):
+    """
+    카드 PNG 바이트와 카드에 사용한 아바타의 RGBA 픽셀 바이트를 (png, prepared) 형태로 반환합니다.
+    prepared_avatar(이전에 반환된 픽셀 바이트)가 있으면 원본 디코딩과 리사이즈를 건너뜁니다.
+    """
+    if prepared_avatar:
+        avatar = Image.frombytes("RGBA", AVATAR_SIZE, prepared_avatar)
+    else:
+        avatar = _worker_renderer.prepare_avatar(avatar_bytes)
+        prepared_avatar = avatar.tobytes() if avatar_bytes else None
+    return _worker_renderer.render(avatar, display_name, level, exp, required_exp, rank), prepared_avatar
@@ -0,0 +1,153 @@
+# baldheadbot/core/rank_index.py
+
+from bisect import bisect_left, insort
+
+
+class RankIndex:
+    """
+    한 서버의 순위를 증분 방식으로 유지하는 정렬 인덱스입니다.
+
+    키는 (-level, -exp, user_id)이며, 키 목록을 최대 2*LOAD 크기의 정렬된 버킷들로 나누어 보관합니다.
+    버킷 길이는 펜윅 트리로 관리하므로, 순위 조회는 O(log n) 이분 탐색 + 버킷 앞 길이 합으로 계산되고
+    갱신은 버킷 하나 안에서의 삽입/삭제(작은 memmove)로 끝납니다. (sortedcontainers와 같은 구조)
+    """
+    LOAD = 512
+
+    def __init__(self, entries=()):
+        """entries: (user_id, level, exp) 반복 가능 객체. 이미 정렬되어 있지 않아도 됩니다."""
+        self._keys = {}
+        for user_id, level, exp in entries:
+            self._keys[user_id] = (-level, -exp, user_id)
+        self._build(sorted(self._keys.values()))
+
+    # --- 내부 구조 관리 ---
+    def _build(self, sorted_keys: list):
+        load = self.LOAD
+        self._buckets = [sorted_keys[i:i + load] for i in range(0, len(sorted_keys), load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._rebuild_tree()
+
+    def _rebuild_tree(self):
+        """버킷 길이에 대한 펜윅 트리를 다시 만듭니다. (버킷이 분할/삭제될 때만 호출, O(버킷 수))"""
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, index: int, delta: int):
+        i = index + 1
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, index: int) -> int:
+        """0..index-1번 버킷에 들어 있는 키의 총 개수입니다."""
+        total = 0
+        i = index
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position: int):
+        """0부터 시작하는 전체 위치를 (버킷 번호, 버킷 내 위치)로 바꿉니다."""
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree).bit_length() - 1)
+        while step:
+            nxt = index + step
+            if nxt < len(tree) and tree[nxt] <= position:
+                index = nxt
+                position -= tree[nxt]
+            step >>= 1
+        return index, position
+
+    def _insert(self, key: tuple):
+        if not self._buckets:
+            self._buckets = [[key]]
+            self._maxes = [key]
+            self._rebuild_tree()
+            return
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            half = len(bucket) // 2
+            self._buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def _remove(self, key: tuple):
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._rebuild_tree()
+
+    def _position(self, key: tuple) -> int:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return len(self._keys)
+        return self._prefix(i) + bisect_left(self._buckets[i], key)
+
+    # --- 공개 인터페이스 ---
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._keys
+
+    def update(self, user_id: int, level: int, exp: int):
+        """
+        사용자의 레벨/경험치를 반영하고 (이전 순위, 새 순위)를 반환합니다.
+        새로 추가된 사용자면 이전 순위는 None이고, 순위 키가 그대로면 None을 반환합니다.
+        """
+        key = (-level, -exp, user_id)
+        old_key = self._keys.get(user_id)
+        if old_key == key:
+            return None
+        old_rank = None
+        if old_key is not None:
+            old_rank = self._position(old_key) + 1
+            self._remove(old_key)
+        self._keys[user_id] = key
+        self._insert(key)
+        return old_rank, self._position(key) + 1
+
+    def remove(self, user_id: int):
+        key = self._keys.pop(user_id, None)
+        if key is not None:
+            self._remove(key)
+
+    def rank(self, user_id: int) -> int:
+        """1부터 시작하는 순위를 반환합니다. 인덱스에 없으면 -1입니다."""
+        key = self._keys.get(user_id)
+        if key is None:
+            return -1
+        return self._position(key) + 1
+
+    def page(self, offset: int = 0, limit: int = 10) -> list:
+        """offset 위치부터 순위 순서대로 [(user_id, level, exp), ...]를 최대 limit개 반환합니다."""
+        if offset >= len(self._keys) or limit <= 0:
+            return []
+        i, j = self._locate(max(offset, 0))
+        result = []
+        while i < len(self._buckets) and len(result) < limit:
+            for neg_level, neg_exp, user_id in self._buckets[i][j:j + limit - len(result)]:
+                result.append((user_id, -neg_level, -neg_exp))
+            i, j = i + 1, 0
+        return result
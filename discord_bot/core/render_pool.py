@@ -0,0 +1,114 @@
+# baldheadbot/core/render_pool.py
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core import render_worker
+
+
+class RenderQueueFull(Exception):
+    """렌더링 대기열이 가득 차서 요청을 받을 수 없을 때 발생하는 예외입니다."""
+    pass
+
+
+class RenderPool:
+    """
+    CPU를 많이 쓰는 이미지 렌더링을 이벤트 루프 밖의 프로세스 풀에서 실행하는 클래스입니다.
+
+    - 작업자 수(`max_workers`)만큼 동시에 실행하고, 그 외에는 `max_queue`개까지만 대기시킵니다.
+    - 대기열이 가득 차면 RenderQueueFull을 발생시켜 호출한 쪽이 사용자에게 알릴 수 있게 합니다.
+    - 대기열 길이, 대기 시간, 렌더링 시간을 통계로 제공합니다.
+    - 작업자에서 실행할 함수(`func`, `initializer`)는 core.render_worker처럼 봇/Cog 모듈을 불러오지 않는 모듈에 있어야 합니다.
+      (spawn 작업자는 실행 중인 스크립트도 __mp_main__으로 다시 불러오므로, bot.py는 시작 코드를 `__main__`에서만 실행합니다)
+    - 작업자 프로세스가 비정상 종료되어 풀이 망가지면 그 요청만 실패하고, 다음 요청 때 새 풀을 만듭니다.
+    """
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._initializer = initializer
+        self._initargs = initargs
+        self._executor = None
+
+        self.in_flight = 0
+        # --- 통계 ---
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.broken_pools = 0
+        self.max_queue_depth = 0
+        self.total_render_seconds = 0.0
+        self.max_render_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork는 이벤트 루프/스레드 상태까지 복제하므로, 깨끗한 프로세스를 띄우는 spawn을 사용합니다.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+                initargs=self._initargs,
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """작업자를 기다리고 있는 요청 수입니다."""
+        return max(0, self.in_flight - self.max_workers)
+
+    async def submit(self, func, *args):
+        """func(*args)를 작업자 프로세스에서 실행하고 결과를 반환합니다. 인자와 결과는 피클 가능해야 합니다."""
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise RenderQueueFull()
+
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = time.perf_counter()
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            result, render_seconds = await loop.run_in_executor(executor, render_worker.timed_call, func, *args)
+        except BrokenProcessPool:
+            # 작업자 하나가 죽으면(메모리 부족, Pillow 오류로 인한 강제 종료 등) 풀 전체를 더 쓸 수 없으므로 버리고,
+            # 다음 요청 때 새로 만듭니다. (그사이 이미 새 풀을 만들었다면 그대로 둡니다)
+            self.failed += 1
+            self.broken_pools += 1
+            if self._executor is executor:
+                self.shutdown()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        self.total_render_seconds += render_seconds
+        self.max_render_seconds = max(self.max_render_seconds, render_seconds)
+        self.total_wait_seconds += max(0.0, time.perf_counter() - started - render_seconds)
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "작업자 수": self.max_workers,
+            "처리 중": min(self.in_flight, self.max_workers),
+            "대기열": self.queue_depth,
+            "최대 대기열": self.max_queue_depth,
+            "완료": self.completed,
+            "실패": self.failed,
+            "거절(대기열 가득 참)": self.rejected,
+            "작업자 비정상 종료": self.broken_pools,
+            "평균 렌더링(ms)": round(self.total_render_seconds / done * 1000, 2),
+            "최대 렌더링(ms)": round(self.max_render_seconds * 1000, 2),
+            "평균 대기(ms)": round(self.total_wait_seconds / done * 1000, 2),
+        }
@@ -0,0 +1,19 @@
+# baldheadbot/core/render_worker.py
+"""
+RenderPool 작업자 프로세스의 진입점입니다.
+
+spawn 작업자는 피클된 함수를 찾기 위해 그 함수가 정의된 모듈을 불러오므로, 작업자에서 실행되는 함수는
+모두 이 모듈이나 core.rank_card에 두고 Cog/봇 모듈(bot.py, cogs.*)을 불러오지 않게 합니다.
+"""
+import time
+
+from core.rank_card import init_worker, render_rank_card
+
+__all__ = ["init_worker", "render_rank_card", "timed_call"]
+
+
+def timed_call(func, *args):
+    """작업자 프로세스 안에서 함수를 실행하고 (결과, 실행 시간)을 반환합니다."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
@@ -0,0 +1,62 @@
+# baldheadbot/core/search_cache.py
+
+from core.cache import LRUCache, SingleFlight
+from core.extractor import ExtractionCancelled
+
+
+def normalize_query(query: str) -> str:
+    """검색어를 캐시 키로 쓸 수 있게 대소문자와 공백을 정리합니다. ("  Lo-Fi   BEATS " -> "lo-fi beats")"""
+    return " ".join(query.casefold().split())
+
+
+class SearchCache:
+    """
+    검색 결과 캐시입니다. 정규화된 검색어를 키로, 선택 메뉴를 만드는 데 필요한 항목
+    (페이지 URL, 제목, 업로더, 길이, 썸네일)만 담은 목록을 짧은 시간 동안 보관합니다.
+
+    - 항목 수 LRU + TTL로 크기를 제한합니다. (검색 결과는 자주 바뀌므로 TTL을 짧게 둡니다)
+    - 같은 검색어를 동시에 검색하면 yt-dlp 검색은 한 번만 실행하고 결과를 나눠 받습니다.
+    - 결과가 없는 검색은 저장하지 않습니다.
+    """
+    def __init__(self, max_items: int = 256, ttl: float = 600.0):
+        self.results = LRUCache(max_items=max_items, ttl=ttl)
+        self._inflight = SingleFlight()
+        # --- 통계 ---
+        self.searches = 0
+
+    @staticmethod
+    def _entry(info: dict) -> dict:
+        return {
+            'webpage_url': info['webpage_url'],
+            'title': info.get('title', '이름 없는 항목'),
+            'uploader': info.get('uploader'),
+            'duration': info.get('duration'),
+            'thumbnail': info.get('thumbnail'),
+        }
+
+    async def search(self, query: str, search) -> tuple:
+        """
+        검색 결과 항목들을 반환합니다. 캐시에 없을 때만 `await search(정규화된 검색어)`
+        (yt-dlp 검색 결과 dict를 반환)로 검색합니다.
+        """
+        key = normalize_query(query)
+        entries = self.results.get(key)
+        if entries is not None:
+            return entries
+        # 다른 서버의 요청이 먼저 검색하다 취소되면, 그 취소를 받지 않고 이 요청의 서버로 다시 검색합니다.
+        return await self._inflight.run(key, self._search, key, search, retry_on=ExtractionCancelled)
+
+    async def _search(self, key: str, search) -> tuple:
+        self.searches += 1
+        info = await search(key)
+        entries = tuple(self._entry(entry) for entry in (info or {}).get('entries') or () if entry and entry.get('webpage_url'))
+        if entries:
+            self.results.put(key, entries, size=1)
+        return entries
+
+    def stats(self) -> dict:
+        stats = self.results.stats()
+        del stats["사용 중(KB)"]
+        stats["yt-dlp 검색"] = self.searches
+        stats["합쳐진 동시 요청"] = self._inflight.coalesced
+        return stats
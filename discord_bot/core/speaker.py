@@ -0,0 +1,314 @@
+# baldheadbot/core/speaker.py
+
+import asyncio
+import collections
+import re
+import time
+from dataclasses import dataclass, field, replace
+
+import discord
+
+# 문장 끝 문장부호 뒤의 공백 또는 줄바꿈에서 문장을 나눕니다.
+SENTENCE_END = re.compile(r'(?<=[.!?。！？…~])\s+|\n+')
+
+
+def split_sentences(text: str, max_chars: int = 200) -> list:
+    """
+    긴 메시지를 문장 단위의 조각으로 나눕니다.
+    첫 문장은 빨리 읽기 시작할 수 있게 그대로 두고, 이후 짧은 문장들은 `max_chars`자까지 이어 붙입니다.
+    한 문장이 `max_chars`자보다 길면 공백(없으면 글자 수)에서 자릅니다.
+    """
+    pieces = []
+    for sentence in SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks = pieces[:1]
+    for piece in pieces[1:]:
+        if len(chunks) > 1 and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] += " " + piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+@dataclass(slots=True)
+class Utterance:
+    """TTS로 읽을 메시지 하나입니다. created_at은 메시지를 받은 시각(perf_counter)입니다."""
+    text: str
+    lang: str
+    author_id: int
+    # 합성에 사용할 TTS 엔진 이름 (core.tts_engine)
+    engine: str = ""
+    created_at: float = field(default_factory=time.perf_counter)
+
+
+class SpeechStream(discord.AudioSource):
+    """
+    발화 하나를 이루는 여러 조각의 음성을 이어서 재생하는 AudioSource입니다.
+
+    이벤트 루프에서 조각을 PCM(48kHz, 16비트 스테레오)으로 디코딩해 `feed(pcm)`로 넣고, 모두 넣었으면 `finish()`를 호출합니다.
+    재생 스레드(음악과 함께 쓰는 믹서)는 메모리에 있는 PCM을 20ms씩 잘라 읽기만 하므로,
+    FFmpeg 실행이나 디코딩 때문에 다른 소리가 끊기지 않습니다.
+    다음 조각이 아직 준비되지 않았으면 끊기지 않도록 무음 프레임을 보냅니다.
+    """
+    FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+    SILENCE = b"\x00" * FRAME_SIZE
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        # 첫 조각이 들어왔거나 더 들어올 조각이 없으면 완료되는 Future
+        self.ready = self._loop.create_future()
+        # 재생 스레드가 조각 하나를 다 읽을 때마다 설정되는 신호 (wait_for_room에서 사용)
+        self._consumed = asyncio.Event()
+        self._chunks = collections.deque()
+        self._current = None
+        self._offset = 0
+        self._finished = False
+        self._closed = False
+        # --- 통계 ---
+        self.fed = 0
+        self.underruns = 0
+
+    @property
+    def buffered(self) -> int:
+        """아직 다 읽지 않은 조각 수입니다."""
+        return len(self._chunks) + (self._current is not None)
+
+    def feed(self, pcm: bytes):
+        if self._closed or not pcm:
+            return
+        self._chunks.append(pcm)
+        self.fed += 1
+        if not self.ready.done():
+            self.ready.set_result(None)
+
+    def finish(self):
+        self._finished = True
+        if not self.ready.done():
+            self.ready.set_result(None)
+
+    async def wait_for_room(self, limit: int):
+        """읽지 않은 조각이 `limit`개 미만이 될 때까지 기다립니다. (긴 메시지를 너무 앞서 디코딩해 두지 않도록)"""
+        while self.buffered >= limit and not self._closed:
+            self._consumed.clear()
+            await self._consumed.wait()
+
+    def read(self) -> bytes:
+        # 재생 스레드에서 20ms마다 호출됩니다.
+        while not self._closed:
+            if self._current is None:
+                # finish()는 마지막 feed() 뒤에 호출되므로, 순서를 지켜 먼저 확인합니다.
+                finished = self._finished
+                try:
+                    self._current = memoryview(self._chunks.popleft())
+                except IndexError:
+                    if finished:
+                        return b""
+                    self.underruns += 1
+                    return self.SILENCE
+                self._offset = 0
+            data = self._current[self._offset:self._offset + self.FRAME_SIZE]
+            self._offset += self.FRAME_SIZE
+            if self._offset >= len(self._current):
+                self._current = None
+                self._loop.call_soon_threadsafe(self._consumed.set)
+            if data:
+                # 조각의 마지막 프레임이 20ms보다 짧으면 무음으로 채웁니다.
+                return bytes(data) + self.SILENCE[len(data):]
+        return b""
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self):
+        self._closed = True
+        self._chunks.clear()
+        self._current = None
+        # AudioSource.__del__에서도 호출되므로, 이벤트 루프가 이미 닫혔으면 알리지 않습니다.
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._consumed.set)
+
+
+class GuildSpeaker:
+    """
+    서버 하나의 TTS 재생 대기열과 재생 작업을 담당하는 클래스입니다.
+
+    메시지는 asyncio.Queue에 쌓이고, 서버마다 하나씩 도는 작업이 차례대로 읽어 줍니다.
+    N번째 발화를 재생하는 동안 N+1번째 발화를 미리 합성하므로 발화 사이가 거의 끊기지 않습니다.
+    대기열이 `max_backlog`개를 넘으면 가장 오래된 발화부터 버립니다.
+
+    긴 메시지는 `chunk_chars`자 이하의 문장 조각으로 나누어 차례대로 합성하고, 하나의 SpeechStream으로 이어서 재생합니다.
+    첫 조각이 준비되는 즉시 재생을 시작하고, 나머지 조각은 재생하는 동안 한 조각씩 앞서 합성합니다.
+    (재생을 기다리는 조각이 `MAX_BUFFERED`개가 되면 하나를 다 읽을 때까지 다음 조각의 합성을 미룹니다)
+
+    `synthesize(utterance)`는 조각 하나를 합성해 재생할 PCM(48kHz, 16비트 스테레오, bytes)을 반환하는 코루틴 함수입니다.
+    """
+    # 재생을 기다리며 메모리에 둘 수 있는 조각 수
+    MAX_BUFFERED = 2
+
+    def __init__(self, bot, guild: discord.Guild, synthesize, max_backlog: int = 10, chunk_chars: int = 200):
+        self.bot = bot
+        self.guild = guild
+        self.synthesize = synthesize
+        self.chunk_chars = chunk_chars
+        self.queue = asyncio.Queue(maxsize=max_backlog)
+        self._task = None
+        # 재생 중인 발화가 끝나면 완료되는 Future
+        self._finished = None
+        # 재생 중이거나 재생을 기다리는 발화의 조각을 합성하는 Task
+        self._pending = set()
+        # --- 통계 ---
+        self.spoken = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.chunks = 0
+        self.underruns = 0
+
+    @property
+    def speaking(self) -> bool:
+        """지금 TTS를 재생하고 있는지 여부입니다."""
+        return self._finished is not None and not self._finished.done()
+
+    # --- 재생 작업 ---
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._speaker_loop(), name=f"tts-speaker-{self.guild.id}")
+
+    def destroy(self):
+        """재생 작업을 끝내고 대기 중인 발화를 버립니다."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def say(self, utterance: Utterance):
+        """발화를 대기열에 넣습니다. 가득 찼으면 가장 오래된 발화를 버립니다."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(utterance)
+        self.start()
+
+    def _prepare(self, utterance: Utterance):
+        """발화의 합성을 바로 시작합니다. 합성되는 조각은 반환하는 SpeechStream에 차례대로 들어갑니다."""
+        stream = SpeechStream()
+        task = asyncio.create_task(self._feed(utterance, stream))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return utterance, stream, task
+
+    def _synthesize_chunk(self, utterance: Utterance, text: str):
+        return asyncio.ensure_future(self.synthesize(replace(utterance, text=text)))
+
+    async def _feed(self, utterance: Utterance, stream: SpeechStream):
+        """조각을 하나씩 앞서 합성하며 스트림에 넣습니다. 조각 N을 기다리는 동안 조각 N+1의 합성이 진행됩니다."""
+        chunks = split_sentences(utterance.text, self.chunk_chars)
+        self.chunks += len(chunks)
+        upcoming = self._synthesize_chunk(utterance, chunks[0]) if chunks else None
+        try:
+            for i in range(len(chunks)):
+                synthesis = upcoming
+                if i + 1 < len(chunks):
+                    await stream.wait_for_room(self.MAX_BUFFERED)
+                    upcoming = self._synthesize_chunk(utterance, chunks[i + 1])
+                else:
+                    upcoming = None
+                try:
+                    stream.feed(await synthesis)
+                except Exception as e:
+                    self.failed += 1
+                    print(f"TTS 생성 중 오류 발생: {e}")
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+            stream.finish()
+
+    async def _speaker_loop(self):
+        upcoming = None
+        while True:
+            if upcoming is None:
+                upcoming = self._prepare(await self.queue.get())
+            utterance, stream, feeder = upcoming
+            upcoming = None
+            # 첫 조각이 합성될 때까지만 기다리고, 나머지는 재생하면서 합성합니다.
+            await stream.ready
+            if stream.fed == 0:
+                continue
+
+            finished = self._play(utterance, stream)
+            if finished is None:
+                feeder.cancel()
+                continue
+            # 재생하는 동안 다음 발화가 들어오면 바로 합성을 시작해 둡니다.
+            while not finished.done():
+                if upcoming is not None:
+                    await finished
+                    break
+                getter = asyncio.ensure_future(self.queue.get())
+                try:
+                    await asyncio.wait({getter, finished}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    if not getter.done():
+                        getter.cancel()
+                if getter.done() and not getter.cancelled():
+                    upcoming = self._prepare(getter.result())
+            feeder.cancel()
+            self.underruns += stream.underruns
+
+    def _play(self, utterance: Utterance, source: discord.AudioSource):
+        """재생을 시작하고 끝날 때 완료되는 Future를 반환합니다. 재생할 수 없으면 None입니다."""
+        vc = self.guild.voice_client
+        if not vc or not vc.is_connected():
+            source.cleanup()
+            self.skipped += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+
+        def after(error):
+            if error:
+                print(f"TTS 재생 중 오류 발생: {error}")
+            loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(None))
+
+        # 음악이 재생 중이어도 서버 믹서가 함께 섞어 주며, 읽는 동안에는 음악 볼륨을 줄입니다.
+        try:
+            self.bot.voice_mixer.get(self.guild).play("tts", source, after=after, ducks_others=True)
+        except discord.ClientException as e:
+            print(f"TTS 재생 중 오류 발생: {e}")
+            source.cleanup()
+            self.skipped += 1
+            return None
+        # 지연: 메시지를 받은 뒤 첫 조각의 재생을 시작할 때까지의 시간
+        latency = time.perf_counter() - utterance.created_at
+        self.spoken += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self._finished = finished
+        return finished
+
+    def stats(self) -> dict:
+        return {
+            "대기 중인 발화": self.queue.qsize(),
+            "재생": self.spoken,
+            "버림(대기열 가득 참)": self.dropped,
+            "건너뜀": self.skipped,
+            "합성 실패": self.failed,
+            "문장 조각": self.chunks,
+            "끊김(프레임)": self.underruns,
+        }
@@ -0,0 +1,37 @@
+# baldheadbot/core/track.py
+
+from dataclasses import dataclass
+
+import discord
+
+
+@dataclass(slots=True, eq=False)
+class Track:
+    """
+    대기열에 들어가는 곡 하나입니다.
+
+    채널/요청자 객체 대신 ID만 저장하고 필요할 때 서버 캐시에서 찾으므로,
+    큰 대기열이 Member/Channel 객체를 붙잡아 두지 않고 항목당 메모리도 dict보다 작습니다.
+    (eq=False: 같은 곡이 두 번 들어가도 서로 다른 항목으로 취급합니다.)
+    """
+    source: str
+    title: str
+    guild_id: int
+    channel_id: int
+    requester_id: int
+    is_live: bool = False
+    # StreamPrefetcher가 미리 받아 둔 스트림 URL과 만료 시각
+    stream_url: str | None = None
+    stream_expires_at: float | None = None
+
+    @classmethod
+    def from_context(cls, ctx, source: str, title: str) -> "Track":
+        return cls(source, title, ctx.guild.id, ctx.channel.id, ctx.author.id)
+
+    def channel(self, guild: discord.Guild):
+        """곡을 요청한 텍스트 채널(또는 스레드)입니다. 삭제되었으면 None입니다."""
+        return guild.get_channel_or_thread(self.channel_id)
+
+    def requester(self, guild: discord.Guild):
+        """곡을 요청한 멤버입니다. 서버를 나갔으면 None입니다."""
+        return guild.get_member(self.requester_id)
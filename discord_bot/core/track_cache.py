@@ -0,0 +1,157 @@
+# baldheadbot/core/track_cache.py
+
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlparse, urlunparse
+
+from core.cache import LRUCache, SingleFlight
+from core.extractor import ExtractionCancelled
+from core.level_store import atomic_write
+from core.prefetch import stream_url_expiry
+
+
+def canonical_url(url: str) -> str:
+    """
+    캐시 키로 쓸 정규화된 페이지 URL을 만듭니다.
+    스킴/호스트를 소문자로 맞추고 `www.`/`m.` 접두사, 쿼리, 프래그먼트, 끝의 `/`를 제거합니다.
+    (SoundCloud 트랙 URL의 ?si=, ?utm_source= 같은 공유용 파라미터가 달라도 같은 곡으로 봅니다.)
+    """
+    parsed = urlparse(url.strip())
+    if not parsed.scheme or not parsed.netloc:
+        return url.strip()
+    host = parsed.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return urlunparse(("https", host, parsed.path.rstrip("/"), "", "", ""))
+
+
+def is_url(text: str) -> bool:
+    return text.strip().startswith(("http://", "https://"))
+
+
+class TrackCache:
+    """
+    yt-dlp로 추출한 곡 정보 캐시입니다. 정규화된 페이지 URL을 키로
+    제목, 길이, 썸네일, 업로더와 스트림 URL(+ 만료 시각)을 보관합니다.
+
+    - 항목 수 LRU + TTL로 크기를 제한합니다. (스트림 URL은 자체 만료 시각으로 따로 판단)
+    - 같은 URL을 동시에 추출하려 하면 한 번만 추출합니다.
+    - `path`가 있으면 JSON으로 저장해 두었다가 재시작할 때 다시 읽습니다.
+    """
+    def __init__(self, path: str = None, max_items: int = 5000, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.entries = LRUCache(max_items=max_items, ttl=ttl)
+        self._inflight = SingleFlight()
+        self.dirty = False
+        # --- 통계 ---
+        self.extractions = 0
+
+    # --- 항목 생성 ---
+    @staticmethod
+    def _entry_from_info(info: dict, key: str) -> dict:
+        entry = {
+            'webpage_url': info.get('webpage_url') or key,
+            'title': info.get('title', 'Unknown Song'),
+            'duration': info.get('duration'),
+            'thumbnail': info.get('thumbnail'),
+            'uploader': info.get('uploader'),
+            'stream_url': None,
+            'stream_expires_at': None,
+            'cached_at': time.time(),
+        }
+        # process=False/extract_flat 결과의 'url'은 페이지 URL이므로, 포맷이 선택된 결과만 스트림으로 인정합니다.
+        if info.get('url') and (info.get('format_id') or info.get('requested_formats')):
+            entry['stream_url'] = info['url']
+            entry['stream_expires_at'] = stream_url_expiry(info['url'])
+        return entry
+
+    def put_info(self, info: dict, key: str = None) -> dict:
+        """yt-dlp 추출 결과(단일 곡)를 저장하고 저장된 항목을 반환합니다."""
+        key = canonical_url(info.get('webpage_url') or key)
+        entry = self._entry_from_info(info, key)
+        if entry['stream_url'] is None:
+            # 스트림이 없는 정보(검색 결과 등)로 기존 스트림 URL을 지우지 않습니다.
+            old = self.entries.pop(key)
+            if old is not None and old.get('stream_url'):
+                entry['stream_url'] = old['stream_url']
+                entry['stream_expires_at'] = old['stream_expires_at']
+        self.entries.put(key, entry, size=1)
+        self.dirty = True
+        return entry
+
+    def seed(self, info: dict):
+        """검색 결과처럼 메타데이터만 있는 정보를, 아직 캐시에 없을 때만 넣습니다."""
+        url = info.get('webpage_url')
+        if url and canonical_url(url) not in self.entries:
+            self.put_info(info)
+
+    # --- 조회 ---
+    def get(self, url: str):
+        return self.entries.get(canonical_url(url))
+
+    @staticmethod
+    def stream_is_fresh(entry: dict, margin: float = 0.0) -> bool:
+        expires_at = entry.get('stream_expires_at')
+        return bool(entry.get('stream_url')) and expires_at is not None and expires_at - time.time() > margin
+
+    async def resolve(self, url: str, extract, need_stream: bool = False, margin: float = 0.0) -> dict:
+        """
+        URL의 곡 정보를 반환합니다. 캐시에 없거나, need_stream인데 유효한 스트림 URL이 없을 때만
+        `await extract(url)`(yt-dlp 추출 결과 dict를 반환)로 추출합니다.
+        """
+        key = canonical_url(url)
+        entry = self.entries.get(key)
+        if entry is not None and (not need_stream or self.stream_is_fresh(entry, margin)):
+            return entry
+        # 다른 서버의 요청이 먼저 추출하다 취소되면, 그 취소를 받지 않고 이 요청의 서버로 다시 추출합니다.
+        return await self._inflight.run(key, self._extract, key, url, extract, retry_on=ExtractionCancelled)
+
+    async def _extract(self, key: str, url: str, extract) -> dict:
+        self.extractions += 1
+        info = await extract(url)
+        if info.get('entries'):
+            info = info['entries'][0]
+        entry = self.put_info(info, key)
+        # 페이지 URL이 리다이렉트 등으로 달라졌다면 요청한 URL로도 찾을 수 있게 합니다.
+        if canonical_url(entry['webpage_url']) != key:
+            self.entries.put(key, entry, size=1)
+        return entry
+
+    # --- 저장/불러오기 (블로킹 함수이므로 실행기에서 호출) ---
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"곡 정보 캐시를 불러오지 못했습니다: {e}")
+            return
+        now = time.time()
+        for key, entry in saved:
+            remaining = self.ttl - (now - entry.get('cached_at', 0))
+            if remaining > 0:
+                self.entries.put(key, entry, size=1, ttl=remaining)
+        self.dirty = False
+
+    def snapshot(self) -> bytes:
+        """현재 항목을 JSON 바이트로 만듭니다. 이벤트 루프에서 호출하고, 기록만 실행기에서 합니다."""
+        self.dirty = False
+        return json.dumps([[key, entry] for key, entry, _ in self.entries.items()], ensure_ascii=False).encode("utf-8")
+
+    async def save(self):
+        if not self.path or not self.dirty:
+            return
+        payload = self.snapshot()
+        await asyncio.get_running_loop().run_in_executor(None, atomic_write, self.path, payload)
+
+    def stats(self) -> dict:
+        stats = self.entries.stats()
+        del stats["사용 중(KB)"]
+        stats["yt-dlp 추출"] = self.extractions
+        stats["합쳐진 동시 요청"] = self._inflight.coalesced
+        return stats
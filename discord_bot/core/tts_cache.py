@@ -0,0 +1,141 @@
+# baldheadbot/core/tts_cache.py
+
+import asyncio
+import hashlib
+import os
+
+from core.cache import LRUCache, SingleFlight
+
+
+def normalize_text(text: str) -> str:
+    """TTS 캐시 키로 쓸 수 있게 앞뒤/연속 공백과 대소문자를 정리합니다. (읽는 소리가 같은 메시지는 같은 키)"""
+    return " ".join(text.casefold().split())
+
+
+class TTSCache:
+    """
+    합성된 음성(MP3 등) 캐시입니다. (엔진, 언어, 정규화된 텍스트)를 키로 합니다.
+
+    - 메모리: 전체 바이트 수로 제한하는 LRU
+    - 디스크(선택): `disk_dir`에 같은 내용을 파일로 보관하고, `disk_max_bytes`를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+      재시작 후에도 자주 쓰는 문구를 다시 합성하지 않습니다.
+    - `max_text`자보다 긴 메시지는 다시 나올 가능성이 낮으므로 저장하지 않습니다.
+    - 같은 문구를 동시에 합성하려 하면 한 번만 합성합니다.
+    """
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, disk_dir: str = None, disk_max_bytes: int = 128 * 1024 * 1024, max_text: int = 50):
+        self.max_text = max_text
+        self.memory = LRUCache(max_bytes=max_bytes)
+        self.disk_dir = disk_dir
+        self.disk = None
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            # 파일 경로 -> 파일 경로
+            self.disk = LRUCache(max_bytes=disk_max_bytes, on_evict=self._remove)
+        self._inflight = SingleFlight()
+        # --- 통계 ---
+        self.disk_hits = 0
+        self.syntheses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def key(text: str, lang: str, engine: str = "") -> str:
+        return f"{engine}:{lang}:{normalize_text(text)}"
+
+    # --- 디스크 계층 ---
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _remove(self, key: str, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def load(self):
+        """디스크에 남아 있는 파일을 마지막 사용 순서대로 다시 등록합니다. (블로킹 함수이므로 실행기에서 호출)"""
+        if self.disk is None:
+            return
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                self._remove(None, entry.path)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(files):
+            self.disk.put(path, path, size=size)
+
+    def _read_disk(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            # 마지막 사용 시각을 기록해 두어 재시작 후에도 LRU 순서가 유지되게 합니다.
+            os.utime(path)
+            return audio
+        except OSError:
+            return None
+
+    def _write_disk(self, path: str, audio: bytes):
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(audio)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"TTS 캐시 디스크 기록 실패: {e}")
+
+    # --- 조회 ---
+    async def get(self, text: str, lang: str, synthesize, engine: str = "") -> bytes:
+        """
+        문구의 음성 데이터를 반환합니다. 메모리와 디스크에 모두 없을 때만 `await synthesize()`로 합성합니다.
+        max_text자보다 긴 문구는 캐시를 거치지 않고 바로 합성합니다.
+        """
+        if len(text) > self.max_text:
+            self.syntheses += 1
+            return await synthesize()
+        key = self.key(text, lang, engine)
+        audio = self.memory.get(key)
+        if audio is not None:
+            self.bytes_saved += len(audio)
+            return audio
+        return await self._inflight.run(key, self._load, key, synthesize)
+
+    async def _load(self, key: str, synthesize) -> bytes:
+        loop = asyncio.get_running_loop()
+        if self.disk is not None:
+            path = self._path(key)
+            if self.disk.get(path) is not None:
+                audio = await loop.run_in_executor(None, self._read_disk, path)
+                if audio is not None:
+                    self.disk_hits += 1
+                    self.bytes_saved += len(audio)
+                    self.memory.put(key, audio)
+                    return audio
+                self.disk.pop(path)
+
+        self.syntheses += 1
+        audio = await synthesize()
+        self.memory.put(key, audio)
+        if self.disk is not None:
+            path = self._path(key)
+            await loop.run_in_executor(None, self._write_disk, path, audio)
+            self.disk.put(path, path, size=len(audio))
+            if path not in self.disk:
+                # 디스크 캐시 전체 크기보다 큰 파일은 보관하지 않습니다.
+                self._remove(path, path)
+        return audio
+
+    def stats(self) -> dict:
+        lookups = self.memory.hits + self.memory.misses
+        hits = self.memory.hits + self.disk_hits
+        return {
+            "메모리 항목 수": len(self.memory),
+            "메모리 사용(KB)": round(self.memory.bytes / 1024, 1),
+            "디스크 사용(KB)": round(self.disk.bytes / 1024, 1) if self.disk is not None else 0.0,
+            "메모리 적중": self.memory.hits,
+            "디스크 적중": self.disk_hits,
+            "합성": self.syntheses,
+            "적중률(%)": round(hits / lookups * 100, 1) if lookups else 0.0,
+            "절약한 바이트(KB)": round(self.bytes_saved / 1024, 1),
+        }
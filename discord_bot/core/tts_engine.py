@@ -0,0 +1,103 @@
+# baldheadbot/core/tts_engine.py
+
+import asyncio
+import functools
+import io
+import shutil
+import wave
+from abc import ABC, abstractmethod
+
+from gtts import gTTS
+
+
+class TTSEngine(ABC):
+    """
+    텍스트를 음성 데이터로 바꾸는 TTS 엔진의 기본 클래스입니다.
+    `synthesize(text, lang)`는 FFmpeg가 읽을 수 있는 음성 파일(MP3, WAV 등)의 bytes를 반환하는 코루틴입니다.
+    """
+    name = ""
+    # 명령어에 표시할 이름
+    label = ""
+
+    def available(self) -> bool:
+        """이 환경에서 사용할 수 있는 엔진인지 여부입니다."""
+        return True
+
+    @abstractmethod
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        """text를 lang 언어로 읽은 음성 파일의 bytes를 반환합니다."""
+
+
+class GTTSEngine(TTSEngine):
+    """Google 번역 TTS(gTTS)를 사용합니다. 음질은 좋지만 합성할 때마다 네트워크 요청이 필요합니다. (MP3)"""
+    name = "gtts"
+    label = "Google TTS"
+
+    def _synthesize(self, text: str, lang: str) -> bytes:
+        fp = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(fp)
+        return fp.getvalue()
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        # gTTS 실행은 동기 함수이므로, run_in_executor로 비동기 처리
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self._synthesize, text, lang))
+
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng를 하위 프로세스로 실행하는 오프라인 엔진입니다. 네트워크 없이 빠르게 합성합니다. (WAV)"""
+    name = "espeak"
+    label = "eSpeak NG (오프라인)"
+
+    def __init__(self, executable: str = None):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self.executable is not None
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        if not self.executable:
+            raise RuntimeError("espeak-ng를 찾을 수 없습니다.")
+        process = await asyncio.create_subprocess_exec(
+            self.executable, "--stdout", "--stdin", "-v", lang,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        audio, stderr = await process.communicate(text.encode("utf-8"))
+        if process.returncode != 0:
+            raise RuntimeError(f"espeak-ng 실행 실패: {stderr.decode(errors='replace').strip()}")
+        return audio
+
+
+class FakeEngine(TTSEngine):
+    """
+    테스트와 벤치마크용 엔진입니다. `delay`초(와 글자당 `delay_per_char`초) 기다린 뒤
+    글자당 `seconds_per_char`초 길이의 무음 WAV를 반환하고, 받은 요청을 `calls`에 기록합니다.
+    """
+    name = "fake"
+    label = "테스트용"
+
+    def __init__(self, delay: float = 0.0, seconds_per_char: float = 0.05, sample_rate: int = 22050, delay_per_char: float = 0.0):
+        self.delay = delay
+        self.delay_per_char = delay_per_char
+        self.seconds_per_char = seconds_per_char
+        self.sample_rate = sample_rate
+        self.calls = []
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        self.calls.append((text, lang))
+        delay = self.delay + self.delay_per_char * len(text)
+        if delay:
+            await asyncio.sleep(delay)
+        frames = max(1, int(len(text) * self.seconds_per_char * self.sample_rate))
+        fp = io.BytesIO()
+        with wave.open(fp, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\x00\x00" * frames)
+        return fp.getvalue()
+
+
+# 서버별로 선택할 수 있는 엔진 (FakeEngine은 테스트용이므로 포함하지 않음)
+ENGINES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine)}
+DEFAULT_ENGINE = GTTSEngine.name
@@ -0,0 +1,154 @@
+# baldheadbot/tests/conftest.py
+"""
+테스트 공용 설정입니다. discord_bot 디렉토리를 경로에 추가하고(봇과 같은 방식으로 core.* 임포트),
+실제 음성 연결과 FFmpeg 없이 TTS 재생 경로를 돌려 볼 수 있는 가짜 객체를 제공합니다.
+"""
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+import types
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'discord_bot'))
+
+import discord
+import numpy as np
+
+from core.mixer import VoiceMixerManager
+from core.speaker import GuildSpeaker, Utterance
+
+
+class FakeVoiceClient:
+    """
+    discord.VoiceClient 대신 쓰는 가짜 음성 연결입니다.
+    discord.py의 AudioPlayer처럼 별도 스레드에서 소스를 읽고, 끝나면 cleanup()과 after(error)를 호출합니다.
+    읽은 프레임은 `frames`에 쌓입니다. (20ms를 기다리지 않고 1ms마다 읽어 테스트를 빠르게 끝냅니다)
+    """
+    FRAME_INTERVAL = 0.001
+
+    def __init__(self):
+        self.frames = []
+        self._thread = None
+        self._end = threading.Event()
+        self._resumed = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def play(self, source, *, after=None):
+        if self.is_playing() or self.is_paused():
+            raise discord.ClientException("Already playing audio.")
+        self._end = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread = threading.Thread(target=self._run, args=(source, after, self._end, self._resumed), daemon=True)
+        self._thread.start()
+
+    def _run(self, source, after, end, resumed):
+        error = None
+        try:
+            while not end.is_set():
+                if not resumed.is_set():
+                    resumed.wait()
+                    continue
+                data = source.read()
+                if not data:
+                    break
+                self.frames.append(data)
+                time.sleep(self.FRAME_INTERVAL)
+        except Exception as e:
+            error = e
+        finally:
+            end.set()
+            source.cleanup()
+            if after:
+                after(error)
+
+    def is_playing(self) -> bool:
+        return self._thread is not None and self._resumed.is_set() and not self._end.is_set()
+
+    def is_paused(self) -> bool:
+        return self._thread is not None and not self._resumed.is_set() and not self._end.is_set()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def stop(self):
+        self._end.set()
+        self._resumed.set()
+
+
+def wav_to_pcm(audio: bytes) -> bytes:
+    """FakeEngine의 WAV(16비트 모노)를 재생용 48kHz 스테레오 PCM으로 바꿉니다. (TTS Cog의 FFmpeg 디코딩 대신)"""
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        assert wav.getframerate() == 48000 and wav.getsampwidth() == 2 and wav.getnchannels() == 1
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    return np.repeat(samples, 2).tobytes()
+
+
+@pytest.fixture
+def voice():
+    """가짜 음성 연결이 붙은 (bot, guild)를 반환합니다. bot.loop는 make_speaker()를 호출할 때 채워집니다."""
+    bot = types.SimpleNamespace(loop=None)
+    bot.voice_mixer = VoiceMixerManager(bot)
+    guild = types.SimpleNamespace(id=1, voice_client=FakeVoiceClient())
+    return bot, guild
+
+
+@pytest.fixture
+def make_speaker(voice):
+    """engine으로 합성하는 GuildSpeaker를 만드는 함수를 반환합니다. 이벤트 루프 안에서 호출해야 합니다."""
+    bot, guild = voice
+
+    def factory(engine, **kwargs) -> GuildSpeaker:
+        bot.loop = asyncio.get_running_loop()
+
+        async def synthesize(utterance):
+            return wav_to_pcm(await engine.synthesize(utterance.text, utterance.lang))
+        speaker = GuildSpeaker(bot, guild, synthesize, **kwargs)
+        # 재생을 시작한 (발화, SpeechStream)을 차례대로 기록합니다.
+        speaker.played = []
+        play = speaker._play
+
+        def record(utterance, source):
+            speaker.played.append((utterance, source))
+            return play(utterance, source)
+        speaker._play = record
+        return speaker
+    return factory
+
+
+@pytest.fixture
+def speak(wait_until):
+    """
+    발화를 차례대로 넣고, `played`개의 발화가 재생을 마치고 합성 작업도 모두 끝날 때까지 기다린 뒤
+    재생 작업을 정리하는 코루틴 함수를 반환합니다.
+    """
+    async def run(speaker: GuildSpeaker, texts, played: int):
+        for text in texts:
+            speaker.say(Utterance(text, "ko", author_id=1))
+        await wait_until(lambda: (
+            len(speaker.played) == played and not speaker.speaking and not speaker._pending and speaker.queue.empty()
+        ))
+        speaker.destroy()
+    return run
+
+
+@pytest.fixture
+def wait_until():
+    """조건이 참이 될 때까지(최대 timeout초) 이벤트 루프를 돌리며 기다리는 코루틴 함수를 반환합니다."""
+    async def wait(condition, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                raise AssertionError("조건을 기다리다 시간이 초과되었습니다.")
+            await asyncio.sleep(0.002)
+    return wait
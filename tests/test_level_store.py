@@ -0,0 +1,91 @@
+# baldheadbot/tests/test_level_store.py
+"""레벨 저장소(JSON/SQLite)의 순위 쿼리(rank_of/count/top)와 지연 저장 테스트입니다."""
+import asyncio
+import random
+
+import pytest
+
+from core.level_store import SqliteLevelStore, create_level_store, rank_key
+
+
+def fill(store, guild_id: int, users: dict):
+    async def main():
+        for user_id, (level, exp) in users.items():
+            data = await store.get_user(guild_id, user_id)
+            data["level"], data["exp"] = level, exp
+            store.mark_dirty(guild_id, user_id, data)
+    return main()
+
+
+def random_users(seed: int, count: int = 60) -> dict:
+    rng = random.Random(seed)
+    # 동점(같은 레벨/경험치)이 자주 나오도록 값의 범위를 좁게 잡습니다.
+    return {rng.randrange(1, 10**6): (rng.randint(1, 4), rng.randint(0, 3)) for _ in range(count)}
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_rank_queries_match_sorted_order(tmp_path, backend):
+    users = random_users(backend == "sqlite")
+    expected = sorted(users, key=lambda uid: rank_key(uid, {"level": users[uid][0], "exp": users[uid][1]}))
+
+    async def main():
+        store = create_level_store(backend, str(tmp_path), flush_interval=999)
+        await store.load()
+        await fill(store, 1, users)
+        await fill(store, 2, {1: (99, 0)})
+        ranks = {uid: await store.rank_of(1, uid) for uid in users}
+        count = await store.count(1)
+        pages = [await store.top(1, offset, 7) for offset in range(0, len(users), 7)]
+        missing = await store.rank_of(1, 0, create=False)
+        await store.close()
+        return ranks, count, pages, missing
+
+    ranks, count, pages, missing = asyncio.run(main())
+    assert ranks == {uid: expected.index(uid) + 1 for uid in users}
+    assert count == len(users)
+    assert [uid for page in pages for uid, _ in page] == expected
+    assert all((data["level"], data["exp"]) == users[uid] for page in pages for uid, data in page)
+    assert missing == -1
+
+
+def test_sqlite_rank_of_new_user_counts_default_data(tmp_path):
+    async def main():
+        store = SqliteLevelStore(str(tmp_path / "levels.db"), flush_interval=999)
+        await store.load()
+        await fill(store, 1, {10: (2, 0), 11: (1, 5)})
+        rank = await store.rank_of(1, 12)
+        await store.close()
+        return rank
+
+    # 기본 데이터(레벨 1, 경험치 0)는 두 사용자보다 뒤입니다.
+    assert asyncio.run(main()) == 3
+
+
+def test_sqlite_dirty_rows_survive_cache_eviction(tmp_path):
+    path = str(tmp_path / "levels.db")
+
+    async def main():
+        store = SqliteLevelStore(path, cache_size=2, flush_interval=999)
+        await store.load()
+        await fill(store, 1, {uid: (uid, uid * 10) for uid in range(1, 6)})
+        await store.close()
+
+        reopened = SqliteLevelStore(path, flush_interval=999)
+        await reopened.load()
+        rows = await reopened.top(1, 0, 10)
+        await reopened.close()
+        return rows
+
+    rows = asyncio.run(main())
+    assert [(uid, data["level"], data["exp"]) for uid, data in rows] == [(uid, uid, uid * 10) for uid in range(5, 0, -1)]
+
+
+def test_incomplete_store_cannot_be_created():
+    from core.level_store import LevelStore
+
+    class PartialStore(LevelStore):
+        async def load(self):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialStore()
@@ -0,0 +1,256 @@
+# baldheadbot/tests/test_mixer.py
+"""
+VoiceMixer가 고정된 PCM 프레임을 섞는 방식(합산/잘라내기, 덕킹 볼륨 변화, Opus 그대로 보내기, PCM 전환 요청)과
+채널 종료/정지/일시정지/닫기 처리 테스트입니다. 재생 스레드 없이 테스트에서 프레임을 직접 읽습니다.
+"""
+from types import SimpleNamespace
+
+import discord
+import numpy as np
+import pytest
+
+from core.mixer import FRAME_SIZE, SILENCE, VoiceMixer
+
+SAMPLES = FRAME_SIZE // 2
+
+
+class ManualVoiceClient:
+    """재생 스레드 없이 소스만 붙잡아 두는 가짜 음성 연결입니다. 프레임은 테스트가 `read()`로 직접 읽습니다."""
+    def __init__(self):
+        self.source = None
+        self.paused = False
+
+    def is_connected(self) -> bool:
+        return True
+
+    def play(self, source, *, after=None):
+        self.source = source
+        self.paused = False
+
+    def is_playing(self) -> bool:
+        return self.source is not None and not self.paused
+
+    def is_paused(self) -> bool:
+        return self.source is not None and self.paused
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def stop(self):
+        # discord.py처럼 재생을 멈추면 소스를 정리합니다.
+        source, self.source = self.source, None
+        if source is not None:
+            source.cleanup()
+
+    def read(self):
+        data = self.source.read()
+        if not data:
+            self.stop()
+        return data
+
+
+class FrameSource(discord.AudioSource):
+    """정해진 프레임들을 차례로 돌려주는 소스입니다."""
+    def __init__(self, frames, opus: bool = False):
+        self.frames = list(frames)
+        self.opus = opus
+        self.cleaned = False
+
+    def read(self) -> bytes:
+        return self.frames.pop(0) if self.frames else b""
+
+    def is_opus(self) -> bool:
+        return self.opus
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+def pcm(*values) -> bytes:
+    """샘플 값들을 반복해 채운 16비트 스테레오 PCM 프레임입니다."""
+    return np.resize(np.array(values, dtype=np.int16), SAMPLES).tobytes()
+
+
+def samples(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.int16)
+
+
+@pytest.fixture
+def mixer():
+    scheduled = []
+    bot = SimpleNamespace(loop=SimpleNamespace(call_soon_threadsafe=scheduled.append))
+    guild = SimpleNamespace(id=1, voice_client=ManualVoiceClient())
+    mixer = VoiceMixer(bot, guild, duck_volume=0.3)
+    mixer.scheduled = scheduled
+    return mixer
+
+
+def read(mixer) -> bytes:
+    return mixer.guild.voice_client.read()
+
+
+# --- 섞기 ---
+def test_single_pcm_channel_is_passed_through(mixer):
+    frame = pcm(1, -2, 3)
+    mixer.play("music", FrameSource([frame]))
+    assert read(mixer) == frame
+    assert mixer.single_frames == 1 and mixer.mixed_frames == 0
+
+
+def test_channels_are_summed_and_clipped(mixer):
+    mixer.play("a", FrameSource([pcm(1000, 20000, -20000)]))
+    mixer.play("b", FrameSource([pcm(-300, 20000, -20000)]))
+    mixed = samples(read(mixer))
+    assert list(mixed[:3]) == [700, 32767, -32768]
+    assert mixer.mixed_frames == 1
+
+
+def test_short_frame_is_padded_with_silence_when_mixed(mixer):
+    mixer.play("a", FrameSource([pcm(100)]))
+    mixer.play("b", FrameSource([pcm(50)[:FRAME_SIZE // 2]]))
+    mixed = samples(read(mixer))
+    assert len(mixed) == SAMPLES
+    assert set(mixed[:SAMPLES // 2]) == {150} and set(mixed[SAMPLES // 2:]) == {100}
+
+
+# --- 덕킹 ---
+def test_ducking_ramps_down_and_back_up(mixer):
+    mixer.play("music", FrameSource([pcm(10000)] * 20))
+    mixer.play("tts", FrameSource([pcm(0)] * 10), ducks_others=True)
+    channel = mixer._channels["music"]
+    ramp = np.repeat(np.arange(SAMPLES // 2, dtype=np.float32) / (SAMPLES // 2), 2)
+
+    # 한 프레임 안에서 볼륨이 이전 값에서 DUCK_STEP만큼 직선으로 줄어듭니다.
+    first = samples(read(mixer))
+    np.testing.assert_allclose(first, 10000 * (1.0 - 0.1 * ramp), atol=1)
+    assert first[0] == 10000 and first[-1] < first[0]
+    assert channel.gain == pytest.approx(0.9)
+
+    gains = [channel.gain]
+    for _ in range(9):
+        last = samples(read(mixer))
+        gains.append(channel.gain)
+    # 0.1씩 줄어 duck_volume(0.3)에서 멈춥니다.
+    assert gains == pytest.approx([0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.3, 0.3, 0.3])
+    np.testing.assert_allclose(last, 3000, atol=1)
+
+    # TTS가 끝나면 다시 0.1씩 원래 볼륨으로 돌아갑니다.
+    for _ in range(7):
+        read(mixer)
+    assert channel.gain == pytest.approx(1.0)
+    assert "tts" not in mixer._channels
+
+
+def test_ducking_channel_itself_is_not_ducked(mixer):
+    mixer.play("music", FrameSource([pcm(0)] * 3))
+    mixer.play("tts", FrameSource([pcm(5000)] * 3), ducks_others=True)
+    assert set(samples(read(mixer))) == {5000}
+    assert mixer._channels["tts"].gain == 1.0
+
+
+# --- Opus ---
+def test_single_opus_channel_is_sent_as_is(mixer):
+    mixer.play("music", FrameSource([b"opus-1", b"opus-2"], opus=True), on_mix=lambda: None)
+    vc = mixer.guild.voice_client
+    assert read(mixer) == b"opus-1" and vc.source.is_opus()
+    assert read(mixer) == b"opus-2"
+    assert mixer.passthrough_frames == 2 and mixer.scheduled == []
+
+
+def test_opus_channel_requests_pcm_once_when_mixing(mixer):
+    requests = []
+    music = FrameSource([b"opus"] * 5, opus=True)
+    mixer.play("music", music, on_mix=lambda: requests.append(1))
+    assert read(mixer) == b"opus"
+
+    speech = pcm(1234)
+    mixer.play("tts", FrameSource([speech] * 3), ducks_others=True)
+    # Opus 채널은 바뀔 때까지 건너뛰고 TTS만 보냅니다. 요청은 한 번만 이벤트 루프로 넘깁니다.
+    assert read(mixer) == speech and not mixer.guild.voice_client.source.is_opus()
+    assert read(mixer) == speech
+    assert mixer.pcm_requests == 1 and len(mixer.scheduled) == 1
+    mixer.scheduled[0]()
+    assert requests == [1]
+
+    # PCM 소스로 바뀌면 이전 Opus 소스는 다음 프레임을 읽을 때 정리되고 함께 섞입니다.
+    assert mixer.replace("music", FrameSource([pcm(10000)] * 3))
+    mixed = samples(read(mixer))
+    assert music.cleaned
+    assert mixed[0] == 10000 + 1234 and mixed[-1] < mixed[0]
+
+
+# --- 채널 종료/정지 ---
+def test_finished_channels_call_after_and_end_the_mixer(mixer):
+    finished = []
+    a = FrameSource([pcm(1)])
+    b = FrameSource([pcm(2)] * 2)
+    mixer.play("a", a, after=lambda error: finished.append(("a", error)))
+    mixer.play("b", b, after=lambda error: finished.append(("b", error)))
+    assert set(samples(read(mixer))) == {3}
+    assert read(mixer) == pcm(2)
+    assert finished == [("a", None)] and a.cleaned
+    assert read(mixer) == b""
+    assert finished == [("a", None), ("b", None)] and b.cleaned
+    assert mixer._source is None and mixer.guild.voice_client.source is None
+
+
+def test_read_error_finishes_only_that_channel(mixer):
+    errors = []
+
+    class BrokenSource(FrameSource):
+        def read(self):
+            raise OSError("끊김")
+
+    mixer.play("a", BrokenSource([]), after=errors.append)
+    mixer.play("b", FrameSource([pcm(7)]))
+    assert read(mixer) == pcm(7)
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+
+
+def test_stop_closes_the_channel_before_the_next_frame(mixer):
+    finished = []
+    music = FrameSource([pcm(1)] * 5)
+    mixer.play("music", music, after=finished.append)
+    mixer.play("tts", FrameSource([pcm(2)] * 5))
+    read(mixer)
+    mixer.stop("music")
+    # 재생 스레드가 읽는 중일 수 있으므로 바로 정리하지 않고 다음 프레임을 읽을 때 정리합니다.
+    assert not music.cleaned and finished == []
+    assert read(mixer) == pcm(2)
+    assert music.cleaned and finished == [None]
+    assert not mixer.is_playing("music")
+
+
+def test_paused_channels_are_skipped_and_pause_the_connection(mixer):
+    vc = mixer.guild.voice_client
+    mixer.play("music", FrameSource([pcm(1)] * 5))
+    mixer.play("tts", FrameSource([pcm(2)] * 5))
+    mixer.pause("music")
+    assert mixer.is_paused("music") and mixer.has_other_playing("music")
+    assert read(mixer) == pcm(2)
+    mixer.pause("tts")
+    assert vc.is_paused() and not mixer.has_other_playing("music")
+    assert read(mixer) == SILENCE
+    mixer.resume("music")
+    assert vc.is_playing() and read(mixer) == pcm(1)
+
+
+def test_close_cleans_up_every_channel(mixer):
+    finished = []
+    sources = [FrameSource([pcm(1)] * 5), FrameSource([pcm(2)] * 5)]
+    mixer.play("music", sources[0], after=finished.append)
+    mixer.play("tts", sources[1], after=finished.append)
+    read(mixer)
+    mixer.close()
+    assert all(source.cleaned for source in sources) and finished == [None, None]
+    assert mixer._source is None and mixer.guild.voice_client.source is None
+    assert not mixer.is_playing("music") and not mixer.is_playing("tts")
+
+
+def test_playing_the_same_channel_twice_is_rejected(mixer):
+    mixer.play("music", FrameSource([pcm(1)]))
+    with pytest.raises(discord.ClientException):
+        mixer.play("music", FrameSource([pcm(1)]))
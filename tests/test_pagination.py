@@ -0,0 +1,134 @@
+# baldheadbot/tests/test_pagination.py
+"""PageView(이전/다음 버튼 페이지 넘기기)의 페이지 범위, 버튼 상태, 사용자 제한 테스트입니다."""
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from core.pagination import PageView
+
+
+class FakeResponse:
+    def __init__(self):
+        self.edited = []
+        self.sent = []
+
+    async def edit_message(self, *, embed, view):
+        self.edited.append(embed)
+
+    async def send_message(self, content, *, ephemeral=False):
+        self.sent.append((content, ephemeral))
+
+
+def interaction(user_id: int):
+    return SimpleNamespace(user=SimpleNamespace(id=user_id), response=FakeResponse())
+
+
+def renderer(items: list, per_page: int = 2):
+    """items를 per_page개씩 나눈 페이지를 그리고, 요청받은 페이지 번호를 기록하는 render_page입니다."""
+    rendered = []
+
+    async def render_page(page: int):
+        rendered.append(page)
+        page_count = max(1, -(-len(items) // per_page))
+        embed = discord.Embed(description=",".join(items[page * per_page:(page + 1) * per_page]))
+        return embed, page_count
+    return render_page, rendered
+
+
+def test_buttons_follow_the_current_page():
+    render_page, rendered = renderer(["a", "b", "c", "d", "e"])
+
+    async def main():
+        view = PageView(author_id=1, render_page=render_page)
+        embed = await view.render()
+        states = [(embed.description, view.previous_page.disabled, view.next_page.disabled)]
+        for _ in range(3):
+            click = interaction(1)
+            await view.next_page.callback(click)
+            embed = click.response.edited[0]
+            states.append((embed.description, view.previous_page.disabled, view.next_page.disabled))
+        click = interaction(1)
+        await view.previous_page.callback(click)
+        states.append((click.response.edited[0].description, view.previous_page.disabled, view.next_page.disabled))
+        view.stop()
+        return states, view.page
+
+    states, page = asyncio.run(main())
+    assert states == [
+        ("a,b", True, False),
+        ("c,d", False, False),
+        ("e", False, True),
+        # 마지막 페이지에서 다음을 누르면 마지막 페이지에 머무릅니다.
+        ("e", False, True),
+        ("c,d", False, False),
+    ]
+    assert page == 1
+    # 버튼을 누를 때마다 해당 페이지 하나만 그립니다.
+    assert rendered == [0, 1, 2, 3, 2, 1]
+
+
+def test_page_is_clamped_when_the_list_shrinks():
+    items = ["a", "b", "c", "d", "e"]
+    render_page, rendered = renderer(items)
+
+    async def main():
+        view = PageView(author_id=1, render_page=render_page, page=2)
+        del items[2:]
+        embed = await view.render()
+        view.stop()
+        return embed, view
+
+    embed, view = asyncio.run(main())
+    assert embed.description == "a,b"
+    assert (view.page, view.page_count) == (0, 1)
+    assert view.previous_page.disabled and view.next_page.disabled
+
+
+def test_empty_list_renders_a_single_page():
+    render_page, _ = renderer([])
+
+    async def main():
+        view = PageView(author_id=1, render_page=render_page)
+        embed = await view.render()
+        view.stop()
+        return embed, view
+
+    embed, view = asyncio.run(main())
+    assert embed.description == ""
+    assert view.page == 0 and view.previous_page.disabled and view.next_page.disabled
+
+
+def test_only_the_author_can_turn_pages():
+    render_page, _ = renderer(["a", "b", "c"])
+
+    async def main():
+        view = PageView(author_id=1, render_page=render_page)
+        other, author = interaction(2), interaction(1)
+        results = await view.interaction_check(other), await view.interaction_check(author)
+        view.stop()
+        return results, other, author
+
+    (other_allowed, author_allowed), other, author = asyncio.run(main())
+    assert not other_allowed and author_allowed
+    assert other.response.sent and other.response.sent[0][1] is True
+    assert author.response.sent == []
+
+
+def test_timeout_removes_the_buttons():
+    edits = []
+
+    class FakeMessage:
+        async def edit(self, *, view):
+            edits.append(view)
+
+    async def main():
+        view = PageView(author_id=1, render_page=renderer(["a"])[0])
+        # 메시지를 보내기 전에 시간이 지나도 오류 없이 넘어갑니다.
+        await view.on_timeout()
+        view.message = FakeMessage()
+        await view.on_timeout()
+        view.stop()
+
+    asyncio.run(main())
+    assert edits == [None]
@@ -0,0 +1,216 @@
+# baldheadbot/tests/test_player.py
+"""GuildPlayer(서버별 음악 재생 작업)의 대기열 순서, 건너뛰기/비우기/바로 재생, 일시정지와 재생 위치 테스트입니다."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from core import player as player_module
+from core.mixer import FRAME_SIZE
+from core.player import GuildPlayer
+from core.track import Track
+
+FRAME = b"\x01\x00" * (FRAME_SIZE // 2)
+
+
+class TrackSource(discord.AudioSource):
+    """곡 하나 대신 정해진 수의 PCM 프레임을 돌려주는 소스입니다."""
+    def __init__(self, frames: int):
+        self.remaining = frames
+        self.cleaned = False
+
+    def read(self) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        self.remaining -= 1
+        return FRAME
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+class FakeChannel:
+    def __init__(self):
+        self.titles = []
+
+    async def send(self, *, embed):
+        self.titles.append((embed.title, embed.description))
+
+
+@pytest.fixture
+def music(voice):
+    """
+    (make_player, channel)을 반환합니다. 곡 제목이 '긴 곡'으로 시작하면 사실상 끝나지 않는 소스를,
+    '오류'면 소스를 만들다 실패하고, 나머지는 짧은 소스를 만듭니다. 만든 소스는 player.sources에 기록됩니다.
+    """
+    bot, guild = voice
+    channel = FakeChannel()
+    bot.embeds = SimpleNamespace(
+        info=lambda title, description: discord.Embed(title=title, description=description),
+        error=lambda title, description: discord.Embed(title=title, description=description),
+    )
+    guild.get_channel_or_thread = lambda channel_id: channel
+    guild.get_member = lambda member_id: None
+    players = []
+
+    def make_player() -> GuildPlayer:
+        bot.loop = asyncio.get_running_loop()
+
+        async def create_source(player, track, position=None):
+            if track.title == "오류":
+                raise RuntimeError("추출 실패")
+            source = TrackSource(10**6 if track.title.startswith("긴 곡") else 3)
+            player.sources.append((track.title, position, source))
+            return source
+
+        player = GuildPlayer(bot, guild, create_source)
+        player.sources = []
+        player.start()
+        players.append(player)
+        return player
+
+    yield make_player, channel
+    for player in players:
+        player.destroy()
+    bot.voice_mixer.remove(guild)
+
+
+def track(title: str) -> Track:
+    return Track(f"https://example.com/{title}", title, guild_id=1, channel_id=2, requester_id=3)
+
+
+def played(player) -> list:
+    return [title for title, _, _ in player.sources]
+
+
+def idle(player) -> bool:
+    return not player.queue and player.current is None and not player.is_active()
+
+
+def test_tracks_play_in_queue_order(music, wait_until):
+    make_player, channel = music
+
+    async def main():
+        player = make_player()
+        player.enqueue(track("하나"))
+        player.enqueue_many([track("둘"), track("셋")])
+        await wait_until(lambda: len(channel.titles) == 3 and idle(player))
+        return player
+
+    player = asyncio.run(main())
+    assert played(player) == ["하나", "둘", "셋"]
+    assert [description for _, description in channel.titles] == [
+        f"▶️ 이제 '{title}'을(를) 재생합니다." for title in ["하나", "둘", "셋"]
+    ]
+    # 이어지는 곡 사이의 공백만 셉니다.
+    assert player.gap_count == 2
+    assert all(source.cleaned for _, _, source in player.sources)
+
+
+def test_failed_track_is_reported_and_the_next_one_plays(music, wait_until):
+    make_player, channel = music
+
+    async def main():
+        player = make_player()
+        player.enqueue_many([track("오류"), track("다음")])
+        await wait_until(lambda: len(channel.titles) == 2 and idle(player))
+        return player
+
+    player = asyncio.run(main())
+    assert played(player) == ["다음"]
+    assert channel.titles[0][0] == "재생 오류"
+
+
+def test_skip_stops_the_current_track(music, wait_until):
+    make_player, _ = music
+
+    async def main():
+        player = make_player()
+        player.enqueue_many([track("긴 곡"), track("다음")])
+        await wait_until(lambda: player.current is not None and player.is_active())
+        first = player.current
+        player.skip()
+        await wait_until(lambda: idle(player))
+        return player, first
+
+    player, first = asyncio.run(main())
+    assert first.title == "긴 곡"
+    assert played(player) == ["긴 곡", "다음"]
+    assert player.sources[0][2].cleaned and player.sources[0][2].remaining > 0
+
+
+def test_clear_empties_the_queue_and_stops_playback(music, wait_until):
+    make_player, _ = music
+
+    async def main():
+        player = make_player()
+        player.enqueue_many([track("긴 곡"), track("둘"), track("셋")])
+        await wait_until(lambda: player.is_active())
+        player.clear()
+        await wait_until(lambda: idle(player))
+        return player
+
+    player = asyncio.run(main())
+    assert played(player) == ["긴 곡"]
+    assert player.queue == []
+
+
+def test_play_now_moves_the_track_to_the_front(music, wait_until):
+    make_player, _ = music
+
+    async def main():
+        player = make_player()
+        player.enqueue_many([track("긴 곡"), track("둘"), track("셋"), track("넷")])
+        await wait_until(lambda: player.is_active())
+        moved = player.play_now(2)
+        await wait_until(lambda: idle(player))
+        return player, moved
+
+    player, moved = asyncio.run(main())
+    assert moved.title == "넷"
+    assert played(player) == ["긴 곡", "넷", "둘", "셋"]
+
+
+def test_queue_is_dropped_without_a_voice_connection(music, voice, wait_until):
+    make_player, _ = music
+    _, guild = voice
+
+    async def main():
+        guild.voice_client = None
+        player = make_player()
+        player.enqueue_many([track("하나"), track("둘")])
+        await wait_until(lambda: not player.queue)
+        return player
+
+    assert played(asyncio.run(main())) == []
+
+
+def test_elapsed_excludes_paused_time(music, wait_until, monkeypatch):
+    make_player, _ = music
+    clock = [100.0]
+    monkeypatch.setattr(player_module, "time", SimpleNamespace(
+        time=time.time, perf_counter=time.perf_counter, monotonic=lambda: clock[0],
+    ))
+
+    async def main():
+        player = make_player()
+        assert player.elapsed == 0.0
+        player.enqueue(track("긴 곡"))
+        await wait_until(lambda: player.current is not None)
+        elapsed = []
+        clock[0] = 103.0
+        elapsed.append(player.elapsed)
+        player.pause()
+        clock[0] = 110.0
+        elapsed.append((player.elapsed, player.is_paused()))
+        player.resume()
+        clock[0] = 111.0
+        elapsed.append((player.elapsed, player.is_paused()))
+        return elapsed
+
+    assert asyncio.run(main()) == [3.0, (3.0, True), (4.0, False)]
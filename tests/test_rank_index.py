@@ -0,0 +1,87 @@
+# baldheadbot/tests/test_rank_index.py
+"""RankIndex(버킷 + 펜윅 트리 순위 인덱스)의 순위/페이지 조회를 정렬된 리스트와 비교하는 테스트입니다."""
+import random
+
+import pytest
+
+from core.rank_index import RankIndex
+
+
+class SmallRankIndex(RankIndex):
+    # 버킷 분할/삭제가 자주 일어나도록 버킷을 작게 잡습니다.
+    LOAD = 2
+
+
+def oracle(users: dict) -> list:
+    """(user_id, level, exp)를 레벨, 경험치 내림차순, 같으면 user_id 오름차순으로 정렬합니다."""
+    return sorted(((uid, level, exp) for uid, (level, exp) in users.items()), key=lambda e: (-e[1], -e[2], e[0]))
+
+
+def assert_matches(index: RankIndex, users: dict):
+    expected = oracle(users)
+    assert len(index) == len(expected)
+    for rank, (uid, _, _) in enumerate(expected, 1):
+        assert index.rank(uid) == rank
+    for offset in range(0, len(expected) + 3, 3):
+        assert index.page(offset, 3) == expected[offset:offset + 3]
+    assert index.page(0, len(expected) + 5) == expected
+
+
+def test_empty_index():
+    index = SmallRankIndex()
+    assert len(index) == 0
+    assert index.rank(1) == -1
+    assert index.page() == []
+    assert index.update(1, 1, 0) == (None, 1)
+    assert 1 in index
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_updates_and_removals_match_sorted_order(seed):
+    rng = random.Random(seed)
+    # 동점이 자주 나오도록 값의 범위를 좁게 잡습니다.
+    users = {uid: (rng.randint(1, 4), rng.randint(0, 3)) for uid in rng.sample(range(1, 1000), 30)}
+    index = SmallRankIndex((uid, level, exp) for uid, (level, exp) in users.items())
+    assert_matches(index, users)
+
+    for step in range(300):
+        if users and rng.random() < 0.2:
+            uid = rng.choice(list(users))
+            del users[uid]
+            index.remove(uid)
+            assert uid not in index and index.rank(uid) == -1
+        else:
+            uid = rng.randrange(1, 1000)
+            level, exp = rng.randint(1, 4), rng.randint(0, 3)
+            old = users.get(uid)
+            old_rank = oracle(users).index((uid, *old)) + 1 if old else None
+            users[uid] = (level, exp)
+            result = index.update(uid, level, exp)
+            if old == (level, exp):
+                assert result is None
+            else:
+                assert result == (old_rank, oracle(users).index((uid, level, exp)) + 1)
+        if step % 10 == 0:
+            assert_matches(index, users)
+    assert_matches(index, users)
+
+
+def test_remove_until_empty_and_refill():
+    users = {uid: (uid % 3, uid % 5) for uid in range(1, 20)}
+    index = SmallRankIndex((uid, level, exp) for uid, (level, exp) in users.items())
+    for uid in list(users):
+        del users[uid]
+        index.remove(uid)
+        assert_matches(index, users)
+    index.remove(1)
+    for uid in range(5):
+        users[uid] = (1, uid)
+        index.update(uid, 1, uid)
+    assert_matches(index, users)
+
+
+def test_page_with_out_of_range_arguments():
+    index = SmallRankIndex([(1, 3, 0), (2, 2, 0), (3, 1, 0)])
+    assert index.page(3, 10) == []
+    assert index.page(0, 0) == []
+    assert index.page(-1, 1) == [(1, 3, 0)]
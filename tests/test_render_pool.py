@@ -0,0 +1,50 @@
+# baldheadbot/tests/test_render_pool.py
+"""RenderPool의 작업자 실행, 대기열 제한, 작업자 비정상 종료 후 복구 테스트입니다."""
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from core.render_pool import RenderPool, RenderQueueFull
+
+
+def test_runs_in_worker_process():
+    async def main():
+        pool = RenderPool(max_workers=1)
+        try:
+            return await pool.submit(os.getpid), pool.stats()
+        finally:
+            pool.shutdown()
+
+    pid, stats = asyncio.run(main())
+    assert pid != os.getpid()
+    assert stats["완료"] == 1
+
+
+def test_rejects_when_queue_is_full():
+    async def main():
+        pool = RenderPool(max_workers=1, max_queue=0)
+        pool.in_flight = 1
+        with pytest.raises(RenderQueueFull):
+            await pool.submit(os.getpid)
+        return pool.rejected
+
+    assert asyncio.run(main()) == 1
+
+
+def test_recovers_after_a_worker_dies():
+    async def main():
+        pool = RenderPool(max_workers=1)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await pool.submit(os._exit, 1)
+            # 망가진 풀은 버려지고, 다음 요청은 새 풀에서 실행됩니다.
+            pid = await pool.submit(os.getpid)
+            return pid, pool.stats()
+        finally:
+            pool.shutdown()
+
+    pid, stats = asyncio.run(main())
+    assert pid != os.getpid()
+    assert stats["작업자 비정상 종료"] == 1 and stats["실패"] == 1 and stats["완료"] == 1
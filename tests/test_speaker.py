@@ -0,0 +1,218 @@
+# baldheadbot/tests/test_speaker.py
+"""문장 나누기(split_sentences), SpeechStream 읽기, FakeEngine으로 합성하는 GuildSpeaker의 대기열/조각 재생 테스트입니다."""
+import asyncio
+
+from core.speaker import SpeechStream, Utterance, split_sentences
+from core.tts_engine import FakeEngine
+
+FRAME_SIZE = SpeechStream.FRAME_SIZE
+SILENCE = SpeechStream.SILENCE
+
+
+# --- split_sentences ---
+def test_split_empty_text():
+    assert split_sentences("") == []
+    assert split_sentences("   \n  ") == []
+
+
+def test_first_sentence_is_kept_alone_and_the_rest_are_joined():
+    text = "안녕. 반가워! 잘 지내? 나는 잘 지내."
+    assert split_sentences(text, max_chars=20) == ["안녕.", "반가워! 잘 지내? 나는 잘 지내."]
+
+
+def test_joined_chunks_stop_at_max_chars():
+    # "bbb. ccc."가 정확히 9자이므로 이어 붙이고, 다음 문장은 새 조각으로 시작합니다.
+    assert split_sentences("aaa. bbb. ccc. ddd.", max_chars=9) == ["aaa.", "bbb. ccc.", "ddd."]
+    assert split_sentences("aaa. bbb. ccc. ddd.", max_chars=8) == ["aaa.", "bbb.", "ccc.", "ddd."]
+
+
+def test_newlines_split_sentences_without_punctuation():
+    assert split_sentences("첫 줄\n\n둘째 줄\n셋째 줄", max_chars=5) == ["첫 줄", "둘째 줄", "셋째 줄"]
+
+
+def test_long_sentence_is_cut_at_spaces():
+    text = " ".join(["단어"] * 30)
+    chunks = split_sentences(text, max_chars=20)
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_long_sentence_without_punctuation_or_spaces_is_cut_by_length():
+    chunks = split_sentences("가" * 450, max_chars=200)
+    assert [len(chunk) for chunk in chunks] == [200, 200, 50]
+
+
+# --- SpeechStream.read ---
+def test_read_frames_pads_last_frame_and_ends_after_finish():
+    async def main():
+        stream = SpeechStream()
+        pcm = bytes(range(256)) * (FRAME_SIZE * 3 // 2 // 256)
+        stream.feed(pcm)
+        assert stream.ready.done()
+        frames = [stream.read(), stream.read()]
+        # 다음 조각이 아직 없고 끝나지도 않았으면 무음을 보냅니다.
+        waiting = stream.read()
+        stream.finish()
+        return pcm, frames, waiting, stream.read(), stream
+
+    pcm, frames, waiting, end, stream = asyncio.run(main())
+    assert frames[0] == pcm[:FRAME_SIZE]
+    assert frames[1] == pcm[FRAME_SIZE:] + SILENCE[:FRAME_SIZE - (len(pcm) - FRAME_SIZE)]
+    assert waiting == SILENCE and stream.underruns == 1
+    assert end == b""
+
+
+def test_read_plays_chunks_in_order_then_ends():
+    async def main():
+        stream = SpeechStream()
+        stream.feed(b"\x01" * FRAME_SIZE)
+        stream.feed(b"\x02" * FRAME_SIZE * 2)
+        stream.finish()
+        return [stream.read() for _ in range(4)]
+
+    assert asyncio.run(main()) == [b"\x01" * FRAME_SIZE, b"\x02" * FRAME_SIZE, b"\x02" * FRAME_SIZE, b""]
+
+
+def test_read_ends_immediately_when_nothing_was_fed():
+    async def main():
+        stream = SpeechStream()
+        stream.feed(b"")
+        stream.finish()
+        return stream, stream.read()
+
+    stream, data = asyncio.run(main())
+    assert stream.ready.done() and stream.fed == 0
+    assert data == b"" and stream.underruns == 0
+
+
+def test_read_after_cleanup_ends():
+    async def main():
+        stream = SpeechStream()
+        stream.feed(b"\x01" * FRAME_SIZE * 4)
+        stream.read()
+        stream.cleanup()
+        stream.feed(b"\x01" * FRAME_SIZE)
+        return stream.read(), stream.buffered
+
+    assert asyncio.run(main()) == (b"", 0)
+
+
+def test_wait_for_room_returns_after_a_chunk_is_read():
+    async def main():
+        stream = SpeechStream()
+        stream.feed(b"\x01" * FRAME_SIZE)
+        stream.feed(b"\x02" * FRAME_SIZE)
+        waiter = asyncio.ensure_future(stream.wait_for_room(2))
+        await asyncio.sleep(0)
+        blocked = not waiter.done()
+        stream.read()
+        await asyncio.wait_for(waiter, 1)
+        return blocked, stream.buffered
+
+    assert asyncio.run(main()) == (True, 1)
+
+
+# --- GuildSpeaker 대기열 ---
+def test_speaker_plays_in_queue_order(make_speaker, speak):
+    engine = FakeEngine(delay=0.01, seconds_per_char=0.01, sample_rate=48000)
+
+    async def main():
+        speaker = make_speaker(engine)
+        await speak(speaker, ["첫 번째", "두 번째", "세 번째"], played=3)
+        return speaker
+
+    speaker = asyncio.run(main())
+    assert [utterance.text for utterance, _ in speaker.played] == ["첫 번째", "두 번째", "세 번째"]
+    assert [text for text, _ in engine.calls] == ["첫 번째", "두 번째", "세 번째"]
+    assert speaker.dropped == speaker.failed == speaker.skipped == 0
+
+
+def test_speaker_drops_oldest_when_backlog_is_full(make_speaker, speak):
+    engine = FakeEngine(seconds_per_char=0.01, sample_rate=48000)
+
+    async def main():
+        speaker = make_speaker(engine, max_backlog=2)
+        # 재생 작업이 아직 돌기 전에 네 개를 넣으므로 앞의 두 개가 버려집니다.
+        await speak(speaker, [f"메시지 {i}" for i in range(4)], played=2)
+        return speaker
+
+    speaker = asyncio.run(main())
+    assert speaker.dropped == 2
+    assert [text for text, _ in engine.calls] == ["메시지 2", "메시지 3"]
+
+
+# --- GuildSpeaker 조각 재생 ---
+def expected_frames(texts, seconds_per_char: float) -> int:
+    """조각마다 PCM을 20ms 프레임으로 자른 수입니다. (마지막 프레임은 무음으로 채움)"""
+    return sum(-(-int(len(text) * seconds_per_char * 48000) * 4 // FRAME_SIZE) for text in texts)
+
+
+def test_speaker_streams_chunks_while_synthesizing(make_speaker, wait_until, voice):
+    _, guild = voice
+    engine = FakeEngine(delay=0.03, seconds_per_char=0.05, sample_rate=48000)
+
+    async def main():
+        speaker = make_speaker(engine, chunk_chars=3)
+        speaker.say(Utterance("하나. 둘. 셋. 넷.", "ko", author_id=1))
+        await wait_until(lambda: speaker.speaking)
+        # 첫 조각이 합성되자마자 재생을 시작하므로, 이 시점에는 아직 모든 조각을 합성하지 않았습니다.
+        synthesized_at_start = len(engine.calls)
+        await wait_until(lambda: not speaker.speaking and not speaker._pending)
+        speaker.destroy()
+        return speaker, synthesized_at_start
+
+    speaker, synthesized_at_start = asyncio.run(main())
+    assert synthesized_at_start < 4
+    assert [text for text, _ in engine.calls] == ["하나.", "둘.", "셋.", "넷."]
+    assert speaker.chunks == 4 and len(speaker.played) == 1
+    # 다음 조각을 기다리는 동안에는 무음 프레임을 보냅니다.
+    _, stream = speaker.played[0]
+    assert len(guild.voice_client.frames) == expected_frames(["하나.", "둘.", "셋.", "넷."], 0.05) + stream.underruns
+    assert all(len(frame) == FRAME_SIZE for frame in guild.voice_client.frames)
+
+
+# --- 조각 합성 실패 ---
+class FailingEngine(FakeEngine):
+    """'실패'가 들어간 조각은 합성에 실패하는 엔진입니다."""
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        audio = await super().synthesize(text, lang)
+        if "실패" in text:
+            raise RuntimeError("합성 실패")
+        return audio
+
+
+def speak_failing(make_speaker, speak, text: str, played: int):
+    engine = FailingEngine(seconds_per_char=0.02, sample_rate=48000)
+
+    async def main():
+        speaker = make_speaker(engine, chunk_chars=3)
+        await speak(speaker, [text], played=played)
+        return speaker
+
+    return engine, asyncio.run(main())
+
+
+def test_failed_chunk_is_skipped_and_the_rest_is_played(make_speaker, speak, voice):
+    _, guild = voice
+    engine, speaker = speak_failing(make_speaker, speak, "하나. 실패. 셋.", played=1)
+    assert [text for text, _ in engine.calls] == ["하나.", "실패.", "셋."]
+    assert speaker.failed == 1 and speaker.spoken == 1
+    _, stream = speaker.played[0]
+    assert stream.fed == 2
+    assert len(guild.voice_client.frames) == expected_frames(["하나.", "셋."], 0.02) + stream.underruns
+
+
+def test_failed_first_chunk_still_plays_the_rest(make_speaker, speak, voice):
+    _, guild = voice
+    engine, speaker = speak_failing(make_speaker, speak, "실패. 둘.", played=1)
+    assert speaker.failed == 1 and speaker.spoken == 1
+    _, stream = speaker.played[0]
+    assert len(guild.voice_client.frames) == expected_frames(["둘."], 0.02) + stream.underruns
+
+
+def test_utterance_is_skipped_when_every_chunk_fails(make_speaker, speak, voice):
+    _, guild = voice
+    engine, speaker = speak_failing(make_speaker, speak, "실패. 실패!", played=0)
+    assert speaker.failed == 2
+    assert speaker.spoken == 0 and speaker.played == []
+    assert guild.voice_client.frames == []
@@ -0,0 +1,76 @@
+# baldheadbot/tests/test_tts_cache.py
+"""FakeEngine으로 합성하는 TTSCache의 적중/미스, 동시 요청, 디스크 계층 테스트입니다."""
+import asyncio
+
+from core.tts_cache import TTSCache
+from core.tts_engine import FakeEngine
+
+
+def cached(cache: TTSCache, engine: FakeEngine, text: str, lang: str = "ko"):
+    return cache.get(text, lang, lambda: engine.synthesize(text, lang), engine=engine.name)
+
+
+def test_hit_after_miss_with_normalized_text():
+    async def main():
+        cache, engine = TTSCache(), FakeEngine()
+        first = await cached(cache, engine, "Hello  World")
+        second = await cached(cache, engine, " hello world ")
+        return cache, engine, first, second
+
+    cache, engine, first, second = asyncio.run(main())
+    assert first == second
+    assert engine.calls == [("Hello  World", "ko")]
+    assert cache.syntheses == 1
+    assert cache.memory.hits == 1 and cache.memory.misses == 1
+
+
+def test_language_and_engine_are_part_of_the_key():
+    async def main():
+        cache, engine = TTSCache(), FakeEngine()
+        await cached(cache, engine, "안녕", "ko")
+        await cached(cache, engine, "안녕", "ja")
+        await cache.get("안녕", "ko", lambda: engine.synthesize("안녕", "ko"), engine="other")
+        return cache, engine
+
+    cache, engine = asyncio.run(main())
+    assert len(engine.calls) == 3
+    assert cache.syntheses == 3
+
+
+def test_concurrent_misses_synthesize_once():
+    async def main():
+        cache, engine = TTSCache(), FakeEngine(delay=0.02)
+        results = await asyncio.gather(*(cached(cache, engine, "ㅋㅋㅋ") for _ in range(5)))
+        return engine, results
+
+    engine, results = asyncio.run(main())
+    assert len(engine.calls) == 1
+    assert len(set(results)) == 1
+
+
+def test_long_text_is_not_cached():
+    async def main():
+        cache, engine = TTSCache(max_text=5), FakeEngine()
+        await cached(cache, engine, "아주 긴 메시지입니다")
+        await cached(cache, engine, "아주 긴 메시지입니다")
+        return cache, engine
+
+    cache, engine = asyncio.run(main())
+    assert len(engine.calls) == 2
+    assert len(cache.memory) == 0
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    async def main():
+        engine = FakeEngine()
+        first = await cached(TTSCache(disk_dir=str(tmp_path)), engine, "다시 만나요")
+        # 재시작: 메모리는 비어 있고 디스크에 남은 파일만 다시 등록합니다.
+        cache = TTSCache(disk_dir=str(tmp_path))
+        cache.load()
+        second = await cached(cache, engine, "다시 만나요")
+        return cache, engine, first, second
+
+    cache, engine, first, second = asyncio.run(main())
+    assert first == second
+    assert len(engine.calls) == 1
+    assert cache.disk_hits == 1 and cache.syntheses == 0
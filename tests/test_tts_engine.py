@@ -0,0 +1,105 @@
+# baldheadbot/tests/test_tts_engine.py
+"""TTS 엔진 인터페이스와 각 엔진(gTTS, eSpeak NG, 테스트용 FakeEngine)의 합성 테스트입니다."""
+import asyncio
+import io
+import wave
+
+import pytest
+
+from core import tts_engine
+from core.tts_engine import DEFAULT_ENGINE, ENGINES, EspeakEngine, FakeEngine, GTTSEngine, TTSEngine
+
+
+def test_engine_without_synthesize_cannot_be_created():
+    class SilentEngine(TTSEngine):
+        name = "silent"
+
+    with pytest.raises(TypeError):
+        SilentEngine()
+
+
+def test_selectable_engines_exclude_the_fake_engine():
+    assert set(ENGINES) == {"gtts", "espeak"}
+    assert DEFAULT_ENGINE in ENGINES
+
+
+def test_fake_engine_returns_wav_and_records_calls():
+    engine = FakeEngine(seconds_per_char=0.1, sample_rate=8000)
+    audio = asyncio.run(engine.synthesize("안녕하세요", "ko"))
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == 8000
+        assert wav.getnframes() == 5 * 800
+    assert engine.calls == [("안녕하세요", "ko")]
+    assert engine.available()
+
+
+def test_gtts_engine_passes_text_and_language(monkeypatch):
+    requests = []
+
+    class FakeGTTS:
+        def __init__(self, text, lang):
+            requests.append((text, lang))
+
+        def write_to_fp(self, fp):
+            fp.write(b"mp3")
+
+    monkeypatch.setattr(tts_engine, "gTTS", FakeGTTS)
+    assert asyncio.run(GTTSEngine().synthesize("안녕", "ko")) == b"mp3"
+    assert requests == [("안녕", "ko")]
+
+
+class FakeProcess:
+    """asyncio.create_subprocess_exec가 돌려주는 프로세스 대신 쓰는 객체입니다."""
+    def __init__(self, returncode: int, stdout: bytes = b"", stderr: bytes = b""):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.stdin = None
+
+    async def communicate(self, data: bytes):
+        self.stdin = data
+        return self.stdout, self.stderr
+
+
+def fake_exec(monkeypatch, process: FakeProcess) -> list:
+    calls = []
+
+    async def create_subprocess_exec(*args, **kwargs):
+        calls.append((args, kwargs))
+        return process
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+    return calls
+
+
+def test_espeak_engine_argv_and_stdin(monkeypatch):
+    process = FakeProcess(0, stdout=b"RIFF....WAVE")
+    calls = fake_exec(monkeypatch, process)
+    engine = EspeakEngine(executable="/usr/bin/espeak-ng")
+
+    audio = asyncio.run(engine.synthesize("-v en 안녕", "ko"))
+
+    assert audio == b"RIFF....WAVE"
+    (args, kwargs), = calls
+    # 텍스트는 인자가 아니라 표준 입력으로 넘기므로 '-'로 시작하는 메시지도 옵션으로 해석되지 않습니다.
+    assert args == ("/usr/bin/espeak-ng", "--stdout", "--stdin", "-v", "ko")
+    assert process.stdin == "-v en 안녕".encode("utf-8")
+    assert kwargs["stdin"] == kwargs["stdout"] == kwargs["stderr"] == asyncio.subprocess.PIPE
+
+
+def test_espeak_engine_raises_with_stderr_on_failure(monkeypatch):
+    fake_exec(monkeypatch, FakeProcess(1, stderr=b"espeak-ng: voice 'xx' not found\n"))
+    engine = EspeakEngine(executable="espeak-ng")
+    with pytest.raises(RuntimeError, match="voice 'xx' not found"):
+        asyncio.run(engine.synthesize("hello", "xx"))
+
+
+def test_espeak_engine_unavailable_without_executable(monkeypatch):
+    monkeypatch.setattr(tts_engine.shutil, "which", lambda name: None)
+    calls = fake_exec(monkeypatch, FakeProcess(0))
+    engine = EspeakEngine()
+    assert not engine.available()
+    with pytest.raises(RuntimeError):
+        asyncio.run(engine.synthesize("hello", "en"))
+    assert calls == []